@@ -0,0 +1,99 @@
+import argparse
+import sys
+import timeit
+from util.coordinate import Coordinate
+
+"""
+Microbenchmark of the slotted Coordinate against the previous implementation,
+a plain class with getters and a hash building a tuple on every call.
+
+Run from the root of the project: python -m benchmark.bench_coordinate
+"""
+
+class LegacyCoordinate:
+    """The Coordinate class as it was before it was slotted, reduced to the measured operations."""
+
+    def __init__(self, x: int, y: int):
+        self.__x = x
+        self.__y = y
+
+    def get_x(self) -> int:
+        return self.__x
+
+    def get_y(self) -> int:
+        return self.__y
+
+    def __hash__(self) -> int:
+        return hash((self.get_x(), self.get_y()))
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, LegacyCoordinate):
+            return False
+        return self.get_x() == other.get_x() and self.get_y() == other.get_y()
+
+    def __add__(self, other: 'LegacyCoordinate') -> 'LegacyCoordinate':
+        if isinstance(other, int):
+            return LegacyCoordinate(self.get_x() + other, self.get_y() + other)
+        if not isinstance(other, LegacyCoordinate):
+            return None
+        return LegacyCoordinate(self.get_x() + other.get_x(), self.get_y() + other.get_y())
+
+def size_of(coordinate: object) -> int:
+    """
+    Get the memory used by a coordinate, its attribute dictionary included.
+
+    :param coordinate: The coordinate.
+    :type coordinate: object
+    :return: The size in bytes.
+    :rtype: int
+    """
+    return sys.getsizeof(coordinate) + (sys.getsizeof(coordinate.__dict__) if hasattr(coordinate, '__dict__') else 0)
+
+def run(size: int, repeat: int) -> None:
+    """
+    Run the benchmark and print the time of each operation for both implementations.
+    """
+    tiles = [(x, y) for y in range(size) for x in range(size)]
+    cases = {
+        "create": {
+            "legacy": lambda: [LegacyCoordinate(x, y) for x, y in tiles],
+            "slotted": lambda: [Coordinate(x, y) for x, y in tiles],
+            "interned": lambda: [Coordinate.of(x, y) for x, y in tiles],
+        },
+    }
+    legacy = [LegacyCoordinate(x, y) for x, y in tiles]
+    slotted = [Coordinate(x, y) for x, y in tiles]
+    interned = [Coordinate.of(x, y) for x, y in tiles]
+    legacy_set, slotted_set, interned_set = set(legacy), set(slotted), set(interned)
+    cases["hash into a set"] = {
+        "legacy": lambda: set(legacy),
+        "slotted": lambda: set(slotted),
+        "interned": lambda: set(interned),
+    }
+    cases["look up in a set"] = {
+        "legacy": lambda: sum(coordinate in legacy_set for coordinate in legacy),
+        "slotted": lambda: sum(coordinate in slotted_set for coordinate in slotted),
+        "interned": lambda: sum(coordinate in interned_set for coordinate in interned),
+    }
+    one_legacy, one = LegacyCoordinate(1, 1), Coordinate(1, 1)
+    cases["add"] = {
+        "legacy": lambda: [coordinate + one_legacy for coordinate in legacy],
+        "slotted": lambda: [coordinate + one for coordinate in slotted],
+    }
+
+    print(f"{size * size} coordinates, best of {repeat}")
+    for case, implementations in cases.items():
+        reference = None
+        for name, function in implementations.items():
+            elapsed = min(timeit.repeat(function, number=1, repeat=repeat))
+            reference = reference or elapsed
+            print(f"  {case:<17} {name:<9} {elapsed * 1000:8.2f} ms  x{reference / elapsed:.2f}")
+    print(f"  {'memory':<17} {'legacy':<9} {size_of(legacy[0]):5d} bytes per coordinate")
+    print(f"  {'memory':<17} {'slotted':<9} {size_of(slotted[0]):5d} bytes per coordinate")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the Coordinate class.")
+    parser.add_argument("--size", type=int, default=240, help="Size of the map whose tiles are measured.")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of runs of each case.")
+    arguments = parser.parse_args()
+    run(arguments.size, arguments.repeat)
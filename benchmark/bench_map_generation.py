@@ -0,0 +1,151 @@
+import argparse
+import os
+import random
+import time
+import tracemalloc
+import types
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+from controller.game_controller import GameController
+from model.resources.gold import Gold
+from model.resources.wood import Wood
+from util.coordinate import Coordinate
+from util.map import Map
+from util.settings import Settings
+from util.state_manager import MapSize, MapType
+
+"""
+Benchmark of the placement of the resources of a RICH map: the previous rejection sampling loop,
+which draws a tile, checks it and adds the resource one tile at a time, against the bulk placement
+drawing every tile at once among the free tiles and adding them to the resource field of the map.
+The whole generation of a game (map, players and AI) is also measured for each map size,
+as well as the memory of the resources kept as one object per tile against the resource field.
+
+Run from the root of the project: python -m benchmark.bench_map_generation
+"""
+
+def rejection_sampling(size: int, rng: random.Random) -> Map:
+    """
+    Place the wood and the gold of a RICH map the way the GameController did before.
+
+    :param size: The size of the map.
+    :type size: int
+    :param rng: The random generator.
+    :type rng: random.Random
+    :return: The map.
+    :rtype: Map
+    """
+    map = Map(size)
+    wood = Wood()
+    for _ in range(int(size ** 2 * 0.05)):
+        while True:
+            coordinate = Coordinate(rng.randint(0, size - 1), rng.randint(0, size - 1))
+            if map.check_placement(wood, coordinate):
+                break
+        map.add(wood, coordinate)
+        wood.set_coordinate(coordinate)
+    for _ in range(int(size ** 2 * 0.005)):
+        gold = Gold()
+        while True:
+            coordinate = Coordinate(rng.randint(0, size - 1), rng.randint(0, size - 1))
+            if map.check_placement(gold, coordinate):
+                break
+        map.add(gold, coordinate)
+        gold.set_coordinate(coordinate)
+    return map
+
+def bulk_placement(size: int, rng: random.Random) -> Map:
+    """
+    Place the wood and the gold of a RICH map the way the GameController does now.
+
+    :param size: The size of the map.
+    :type size: int
+    :param rng: The random generator.
+    :type rng: random.Random
+    :return: The map.
+    :rtype: Map
+    """
+    map = Map(size)
+    for resource_type, count in ((Wood, int(size ** 2 * 0.05)), (Gold, int(size ** 2 * 0.005))):
+        map.add_resources(resource_type, [Coordinate.of(index % size, index // size) for index in rng.sample(map.get_free_indices(), count)])
+    return map
+
+def object_placement(size: int, rng: random.Random) -> Map:
+    """
+    Place the wood and the gold of a RICH map in bulk, with one object per tile.
+
+    :param size: The size of the map.
+    :type size: int
+    :param rng: The random generator.
+    :type rng: random.Random
+    :return: The map.
+    :rtype: Map
+    """
+    map = Map(size)
+    for resource_type, count in ((Wood, int(size ** 2 * 0.05)), (Gold, int(size ** 2 * 0.005))):
+        placements = []
+        for index in rng.sample(map.get_free_indices(), count):
+            resource = resource_type()
+            coordinate = Coordinate.of(index % size, index // size)
+            resource.set_coordinate(coordinate)
+            placements.append((resource, coordinate))
+        map.add_all(placements)
+    return map
+
+def memory(function) -> int:
+    """
+    Measure the memory kept by the result of a function.
+
+    :param function: The function to run.
+    :type function: Callable[[], object]
+    :return: The size of the memory allocated by the function and still used by its result, in bytes.
+    :rtype: int
+    """
+    tracemalloc.start()
+    result = function()
+    used, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return used
+
+def best_time(function, repeat: int) -> float:
+    """
+    Run a function several times.
+
+    :param function: The function to run.
+    :type function: Callable[[], object]
+    :param repeat: The number of runs.
+    :type repeat: int
+    :return: The shortest time of a run, in seconds.
+    :rtype: float
+    """
+    times = []
+    for _ in range(repeat):
+        begin = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - begin)
+    return min(times)
+
+def run(repeat: int) -> None:
+    """
+    Run the benchmark and print the time of each placement and of the generation of a game, for each map size.
+    """
+    print(f"Best of {repeat}")
+    for map_size in MapSize:
+        size = map_size.value
+        legacy = best_time(lambda: rejection_sampling(size, random.Random(0)), repeat)
+        bulk = best_time(lambda: bulk_placement(size, random.Random(0)), repeat)
+        settings = Settings()
+        settings.map_size = map_size
+        settings.map_type = MapType.RICH
+        game = best_time(lambda: GameController(types.SimpleNamespace(settings=settings), True), repeat)
+        print(f"  {size:>3}x{size:<3} resources: rejection {legacy * 1000:8.2f} ms, bulk {bulk * 1000:8.2f} ms  x{legacy / bulk:.2f}   whole game: {game * 1000:8.2f} ms")
+    size = MapSize.LARGE.value
+    objects = memory(lambda: object_placement(size, random.Random(0)))
+    field = memory(lambda: bulk_placement(size, random.Random(0)))
+    print(f"  {size}x{size} map memory: one object per tile {objects / 2 ** 20:6.2f} MiB, resource field {field / 2 ** 20:6.2f} MiB")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the generation of the maps.")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of runs of each case.")
+    arguments = parser.parse_args()
+    run(arguments.repeat)
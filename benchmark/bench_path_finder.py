@@ -0,0 +1,113 @@
+import argparse
+import random
+import time
+from util.coordinate import Coordinate
+from util.path_finder import PathFinder, SQRT2
+
+"""
+Benchmark of the in-house PathFinder (A* and Jump Point Search) against the third-party pathfinding package,
+used the way Map used it before: a new Grid and AStarFinder for every request.
+
+Run from the root of the project: python -m benchmark.bench_path_finder
+"""
+
+def random_walkability(size: int, density: float, rng: random.Random) -> bytearray:
+    """
+    Build a walkability bitmap with randomly occupied tiles.
+
+    :param size: The size of the map.
+    :type size: int
+    :param density: The ratio of occupied tiles.
+    :type density: float
+    :param rng: The random generator.
+    :type rng: random.Random
+    :return: The walkability bitmap.
+    :rtype: bytearray
+    """
+    walkable = bytearray(b'\x01') * (size * size)
+    for index in rng.sample(range(size * size), int(size * size * density)):
+        walkable[index] = 0
+    return walkable
+
+def path_cost(start: Coordinate, path: list[Coordinate]) -> float:
+    """
+    Compute the cost of a path, counting straight moves as 1 and diagonal moves as sqrt(2).
+
+    :param start: The starting coordinate.
+    :type start: Coordinate
+    :param path: The path, without the start.
+    :type path: list[Coordinate]
+    :return: The cost of the path.
+    :rtype: float
+    """
+    cost = 0.0
+    previous = start
+    for coordinate in path:
+        diagonal = previous.get_x() != coordinate.get_x() and previous.get_y() != coordinate.get_y()
+        cost += SQRT2 if diagonal else 1
+        previous = coordinate
+    return cost
+
+def third_party_path(walkable: bytearray, size: int, start: Coordinate, end: Coordinate, diagonal: bool) -> list[Coordinate]:
+    """
+    Find a path with the third-party pathfinding package, building the grid like the previous Map implementation.
+
+    :return: The path, without the start.
+    :rtype: list[Coordinate]
+    """
+    from pathfinding.core.diagonal_movement import DiagonalMovement
+    from pathfinding.core.grid import Grid
+    from pathfinding.finder.a_star import AStarFinder
+    matrix = [list(walkable[y * size:(y + 1) * size]) for y in range(size)]
+    matrix[start.get_y()][start.get_x()] = 1
+    matrix[end.get_y()][end.get_x()] = 1
+    grid = Grid(matrix=matrix)
+    finder = AStarFinder(diagonal_movement=DiagonalMovement.always if diagonal else DiagonalMovement.never)
+    path, _ = finder.find_path(grid.node(start.get_x(), start.get_y()), grid.node(end.get_x(), end.get_y()), grid)
+    return [Coordinate(x, y) for x, y in path[1:]]
+
+def run(size: int, requests: int, density: float, seed: int) -> None:
+    """
+    Run the benchmark and print the average time per request of each path finder.
+    """
+    rng = random.Random(seed)
+    walkable = random_walkability(size, density, rng)
+    pairs = []
+    while len(pairs) < requests:
+        start = Coordinate(rng.randrange(size), rng.randrange(size))
+        end = Coordinate(rng.randrange(size), rng.randrange(size))
+        if start != end:
+            pairs.append((start, end))
+
+    finders = {
+        "A*": lambda start, end, diagonal: PathFinder(walkable, size).find_path(start, end, diagonal),
+        "JPS": lambda start, end, diagonal: PathFinder(walkable, size, True).find_path(start, end, diagonal),
+    }
+    try:
+        import pathfinding  # noqa: F401
+        finders["pathfinding (third-party)"] = lambda start, end, diagonal: third_party_path(walkable, size, start, end, diagonal)
+    except ImportError:
+        print("The pathfinding package is not installed, only the in-house path finder is measured.")
+
+    print(f"Map {size}x{size}, {density:.0%} occupied, {requests} requests")
+    for diagonal in (True, False):
+        costs = {}
+        for name, finder in finders.items():
+            if name == "JPS" and not diagonal:
+                continue
+            begin = time.perf_counter()
+            costs[name] = [round(path_cost(start, finder(start, end, diagonal)), 6) for start, end in pairs]
+            elapsed = time.perf_counter() - begin
+            print(f"  {'diagonal' if diagonal else 'non diagonal':<13} {name:<26} {elapsed / requests * 1000:8.2f} ms/path")
+        reference = next(iter(costs.values()))
+        if any(cost != reference for cost in costs.values()):
+            print("  Warning: the path finders did not find paths of the same cost.")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the path finders.")
+    parser.add_argument("--size", type=int, default=120, help="Size of the map.")
+    parser.add_argument("--requests", type=int, default=50, help="Number of path requests.")
+    parser.add_argument("--density", type=float, default=0.1, help="Ratio of occupied tiles.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the random map.")
+    arguments = parser.parse_args()
+    run(arguments.size, arguments.requests, arguments.density, arguments.seed)
@@ -102,8 +102,9 @@ class AIController:
         self.__players: list[Player] = self.__game_controller.get_players()
         self.__refresh_rate: int = refresh_rate
         self.__running = True
+        self.__snapshot: Map = self.__game_controller.get_map().snapshot()
         for player in self.__players:
-            player.set_ai(AI(player, None, self.__game_controller.get_map().capture()))
+            player.set_ai(AI(player, None, self.__snapshot))
 
     def exit(self) -> None:
         """
@@ -114,32 +115,50 @@ class AIController:
 
     def update_knowledge(self) -> None:
         """
-        Updates the known map of the player.
-
-        :param player: The player.
-        :type player: Player
+        Updates the known map and enemies of the players.
+        All the players share one snapshot of the map, which costs the changes made on the map until the next update.
         """
         for player in self.__players:
             player.update_centre_coordinate()
+        previous = self.__snapshot
+        self.__snapshot = self.__game_controller.get_map().snapshot()
+        if previous is not None:
+            previous.release()
+        captures = [player.capture() for player in self.__players]
         for player in self.__players:
-            player.get_ai().set_map_known(self.__game_controller.get_map().capture())
-            player.get_ai().update_enemies([enemy.capture() for enemy in self.__players if enemy != player])
+            player.get_ai().set_map_known(self.__snapshot)
+            player.get_ai().update_enemies([capture for enemy, capture in zip(self.__players, captures) if enemy != player])
 
 
        
+    def get_refresh_rate(self) -> int:
+        """
+        Returns the time between two decisions of the AIs, in seconds of game.
+
+        :return: The refresh rate.
+        :rtype: int
+        """
+        return self.__refresh_rate
+
+    def step(self) -> None:
+        """
+        Updates the knowledge of the AIs and lets each of them take its decisions, in the order of the players.
+        """
+        self.update_knowledge()
+        for player in self.__players:
+            try:    
+                player.get_ai().get_strategy().execute()
+            except (ValueError, IndexError,AttributeError):
+                pass
+
     def ai_loop(self) -> None:
         """
         The main loop of the AIController.
         """
         while self.__running:
             ##print("AI loop")
-            for player in self.__players:
-                self.update_knowledge()
-            for player in self.__players:
-                try:    
-                    player.get_ai().get_strategy().execute()
-                except (ValueError, IndexError,AttributeError):
-                    pass
+            with self.__game_controller.get_lock():
+                self.step()
             if self.__game_controller.get_speed() != 0:
                 time.wait(1000*self.__refresh_rate//self.__game_controller.get_speed())
 
@@ -160,4 +179,7 @@ class AIController:
         Loads the AIController.
         """
         self.__game_controller = game_controller
-        self.__players = self.__game_controller.get_players()
\ No newline at end of file
+        self.__players = self.__game_controller.get_players()
+        if self.__snapshot is not None:
+            self.__snapshot.release()
+        self.__snapshot = self.__game_controller.get_map().snapshot()
\ No newline at end of file
@@ -1,4 +1,5 @@
 from controller.interactions import Interactions
+from controller.command_scheduler import CommandScheduler
 from util.map import Map
 from model.player.player import Player
 from model.game_object import GameObject
@@ -6,11 +7,12 @@ from model.units.unit import Unit
 from util.coordinate import Coordinate
 from model.resources.resource import Resource
 from model.units.villager import Villager
-from model.units.horseman import Horseman
 from model.units.swordsman import Swordsman
-from model.units.archer import Archer
 from model.buildings.building import Building
+from model.buildings.town_center import TownCenter
+from model.buildings.barracks import Barracks
 from model.entity import Entity
+from util.flow_field import FlowField
 from enum import Enum
 from abc import ABC, abstractmethod
 
@@ -23,13 +25,12 @@ class Process(Enum):
     DROP = 4
     BUILD = 5
 
-class UnitSpawner(dict[str, Unit]):
-    """This class is responsible for storing the unit spawner."""
+class UnitSpawner(dict[type, Unit]):
+    """This class is responsible for storing the unit spawner, keyed by the type of the building."""
     def __init__(self) -> None:
-        self["Town Center"] = Villager()
-        self["Barracks"] = Swordsman()
-        self["Archery Range"] = Archer()
-        self["Stable"] = Horseman()
+        self[TownCenter] = Villager()
+        self[Barracks] = Swordsman()
+
 class Command(ABC):
     """This class is responsible for executing commands."""
 
@@ -55,6 +56,17 @@ class Command(ABC):
         self.__convert_coeff: int = convert_coeff
         self.__time: float = 0
         self.__tick: int = 0
+        self.__due: int = 0
+        self.__scheduler: CommandScheduler = None
+    def __setstate__(self, state: dict) -> None:
+        """
+        Restores a pickled command, the commands pickled before the scheduler counting their ticks themselves.
+        :param state: The attributes of the command.
+        :type state: dict
+        """
+        self.__due = 0
+        self.__scheduler = None
+        self.__dict__.update(state)
     def get_interactions(self) -> Interactions:
         """
         Returns the interactions of the command.
@@ -64,18 +76,29 @@ class Command(ABC):
         return self.__interactions
     def get_tick(self) -> int:
         """
-        Returns the tick of the command.
+        Returns the number of ticks left before the command is due.
         :return: The tick of the command.
         :rtype: int
         """
-        return self.__tick
+        if self.__scheduler is None:
+            return self.__tick
+        return self.__due - self.__scheduler.get_now()
     def set_tick(self, tick: int) -> None:
         """
-        Sets the tick of the command.
+        Sets the number of ticks left before the command is due.
         :param tick: The tick of the command.
         :type tick: int
         """
         self.__tick = tick
+        if self.__scheduler is not None:
+            self.__due = self.__scheduler.get_now() + tick
+    def get_due(self) -> int:
+        """
+        Returns the tick of the scheduler when the command is due.
+        :return: The tick when the command is due.
+        :rtype: int
+        """
+        return self.__due
     
     def get_time(self) -> float:
         """
@@ -123,29 +146,30 @@ class Command(ABC):
         :rtype: int
         """
         return self.__convert_coeff
-    def push_command_to_list(self, command_list: list['Command']) -> None:
+    def push_command_to_list(self, command_list: CommandScheduler) -> None:
         """
-        Pushes the command to the given list.
-        :param command_list: The list where the command will be pushed.
-        :type command_list: list
+        Pushes the command to the given scheduler, it runs on the current tick then on the tick it is due.
+        :param command_list: The scheduler where the command will be pushed.
+        :type command_list: CommandScheduler
         """
-        for command in command_list:
-            if command.get_entity() == self.__entity and not (command.get_process() == Process.SPAWN):
+        for command in command_list.get_commands(self.__entity):
+            if not (command.get_process() == Process.SPAWN):
                 if command.get_process() == Process.COLLECT or command.get_process() == Process.BUILD:
                     raise ValueError("Entity is already collecting or building.")
                 if (command.get_process() == Process.ATTACK or command.get_process() == Process.MOVE) and command.get_process() == self.__process:
                     raise ValueError("Entity is cooling down from attacking or moving.")
         
-        command_list.append(self)
+        self.__scheduler = command_list
+        self.__due = command_list.get_now() + self.__tick
+        command_list.push(self)
     
-    def remove_command_from_list(self, command_list: list['Command']) -> None:
+    def remove_command_from_list(self, command_list: CommandScheduler) -> None:
         """
-        Removes the command from the given list.
-        :param command_list: The list where the command will be removed.
-        :type command_list: list
+        Removes the command from the given scheduler.
+        :param command_list: The scheduler where the command will be removed.
+        :type command_list: CommandScheduler
         """
-        if self in command_list:
-            command_list.remove(self)
+        command_list.remove(self)
 
     @abstractmethod
     def run_command(self):
@@ -161,7 +185,7 @@ class Command(ABC):
 class SpawnCommand(Command):
     """This class is responsible for executing spawn commands."""
 
-    def __init__(self, map: Map, player: Player, building: Building, target_coord: Coordinate, convert_coeff: int, command_list: list[Command]) -> None:
+    def __init__(self, map: Map, player: Player, building: Building, target_coord: Coordinate, convert_coeff: int, command_list: CommandScheduler) -> None:
         """
         Initializes the SpawnCommand with the given map, player, building, target_coord and convert_coeff.
         :param map: The map where the command will be executed
@@ -176,7 +200,7 @@ class SpawnCommand(Command):
         :type convert_coeff: int
         """
         super().__init__(map, player, building, Process.SPAWN, convert_coeff)
-        self.set_time(UnitSpawner()[building.get_name()].get_spawning_time())
+        self.set_time(UnitSpawner()[type(building)].get_spawning_time())
         self.set_tick(int(self.get_time() * convert_coeff))
         self.__target_coord = target_coord
         self.__command_list = command_list
@@ -201,13 +225,13 @@ class SpawnCommand(Command):
             if self.get_player().get_unit_count() >= self.get_player().get_max_population():
                 super().remove_command_from_list(self.__command_list)
                 raise ValueError("Population limit reached.")
-            if not all(self.get_player().check_consume(resource, amount) for resource, amount in UnitSpawner()[self.get_entity().get_name()].get_cost().items()):
+            if not all(self.get_player().check_consume(resource, amount) for resource, amount in UnitSpawner()[type(self.get_entity())].get_cost().items()):
                 super().remove_command_from_list(self.__command_list)
-                raise ValueError(f"Not enough resources. Needing {UnitSpawner()[self.get_entity().get_name()].get_cost()} while having {self.get_player().get_resources()}")
+                raise ValueError(f"Not enough resources. Needing {UnitSpawner()[type(self.get_entity())].get_cost()} while having {self.get_player().get_resources()}")
             if not self.get_interactions().get_map().check_placement(self.__place_holder, self.__target_coord):
                 super().remove_command_from_list(self.__command_list)
                 raise ValueError("Invalid placement.")
-            for resource, amount in UnitSpawner()[self.get_entity().get_name()].get_cost().items():
+            for resource, amount in UnitSpawner()[type(self.get_entity())].get_cost().items():
                 self.get_player().consume(resource, amount)
                 #print(f"Player {self.get_player().get_name()} consumed {amount} {resource}")
             self.get_interactions().place_object(self.__place_holder, self.__target_coord)
@@ -216,18 +240,17 @@ class SpawnCommand(Command):
         if self.get_tick() <= 0:
             if self in self.__command_list:
                 self.get_interactions().remove_object(self.__place_holder)
-                spawned: Unit = UnitSpawner()[self.get_entity().get_name()]
+                spawned: Unit = UnitSpawner()[type(self.get_entity())]
                 self.get_interactions().place_object(spawned, self.__target_coord)
                 self.get_interactions().link_owner(self.get_player(), spawned)
                 
                 super().remove_command_from_list(self.__command_list)
             else:
                 pass
-        self.set_tick(self.get_tick() - 1)
 class MoveCommand(Command):
     """This class is responsible for executing move commands."""
     
-    def __init__(self, map: Map, player: Player, unit: Unit, target_coord: Coordinate, convert_coeff: int, command_list: list[Command]) -> None:
+    def __init__(self, map: Map, player: Player, unit: Unit, target_coord: Coordinate, convert_coeff: int, command_list: CommandScheduler) -> None:
         """
         Initializes the MoveCommand with the given map, player, entity, process and convert_coeff.
         :param map: The map where the command will be executed.
@@ -256,12 +279,11 @@ class MoveCommand(Command):
             self.get_interactions().move_unit(self.get_entity(), self.__target_coord)
         if self.get_tick() <=0:
             super().remove_command_from_list(self.__command_list)
-        self.set_tick(self.get_tick() - 1)
     
 class AttackCommand(Command):
     """This class is responsible for executing attack commands."""
     
-    def __init__(self, map: Map, player: Player, unit: Unit, target_coord: Coordinate, convert_coeff: int, command_list: list[Command]) -> None:
+    def __init__(self, map: Map, player: Player, unit: Unit, target_coord: Coordinate, convert_coeff: int, command_list: CommandScheduler) -> None:
         """
         Initializes the AttackCommand with the given map, player, entity, process and convert_coeff.
         :param map: The map where the command will be executed
@@ -293,12 +315,11 @@ class AttackCommand(Command):
     
         if self.get_tick() <= 0:
             super().remove_command_from_list(self.__command_list)
-        self.set_tick(self.get_tick() - 1)
 
 class CollectCommand(Command):
     """This class is responsible for executing collect commands."""
     
-    def __init__(self, map: Map, player: Player, unit: Villager, target_coord: Coordinate, convert_coeff: int, command_list: list[Command]) -> None:
+    def __init__(self, map: Map, player: Player, unit: Villager, target_coord: Coordinate, convert_coeff: int, command_list: CommandScheduler) -> None:
         """
         Initializes the CollectCommand with the given map, player, entity, process and convert_coeff.
         :param map: The map where the command will be executed
@@ -327,12 +348,11 @@ class CollectCommand(Command):
             if self in self.__command_list:
                 self.get_interactions().collect_resource(self.get_entity(), self.__target_coord,1)
                 super().remove_command_from_list(self.__command_list)
-        self.set_tick(self.get_tick() - 1)
 
 class DropCommand(Command):
     """This class is responsible for executing drop commands."""
     
-    def __init__(self, map: Map, player: Player, unit: Villager, target_coord: Coordinate, convert_coeff: int, command_list: list[Command]) -> None:
+    def __init__(self, map: Map, player: Player, unit: Villager, target_coord: Coordinate, convert_coeff: int, command_list: CommandScheduler) -> None:
         """
         Initializes the DropCommand with the given map, player, entity, process and convert_coeff.
         :param map: The map where the command will be executed
@@ -361,7 +381,7 @@ class DropCommand(Command):
 class BuildCommand(Command):
     """This class is responsible for executing build commands."""
     
-    def __init__(self, map: Map, player: Player, unit: Villager, building: Building, target_coord: Coordinate, convert_coeff: int, command_list: list[Command]) -> None:
+    def __init__(self, map: Map, player: Player, unit: Villager, building: Building, target_coord: Coordinate, convert_coeff: int, command_list: CommandScheduler) -> None:
         """
         Initializes the BuildCommand with the given map, player, entity, process and convert_coeff.
         :param map: The map where the command will be executed
@@ -413,13 +433,12 @@ class BuildCommand(Command):
                 if self.__building.is_population_increase():
                     self.get_player().set_max_population(self.get_player().get_max_population() + self.__building.get_capacity_increase())
             super().remove_command_from_list(self.__command_list)
-        self.set_tick(self.get_tick() - 1)
 
 
 class CommandManager:
     """This class is responsible for managing commands of a single player, using the same list of commands for all players."""
 
-    def __init__(self, map: Map, player: Player, convert_coeff: int, command_list: list[Command]) -> None:
+    def __init__(self, map: Map, player: Player, convert_coeff: int, command_list: CommandScheduler) -> None:
         """
         Initializes the CommandManager with the given map, player and convert_coeff.
         :param map: The map where the command will be executed.
@@ -432,7 +451,7 @@ class CommandManager:
         self.__map: Map = map
         self.__player: Player = player
         self.__convert_coeff: int = convert_coeff
-        self.__command_list: list[Command] = command_list
+        self.__command_list: CommandScheduler = command_list
     def get_map(self):
         """
         Returns the map where the command will be executed.
@@ -440,20 +459,28 @@ class CommandManager:
         :rtype: Map
         """
         return self.__map
-    def get_command_list(self) -> list[Command]:
+    def get_command_list(self) -> CommandScheduler:
         """
         Returns the command list.
-        :return: The command list.
-        :rtype: list
+        :return: The scheduler of the commands.
+        :rtype: CommandScheduler
         """
         return self.__command_list
     def get_player(self) -> Player:
         return self.__player
-    
+    def get_convert_coeff(self) -> int:
+        """
+        Returns the coefficient used to convert time to tick.
+        :return: The coefficient used to convert time to tick.
+        :rtype: int
+        """
+        return self.__convert_coeff
+
     def execute_network_command(self, command: Command):
         """Ajoute une commande réseau et l'exécute immédiatement."""
         print(f"Ajout de la commande réseau : {command}")
-        self.__command_list.append(command)
+        if command not in self.__command_list:
+            command.push_command_to_list(self.__command_list)
     
     def command(self, entity: Entity, process: Process, target_coord: Coordinate, building: Building = None ) -> Command:
         """
@@ -468,17 +495,24 @@ class CommandManager:
         :type building: Building
         """
         if process == Process.SPAWN:
-            return SpawnCommand(self.__map, self.__player, entity, target_coord, self.__convert_coeff, self.__command_list)
+            command = SpawnCommand(self.__map, self.__player, entity, target_coord, self.__convert_coeff, self.__command_list)
         elif process == Process.MOVE:
-            return MoveCommand(self.__map, self.__player, entity, target_coord, self.__convert_coeff, self.__command_list)
+            command = MoveCommand(self.__map, self.__player, entity, target_coord, self.__convert_coeff, self.__command_list)
         elif process == Process.ATTACK:
-            return AttackCommand(self.__map, self.__player, entity, target_coord, self.__convert_coeff, self.__command_list)
+            command = AttackCommand(self.__map, self.__player, entity, target_coord, self.__convert_coeff, self.__command_list)
         elif process == Process.COLLECT:
-            return CollectCommand(self.__map, self.__player, entity, target_coord, self.__convert_coeff, self.__command_list)
+            command = CollectCommand(self.__map, self.__player, entity, target_coord, self.__convert_coeff, self.__command_list)
         elif process == Process.DROP:
-            return DropCommand(self.__map, self.__player, entity, target_coord, self.__convert_coeff, self.__command_list)
+            command = DropCommand(self.__map, self.__player, entity, target_coord, self.__convert_coeff, self.__command_list)
         elif process == Process.BUILD:
-            return BuildCommand(self.__map, self.__player, entity, building, target_coord, self.__convert_coeff, self.__command_list)
+            command = BuildCommand(self.__map, self.__player, entity, building, target_coord, self.__convert_coeff, self.__command_list)
+        else:
+            return None
+        # Only the commands which were scheduled are recorded, the others failed without changing the game
+        journal = self.__command_list.get_journal()
+        if journal is not None:
+            journal.record_command(self.__player, entity, process, target_coord, building)
+        return command
     
 class Task(ABC):
     def __init__(self,command_manager: CommandManager,  entity: Entity, target_coord: Coordinate) -> None:
@@ -606,8 +640,70 @@ class MoveTask(Task):
             self.get_entity().set_task(None)
             
 
+class FlowMoveTask(Task):
+    def __init__(self, command_manager: CommandManager, unit: Unit, target_coord: Coordinate) -> None:
+        """
+        Initializes the FlowMoveTask with the given command_manager, unit and target_coord.
+        The unit follows the flow field shared by all the units heading to the region of the target,
+        then finds its own path once it is in this region.
+        :param command_manager: The command manager of the player that will execute the task.
+        :type command_manager: CommandManager
+        :param unit: The unit that will execute the task.
+        :type unit: Unit
+        :param target_coord: The target coordinate where the unit will move.
+        :type target_coord: Coordinate
+        """
+        super().__init__(command_manager, unit, target_coord)
+        self.__flow_field: FlowField = self.get_command_manager().get_map().get_flow_field(self.get_target_coord())
+        self.__move_task: MoveTask = None
+        self.__command: Command = None
+        self.__name : str = "FlowMoveTask"
+
+    def get_name(self) -> str:
+        """
+        Returns the name of the task.
+        :return: The name of the task.
+        :rtype: str
+        """
+        return self.__name
+
+    def get_waiting(self) -> bool:
+        """
+        Returns whether the task is waiting or not.
+        :return: True if the task is waiting, False otherwise.
+        :rtype: bool
+        """
+        if self.__move_task is not None:
+            return self.__move_task.get_waiting()
+        return super().get_waiting()
+
+    def execute_task(self):
+        """
+        Execute the flow move task.
+        """
+        if self.__move_task is not None:
+            self.__move_task.execute_task()
+            return
+        try:
+            if not self.get_waiting():
+                next_coord = None
+                if self.get_entity().get_coordinate().distance(self.get_target_coord()) > FlowField.REGION_SIZE:
+                    next_coord = self.__flow_field.next_step(self.get_entity().get_coordinate())
+                if next_coord is None: # in the region of the target, or the way is blocked
+                    self.__move_task = MoveTask(self.get_command_manager(), self.get_entity(), self.get_target_coord())
+                    self.__move_task.execute_task()
+                    return
+                self.__command = self.get_command_manager().command(self.get_entity(), Process.MOVE, next_coord)
+                self.set_waiting(True)
+            if self.__command.get_tick() <= 0:
+                self.set_waiting(False)
+        except ValueError:
+            self.set_waiting(False)
+            self.get_entity().set_task(None)
+
+
 class KillTask(Task):
-    def __init__(self, command_manager: CommandManager, entity: Entity, target_coord: Coordinate) -> None:
+    def __init__(self, command_manager: CommandManager, entity: Entity, target_coord: Coordinate, flow: bool = False) -> None:
         """
         Initializes the KillTask with the given command_manager, entity and target_coord.
         :param command_manager: The command manager of the player that will execute the task.
@@ -616,9 +712,14 @@ class KillTask(Task):
         :type entity: Entity
         :param target_coord: The target coordinate where the entity will attack.
         :type target_coord: Coordinate
+        :param flow: True to reach the target with a shared flow field instead of a path of its own.
+        :type flow: bool
         """
         super().__init__(command_manager, entity, target_coord)
-        self.__move_task: MoveTask = MoveTask(self.get_command_manager(), self.get_entity(), self.get_target_coord())
+        if flow:
+            self.__move_task: Task = FlowMoveTask(self.get_command_manager(), self.get_entity(), self.get_target_coord())
+        else:
+            self.__move_task: Task = MoveTask(self.get_command_manager(), self.get_entity(), self.get_target_coord())
         self.__command: Command = None
         self.__name : str = "KillTask"
         
@@ -770,7 +871,7 @@ class SpawnTask(Task):
         :param building: The building that will execute the task.
         :type building: Building
         """
-        target_coord : Coordinate = command_manager.get_map().find_nearest_empty_zones(building.get_coordinate(), 1)[0]
+        target_coord : Coordinate = command_manager.get_map().find_nearest_empty_zones(building.get_coordinate(), 1, 1)[0]
         super().__init__(command_manager, building, target_coord)
         self.__name : str = "SpawnTask"
         self.__command: Command = None
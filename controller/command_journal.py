@@ -0,0 +1,353 @@
+import os
+import re
+import shutil
+import struct
+import threading
+from controller.command import Process
+from model.buildings.barracks import Barracks
+from model.buildings.building import Building
+from model.buildings.farm import Farm
+from model.buildings.house import House
+from model.buildings.town_center import TownCenter
+from model.entity import Entity
+from model.player.player import Player
+from controller.command_scheduler import CommandScheduler
+from util.coordinate import Coordinate
+from util.save_file import SaveFile
+import typing
+if typing.TYPE_CHECKING:
+    from controller.game_controller import GameController
+
+"""
+This file contains the CommandJournal class which autosaves a game as a base save and the commands issued since.
+"""
+
+class CommandJournal:
+    """
+    Append-only journal of the commands of a game, to autosave it without writing the whole game.
+
+    The journal is made of segments, named after the tick they start at: a base save of the game on that tick (``.sav``)
+    and the log of the commands issued from that tick on (``.log``). A log is a sequence of fixed-size records:
+    a tick record means the previous ticks are over and the next commands are issued on that tick,
+    a command record keeps the player, the entity, the process, the target and the building of a command.
+    The log is flushed every FLUSH_INTERVAL ticks, so a crash loses at most these ticks,
+    and every COMPACT_INTERVAL ticks a new segment starts from a new base save, written on another thread.
+
+    The game being deterministic but for the commands, a tick is restored by loading the nearest base save before it,
+    then issuing the logged commands again tick by tick. The logs follow each other, so a base save missing
+    after a crash only makes the replay longer.
+    """
+    FLUSH_INTERVAL = 60
+    COMPACT_INTERVAL = 3600
+    MAX_SEGMENTS = 4
+    LOG_EXTENSION = ".log"
+    BUILDINGS = [TownCenter, House, Farm, Barracks]
+    __TICK = 0
+    __COMMAND = 1
+    __TICK_RECORD = struct.Struct("<BI")
+    __COMMAND_RECORD = struct.Struct("<BBIBiiB")
+
+    def __init__(self, directory: str, max_segments: int = MAX_SEGMENTS) -> None:
+        """
+        Create a journal writing its segments to a directory.
+
+        :param directory: The directory of the journal.
+        :type directory: str
+        :param max_segments: The number of segments kept, None to keep the whole game.
+        :type max_segments: int
+        """
+        self.__directory: str = directory
+        self.__max_segments: int = max_segments
+        self.__players: list[Player] = []
+        self.__command_list: CommandScheduler = None
+        self.__log: typing.BinaryIO = None
+        self.__segment: int = None
+        self.__tick: int = None
+        self.__flushed: int = 0
+        self.__writers: list[threading.Thread] = []
+
+    def get_directory(self) -> str:
+        """
+        Get the directory of the journal.
+
+        :return: The directory.
+        :rtype: str
+        """
+        return self.__directory
+
+    def start(self, game_controller: 'GameController') -> None:
+        """
+        Start journaling a game with a first base save. The commands are then recorded through the scheduler of the game.
+
+        :param game_controller: The game controller.
+        :type game_controller: GameController
+        """
+        os.makedirs(self.__directory, exist_ok=True)
+        self.__players = list(game_controller.get_players())
+        self.__command_list = game_controller.get_commandlist()
+        self.__command_list.set_journal(self)
+        self.__compact(game_controller)
+
+    def record_command(self, player: Player, entity: Entity, process: Process, target_coord: Coordinate, building: Building = None) -> None:
+        """
+        Record a command issued on the current tick.
+
+        :param player: The player of the command.
+        :type player: Player
+        :param entity: The entity executing the command.
+        :type entity: Entity
+        :param process: The process of the command.
+        :type process: Process
+        :param target_coord: The target of the command.
+        :type target_coord: Coordinate
+        :param building: The building to build, for a build command.
+        :type building: Building
+        """
+        if self.__log is None:
+            return
+        self.__mark(self.__command_list.get_now())
+        self.__log.write(CommandJournal.__COMMAND_RECORD.pack(
+            CommandJournal.__COMMAND, self.__players.index(player), entity.get_id(), process.value,
+            target_coord.get_x(), target_coord.get_y(), CommandJournal.BUILDINGS.index(type(building)) + 1 if building is not None else 0
+        ))
+
+    def end_tick(self, game_controller: 'GameController') -> None:
+        """
+        Record the end of a tick, flushing the log or starting a new segment when it is time to.
+
+        :param game_controller: The game controller.
+        :type game_controller: GameController
+        """
+        if self.__log is None:
+            return
+        now = game_controller.get_commandlist().get_now()
+        if now - self.__segment >= CommandJournal.COMPACT_INTERVAL:
+            self.__compact(game_controller)
+        elif now - self.__flushed >= CommandJournal.FLUSH_INTERVAL:
+            self.__mark(now)
+            self.__log.flush()
+            self.__flushed = now
+
+    def close(self) -> None:
+        """
+        Close the log, marking the tick the game stopped at, and wait for the base saves being written.
+        """
+        if self.__log is not None:
+            self.__mark(self.__command_list.get_now())
+            self.__log.close()
+            self.__log = None
+        for writer in self.__writers:
+            writer.join()
+        self.__writers = []
+
+    def __mark(self, tick: int) -> None:
+        """
+        Write a tick record if the log is not already on that tick.
+
+        :param tick: The current tick.
+        :type tick: int
+        """
+        if tick != self.__tick:
+            self.__log.write(CommandJournal.__TICK_RECORD.pack(CommandJournal.__TICK, tick))
+            self.__tick = tick
+
+    def __compact(self, game_controller: 'GameController') -> None:
+        """
+        Start a new segment: capture a base save of the game, written on another thread, and open a new log.
+
+        :param game_controller: The game controller.
+        :type game_controller: GameController
+        """
+        save = game_controller.capture_save()
+        now = save.get_header()["tick"]
+        if self.__log is not None:
+            self.__mark(now)
+            self.__log.close()
+        self.__segment = self.__flushed = now
+        self.__tick = None
+        path = os.path.join(self.__directory, f"{now:010d}")
+        self.__log = open(path + CommandJournal.LOG_EXTENSION, 'wb')
+        self.__mark(now)
+        self.__log.flush()
+        self.__writers = [writer for writer in self.__writers if writer.is_alive()]
+        writer = threading.Thread(target=self.__write_base, args=(save, path + SaveFile.EXTENSION), name="Autosave")
+        writer.start()
+        self.__writers.append(writer)
+
+    def __write_base(self, save: SaveFile, path: str) -> None:
+        """
+        Write a base save, then drop the oldest segments. It runs on the thread of the save.
+
+        :param save: The base save.
+        :type save: SaveFile
+        :param path: The path of the base save.
+        :type path: str
+        """
+        save.write(path)
+        if self.__max_segments is None:
+            return
+        segments = CommandJournal.get_segments(self.__directory)
+        for tick in segments[:-self.__max_segments]:
+            for extension in (SaveFile.EXTENSION, CommandJournal.LOG_EXTENSION):
+                try:
+                    os.remove(os.path.join(self.__directory, f"{tick:010d}{extension}"))
+                except FileNotFoundError:
+                    pass
+
+    @staticmethod
+    def get_segments(directory: str) -> list[int]:
+        """
+        Get the segments of a journal.
+
+        :param directory: The directory of the journal.
+        :type directory: str
+        :return: The first tick of each segment, in order.
+        :rtype: list[int]
+        """
+        if not os.path.isdir(directory):
+            return []
+        return sorted({int(name[:10]) for name in os.listdir(directory) if re.fullmatch(r"\d{10}\.(sav|log)", name)})
+
+    @staticmethod
+    def get_range(directory: str) -> tuple[int, int]:
+        """
+        Get the ticks a journal can restore.
+
+        :param directory: The directory of the journal.
+        :type directory: str
+        :return: The first and the last tick which can be restored, None if the journal has no base save.
+        :rtype: tuple[int, int]
+        """
+        bases = [tick for tick in CommandJournal.get_segments(directory) if os.path.exists(os.path.join(directory, f"{tick:010d}{SaveFile.EXTENSION}"))]
+        if not bases:
+            return None
+        last = bases[0]
+        for record in CommandJournal.__read_logs(directory, bases[0]):
+            if record[0] == CommandJournal.__TICK:
+                last = max(last, record[1])
+        return bases[0], last
+
+    @staticmethod
+    def find_base(directory: str, tick: int = None) -> str:
+        """
+        Find the base save to restore a tick from: the last one which is not after the tick.
+
+        :param directory: The directory of the journal.
+        :type directory: str
+        :param tick: The tick to restore, the last one if None.
+        :type tick: int
+        :return: The path of the base save.
+        :rtype: str
+        :raises ValueError: If no base save is before the tick.
+        """
+        bases = [
+            base for base in CommandJournal.get_segments(directory)
+            if (tick is None or base <= tick) and os.path.exists(os.path.join(directory, f"{base:010d}{SaveFile.EXTENSION}"))
+        ]
+        if not bases:
+            raise ValueError(f"No autosave of {directory} can restore the tick {tick}.")
+        return os.path.join(directory, f"{bases[-1]:010d}{SaveFile.EXTENSION}")
+
+    @staticmethod
+    def prune_journals(parent: str, keep: int, current: str = None) -> None:
+        """
+        Remove the oldest journals of a directory, the last changed ones being kept.
+
+        :param parent: The directory holding the journals, one directory each.
+        :type parent: str
+        :param keep: The number of journals kept.
+        :type keep: int
+        :param current: The journal being written, never removed.
+        :type current: str
+        """
+        journals = []
+        for name in os.listdir(parent) if os.path.isdir(parent) else []:
+            path = os.path.join(parent, name)
+            try:
+                if os.path.isdir(path):
+                    journals.append((os.path.getmtime(path), path))
+            except OSError:
+                pass
+        journals.sort(reverse=True)
+        for _, path in journals[keep:]:
+            if current is None or os.path.abspath(path) != os.path.abspath(current):
+                shutil.rmtree(path, ignore_errors=True)
+
+    @staticmethod
+    def replay(directory: str, game_controller: 'GameController', tick: int = None) -> int:
+        """
+        Bring a game loaded from a base save of a journal, or already brought to a tick of it, to a later tick, issuing the logged commands again.
+        The tasks of the entities are dropped at the end, the AIs giving new ones from the restored state.
+
+        :param directory: The directory of the journal.
+        :type directory: str
+        :param game_controller: The game controller, on a tick of the journal.
+        :type game_controller: GameController
+        :param tick: The tick to restore, before its commands are issued, the last logged tick if None.
+        :type tick: int
+        :return: The tick reached.
+        :rtype: int
+        """
+        command_list = game_controller.get_commandlist()
+        players, map = game_controller.get_players(), game_controller.get_map()
+        # The commands of a tick are only issued once the log shows the tick is over
+        current, pending = None, []
+        for record in CommandJournal.__read_logs(directory, command_list.get_now()):
+            if record[0] == CommandJournal.__COMMAND:
+                if current == command_list.get_now():
+                    pending.append(record)
+                continue
+            for _, player, entity_id, process, x, y, building in pending:
+                players[player].get_command_manager().command(
+                    map.get_object(entity_id), Process(process), Coordinate(x, y), CommandJournal.BUILDINGS[building - 1]() if building else None
+                )
+            pending = []
+            current = record[1] if tick is None else min(record[1], tick)
+            while command_list.get_now() < current:
+                game_controller.update()
+            if tick is not None and current >= tick:
+                break
+        for player in players:
+            for entity in [*player.get_units(), *player.get_buildings()]:
+                entity.set_task(None)
+        return command_list.get_now()
+
+    @staticmethod
+    def __read_logs(directory: str, start: int) -> typing.Iterator[tuple]:
+        """
+        Read the records of the logs of a journal, from the segment holding a tick on.
+
+        :param directory: The directory of the journal.
+        :type directory: str
+        :param start: The tick.
+        :type start: int
+        :return: The records, as their unpacked fields.
+        :rtype: Iterator[tuple]
+        """
+        segments = CommandJournal.get_segments(directory)
+        first = max([segment for segment in segments if segment <= start], default=start)
+        for segment in segments:
+            if segment >= first:
+                yield from CommandJournal.__read_log(os.path.join(directory, f"{segment:010d}{CommandJournal.LOG_EXTENSION}"))
+
+    @staticmethod
+    def __read_log(path: str) -> typing.Iterator[tuple]:
+        """
+        Read the records of a log. A record cut by a crash at the end of the log is ignored.
+
+        :param path: The path of the log.
+        :type path: str
+        :return: The records, as their unpacked fields.
+        :rtype: Iterator[tuple]
+        """
+        if not os.path.exists(path):
+            return
+        with open(path, 'rb') as file:
+            data = file.read()
+        offset = 0
+        while offset < len(data):
+            record = CommandJournal.__TICK_RECORD if data[offset] == CommandJournal.__TICK else CommandJournal.__COMMAND_RECORD
+            if offset + record.size > len(data):
+                return
+            yield record.unpack_from(data, offset)
+            offset += record.size
@@ -0,0 +1,195 @@
+import heapq
+import threading
+import typing
+if typing.TYPE_CHECKING:
+    from controller.command import Command
+    from controller.command_journal import CommandJournal
+    from model.entity import Entity
+
+"""
+This file contains the CommandScheduler class which runs the commands on the ticks they are due.
+"""
+
+class CommandScheduler:
+    """
+    Queue of the commands of all the players, ordered by the tick they are due.
+
+    A command runs on the tick it is pushed, to start, then again on the tick it is due, to finish:
+    the ticks in between cost nothing, whatever the number of commands waiting.
+    The commands are also indexed by entity, so that a new command only checks the commands of its own entity.
+    A journal can be attached to the scheduler, to record the commands issued by the players of a game.
+    """
+
+    def __init__(self) -> None:
+        """
+        Create an empty scheduler at tick 0.
+        """
+        self.__now: int = 0
+        self.__sequence: int = 0
+        self.__queue: list[tuple[int, int, 'Command']] = []
+        self.__scheduled: dict['Command', int] = {}
+        self.__entities: dict['Entity', list['Command']] = {}
+        self.__running: dict['Command', None] = {}
+        self.__lock: threading.RLock = threading.RLock()
+        self.__journal: 'CommandJournal' = None
+
+    def __getstate__(self) -> dict:
+        """
+        Get the state of the scheduler to be pickled, without its lock and its journal.
+
+        :return: The state of the scheduler.
+        :rtype: dict
+        """
+        state = self.__dict__.copy()
+        state['_CommandScheduler__lock'] = None
+        state['_CommandScheduler__journal'] = None
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        """
+        Restore the state of a pickled scheduler, with a new lock.
+
+        :param state: The state of the scheduler.
+        :type state: dict
+        """
+        self.__journal = None
+        self.__dict__.update(state)
+        self.__lock = threading.RLock()
+
+    def get_journal(self) -> 'CommandJournal':
+        """
+        Get the journal recording the commands.
+
+        :return: The journal, None if the commands are not recorded.
+        :rtype: CommandJournal
+        """
+        return self.__journal
+
+    def set_journal(self, journal: 'CommandJournal') -> None:
+        """
+        Set the journal recording the commands.
+
+        :param journal: The journal, None to stop recording the commands.
+        :type journal: CommandJournal
+        """
+        self.__journal = journal
+
+    def get_now(self) -> int:
+        """
+        Get the current tick.
+
+        :return: The current tick.
+        :rtype: int
+        """
+        return self.__now
+
+    def get_commands(self, entity: 'Entity') -> list['Command']:
+        """
+        Get the commands of an entity.
+
+        :param entity: The entity.
+        :type entity: Entity
+        :return: The commands of the entity.
+        :rtype: list[Command]
+        """
+        return list(self.__entities.get(entity, ()))
+
+    def push(self, command: 'Command', tick: int = None) -> None:
+        """
+        Add a command, or move it to another tick if it is already scheduled.
+
+        :param command: The command.
+        :type command: Command
+        :param tick: The tick the command is due, the current tick if None.
+        :type tick: int
+        """
+        with self.__lock:
+            if command not in self.__scheduled and command not in self.__running:
+                self.__entities.setdefault(command.get_entity(), []).append(command)
+            self.__schedule(command, self.__now if tick is None else tick)
+
+    def remove(self, command: 'Command') -> None:
+        """
+        Remove a command, it will not run anymore.
+
+        :param command: The command.
+        :type command: Command
+        """
+        with self.__lock:
+            if self.__scheduled.pop(command, None) is None and command not in self.__running:
+                return
+            self.__running.pop(command, None)
+            commands = self.__entities[command.get_entity()]
+            commands.remove(command)
+            if not commands:
+                del self.__entities[command.get_entity()]
+
+    def pop_due(self) -> list['Command']:
+        """
+        Take the commands due on the current tick. They stay in the scheduler until they are removed,
+        and the ones still there when the tick ends are scheduled again on the tick they are due.
+
+        :return: The due commands, in the order they were scheduled.
+        :rtype: list[Command]
+        """
+        with self.__lock:
+            queue = self.__queue
+            while queue and queue[0][0] <= self.__now:
+                _, sequence, command = heapq.heappop(queue)
+                # An entry is outdated if the command was removed or scheduled again since
+                if self.__scheduled.get(command) == sequence:
+                    del self.__scheduled[command]
+                    self.__running[command] = None
+            return list(self.__running)
+
+    def advance(self) -> None:
+        """
+        End the current tick, scheduling the commands which ran and were not removed on the tick they are due.
+        """
+        with self.__lock:
+            self.__now += 1
+            for command in list(self.__running):
+                self.__schedule(command, max(command.get_due(), self.__now))
+
+    def __schedule(self, command: 'Command', tick: int) -> None:
+        """
+        Put a command in the queue, outdating its previous entry.
+
+        :param command: The command.
+        :type command: Command
+        :param tick: The tick the command is due.
+        :type tick: int
+        """
+        self.__running.pop(command, None)
+        self.__sequence += 1
+        self.__scheduled[command] = self.__sequence
+        heapq.heappush(self.__queue, (tick, self.__sequence, command))
+
+    def __contains__(self, command: 'Command') -> bool:
+        """
+        Check if a command is scheduled or running.
+
+        :param command: The command.
+        :type command: Command
+        :return: True if the command is in the scheduler, False otherwise.
+        :rtype: bool
+        """
+        return command in self.__scheduled or command in self.__running
+
+    def __len__(self) -> int:
+        """
+        Get the number of commands in the scheduler.
+
+        :return: The number of commands.
+        :rtype: int
+        """
+        return len(self.__scheduled) + len(self.__running)
+
+    def __iter__(self) -> typing.Iterator['Command']:
+        """
+        Iterate over the commands in the scheduler.
+
+        :return: An iterator over the commands.
+        :rtype: Iterator[Command]
+        """
+        return iter(list(self.__running) + list(self.__scheduled))
@@ -6,24 +6,32 @@ from model.resources.wood import Wood
 from model.resources.gold import Gold
 from model.units.villager import Villager
 from util.map import Map
+from util.map_cache import MapCache
+from util.save_file import SaveFile
 from util.coordinate import Coordinate
 from util.settings import Settings
 from util.state_manager import MapType, StartingCondition
 from controller.command import CommandManager, Command, TaskManager, BuildTask, MoveCommand, Process, MoveTask, CollectAndDropTask, SpawnCommand
+from controller.command_scheduler import CommandScheduler
+from controller.command_journal import CommandJournal
+from controller.network_server import NetworkServer
 from controller.interactions import Interactions
 from controller.AI_controller import AIController, AI
 from model.player.player import Player
 from pygame import time
+from datetime import datetime
 from model.player.strategy import Strategy1
 import threading
 import typing
-import socket
-import re  # Pour analyser les commandes réseau
+import os
 if typing.TYPE_CHECKING:
     from controller.menu_controller import MenuController
 class GameController:
     """This module is responsible for controlling the game."""
     _instance = None
+    MAP_CACHE: MapCache = MapCache()
+    AUTOSAVE_DIRECTORY = os.path.join("save", "autosave")
+    MAX_AUTOSAVES = 5
 
     @staticmethod
     def get_instance(menu_controller: 'MenuController'):
@@ -41,25 +49,28 @@ class GameController:
         if not load:
             self.__menu_controller: 'MenuController' = menu_controller
             self.settings: Settings = self.__menu_controller.settings
-            self.__command_list: list[Command] = []
+            self.__command_list: CommandScheduler = CommandScheduler()
             self.__players: list[Player] = []
+            self.__lock: threading.RLock = threading.RLock()
             self.__map: Map = self.__generate_map()
             self.__ai_controller: AIController = AIController(self,1)
             self.__assign_AI()
             self.__running: bool = False
             self.__game_thread = threading.Thread(target=self.game_loop)
             self.__ai_thread = threading.Thread(target=self.__ai_controller.ai_loop)
-            self.__network_thread = threading.Thread(target=self.network_loop, daemon=True)
+            self.__network_server: NetworkServer = NetworkServer(self)
             self.__view_controller: ViewController = ViewController(self)
+            self.__start_journal()
             self.__game_thread.start()
             self.__ai_thread.start()
-            self.__network_thread.start()
+            self.__start_network_server()
             self.__view_controller.start_view()
         else:
             self.__menu_controller: 'MenuController' = menu_controller
             self.settings: Settings = self.__menu_controller.settings
-            self.__command_list: list[Command] = []
+            self.__command_list: CommandScheduler = CommandScheduler()
             self.__players: list[Player] = []
+            self.__lock: threading.RLock = threading.RLock()
             self.__map: Map = self.__generate_map()
             self.__ai_controller: AIController = AIController(self,1)
             self.__assign_AI()
@@ -67,64 +78,92 @@ class GameController:
             self.__ai_thread = None
             self.__view_controller = None
             self.__game_thread = None
+            self.__network_server: NetworkServer = NetworkServer(self)
 
-    def network_loop(self):
-        """Boucle réseau : écoute et traite les messages."""
-        host = '0.0.0.0'
-        port = 12345
-
-        server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-        server_socket.bind((host, port))
-        server_socket.listen(5)
-        print(f"Serveur en écoute sur {host}:{port}")
+    def __start_network_server(self) -> None:
+        """
+        Start receiving the commands sent over the network. The game goes on without them if the port is already used.
+        """
+        try:
+            self.__network_server.start()
+        except OSError as e:
+            print(f"Serveur réseau indisponible : {e}")
 
-        while self.__running:
-            try:
-                server_socket.settimeout(1.0)
-                client_socket, addr = server_socket.accept()
-                data = client_socket.recv(1024).decode('utf-8')
-                if data:
-                    print(f"Reçu : {data}")
-                    self.process_network_data(data)
-                client_socket.close()
-            except socket.timeout:
-                continue
-
-        server_socket.close()  
-
-    def process_network_data(self, data: str):
-        """Analyse et exécute une commande réseau reçue."""
-        match = re.match(r"mov (\w+) \((\d+),(\d+)\)", data.strip())
-
-        if match:
-            unit_id, x, y = match.groups()
-            x, y = int(x), int(y)
-
-            for player in self.__players:
-                for unit in player.get_units():
-                    if unit.get_name() == unit_id:  # Vérifie si c'est la bonne unité
-                        print(f"Déplacement de {unit_id} vers ({x}, {y})")
-                        target_coord = Coordinate(x, y)
-                        command = MoveCommand(self.__map, player, unit, target_coord, self.settings.fps.value, self.__command_list)
-                        player.get_command_manager().execute_network_command(command)
-                        return
-            print(f"Erreur: Unité {unit_id} introuvable.")
-        else:
-            print(f"Commande réseau invalide: {data}")
-              
+    def start_all_threads(self, autosave_directory: str = None):
+        """
+        Starts the threads of a loaded game.
 
-    def start_all_threads(self):
+        :param autosave_directory: The autosave the game was loaded from, which goes on, None to start a new one.
+        :type autosave_directory: str
+        """
         self.__game_thread = threading.Thread(target=self.game_loop)
         self.__ai_thread = threading.Thread(target=self.__ai_controller.ai_loop)
         self.__view_controller: ViewController = ViewController(self)
+        self.__start_journal(autosave_directory)
         self.__game_thread.start()
         self.__ai_thread.start()
+        self.__start_network_server()
         self.__view_controller.start_view()
+
+    def __start_journal(self, directory: str = None) -> None:
+        """
+        Start the autosave of the game: a journal of its commands, in a directory of its own under AUTOSAVE_DIRECTORY.
+        Only the MAX_AUTOSAVES last autosaves are kept.
+
+        :param directory: The directory of the autosave the game was loaded from, which goes on, None for a new one.
+        :type directory: str
+        """
+        if directory is None:
+            directory = os.path.join(GameController.AUTOSAVE_DIRECTORY, datetime.now().strftime("%Y-%m-%d_%H-%M-%S"))
+            # Two games started in the same second get their own directories
+            name, count = directory, 1
+            while os.path.exists(directory):
+                directory = f"{name}_{count}"
+                count += 1
+        CommandJournal(directory).start(self)
+        CommandJournal.prune_journals(GameController.AUTOSAVE_DIRECTORY, GameController.MAX_AUTOSAVES, directory)
     
     def get_commandlist(self):
         return self.__command_list
+
+    def get_lock(self) -> threading.RLock:
+        """
+        Returns the lock held while the game changes: during a tick, and while the AIs take their decisions.
+
+        :return: The lock.
+        :rtype: threading.RLock
+        """
+        return self.__lock
+
+    def capture_save(self) -> SaveFile:
+        """
+        Captures the game between two ticks, to be saved.
+        The game only waits for the capture: the save can then be written on another thread while the game goes on.
+
+        :return: The save.
+        :rtype: SaveFile
+        """
+        with self.__lock:
+            return SaveFile.capture(self.settings, self.__map, self.__players, self.__command_list)
         
+    def __scatter(self, map_generation: Map, rng: random.Random, resource_type: type, count: int) -> None:
+        """
+        Places resources on tiles drawn at random among the free tiles of the map, all at once.
+        The tiles are drawn without replacement, so no draw is ever retried.
+
+        :param map_generation: The map being generated.
+        :type map_generation: Map
+        :param rng: The random generator of the game.
+        :type rng: random.Random
+        :param resource_type: The type of the resources.
+        :type resource_type: type
+        :param count: The number of tiles to fill, at most the number of free tiles.
+        :type count: int
+        """
+        free = map_generation.get_free_indices()
+        size = map_generation.get_size()
+        map_generation.add_resources(resource_type, [Coordinate.of(index % size, index // size) for index in rng.sample(free, min(count, len(free)))])
+
     def __generate_players(self, number_of_player: int, map: Map ) -> None:
         """
         Generates the players based on the settings.
@@ -159,8 +198,33 @@ class GameController:
         
     def __generate_map(self) -> Map:
         """
-        Generates a map based on the settings.
+        Generates a map based on the settings, with the random generator of the game.
+        A seeded map is taken from the map cache if it was already generated, with its players and command list.
 
+        :return: The generated map.
+        :rtype: Map
+        """
+        rng = self.settings.reset_random()
+        key = None
+        if self.settings.seed is not None:
+            key = MapCache.key(self.settings.seed, self.settings.map_size.value, MapType(self.settings.map_type).value, self.settings.fps.value)
+            cached = GameController.MAP_CACHE.get(key)
+            if cached is not None:
+                self.__players.extend(cached['players'])
+                self.__command_list = cached['command_list']
+                rng.setstate(cached['random'])
+                return cached['map']
+        map_generation = self.__build_map(rng)
+        if key is not None:
+            GameController.MAP_CACHE.put(key, {'map': map_generation, 'players': self.__players, 'command_list': self.__command_list, 'random': rng.getstate()})
+        return map_generation
+
+    def __build_map(self, rng: random.Random) -> Map:
+        """
+        Builds a new map based on the settings.
+
+        :param rng: The random generator of the game.
+        :type rng: random.Random
         :return: The generated map.
         :rtype: Map
         """
@@ -191,7 +255,7 @@ class GameController:
                     center_coordinate = Coordinate((map_generation.get_size() - center_size) // 2, (map_generation.get_size() - center_size) // 2)
                     coordinate = Coordinate((map_generation.get_size() - center_size) // 2, (map_generation.get_size() - center_size) // 2)
                     while coordinate.distance(center_coordinate) < min_distance:
-                        coordinate = Coordinate(random.randint(0, self.settings.map_size.value - 1), random.randint(0, self.settings.map_size.value - 1))
+                        coordinate = Coordinate(rng.randint(0, self.settings.map_size.value - 1), rng.randint(0, self.settings.map_size.value - 1))
                     coordinate_mirror = Coordinate(
                         self.settings.map_size.value - 1 - coordinate.get_x() - town_center.get_size() + 1,
                         self.settings.map_size.value - 1 - coordinate.get_y() - town_center.get_size() + 1
@@ -225,7 +289,7 @@ class GameController:
                 villager = Villager()
                 # Get a random coordinate from the list and check placement
                 while True:
-                    coordinate = arround_coordinates.pop(random.randint(0, len(arround_coordinates) - 1))
+                    coordinate = arround_coordinates.pop(rng.randint(0, len(arround_coordinates) - 1))
                     if map_generation.check_placement(villager, coordinate):
                         break
                 
@@ -236,53 +300,25 @@ class GameController:
 
         if MapType(self.settings.map_type) == MapType.RICH:
             # Wood need to occupe 5% of the map. It will be randomly placed
-            wood = Wood()
+            self.__scatter(map_generation, rng, Wood, int(self.settings.map_size.value ** 2 * 0.05))
 
-            for _ in range(int(self.settings.map_size.value ** 2 * 0.05)):
-                while True:
-                    coordinate = Coordinate(random.randint(0, self.settings.map_size.value - 1), random.randint(0, self.settings.map_size.value - 1))
-                    if map_generation.check_placement(wood, coordinate):
-                        break
-
-                map_generation.add(wood, coordinate)
-                wood.set_coordinate(coordinate)
-            
             # Gold need to occupe 0.5% of the map. It will be randomly placed
-            for _ in range(int(self.settings.map_size.value ** 2 * 0.005)):
-                gold = Gold()
-
-                while True:
-                    coordinate = Coordinate(random.randint(0, self.settings.map_size.value - 1), random.randint(0, self.settings.map_size.value - 1))
-                    if map_generation.check_placement(gold, coordinate):
-                        break
-
-                map_generation.add(gold, coordinate)
-                gold.set_coordinate(coordinate)
+            self.__scatter(map_generation, rng, Gold, int(self.settings.map_size.value ** 2 * 0.005))
             
         if MapType(self.settings.map_type) == MapType.GOLD_CENTER:
             # Gold need to occupe 0.5% of the map. It will be placed in a circle at the center of the map.
             # Draw a circle that occupies 0.5% of the map and place gold in it.
             center = Coordinate(self.settings.map_size.value // 2, self.settings.map_size.value // 2)
             radius = int(self.settings.map_size.value * 0.05)
+            circle = []
             for x in range(center.get_x() - radius, center.get_x() + radius + 1):
                 for y in range(center.get_y() - radius, center.get_y() + radius + 1):
                     if (x - center.get_x()) ** 2 + (y - center.get_y()) ** 2 <= radius ** 2:
-                        coordinate = Coordinate(x, y)
-                        gold = Gold()
-                        map_generation.add(gold, coordinate)
-                        gold.set_coordinate(coordinate)
+                        circle.append(Coordinate.of(x, y))
+            map_generation.add_resources(Gold, circle)
             
             # Wood need to occupe 5% of the map. It will be randomly placed
-            for _ in range(int(self.settings.map_size.value ** 2 * 0.05)):
-                wood = Wood()
-                
-                while True:
-                    coordinate = Coordinate(random.randint(0, self.settings.map_size.value - 1), random.randint(0, self.settings.map_size.value - 1))
-                    if map_generation.check_placement(wood, coordinate):
-                        break
-                
-                map_generation.add(wood, coordinate)
-                wood.set_coordinate(coordinate)
+            self.__scatter(map_generation, rng, Wood, int(self.settings.map_size.value ** 2 * 0.05))
         
         if MapType(self.settings.map_type) == MapType.TEST:
             # Generate a test map 10x10 with a town center at (0,0) and a villager at (5,5)
@@ -339,6 +375,11 @@ class GameController:
     def exit(self) -> None:
         """Exits the game."""
         self.__running = False
+        journal = self.__command_list.get_journal()
+        if journal is not None:
+            with self.__lock:
+                journal.close()
+        self.__network_server.stop()
         self.__ai_controller.exit()
         self.__menu_controller.exit()
 
@@ -351,7 +392,7 @@ class GameController:
         """
         Update the game state.
         """
-        for command in self.__command_list.copy():
+        for command in self.__command_list.pop_due():
             try:
                 #print(f"Command {command} is being executed")
                 command.run_command()
@@ -361,6 +402,7 @@ class GameController:
                 command.remove_command_from_list(self.__command_list)
                 command.get_entity().set_task(None)
                 #exit()
+        self.__command_list.advance()
 
     
     def load_task(self) -> None:
@@ -374,14 +416,32 @@ class GameController:
                pass
             player.get_task_manager().execute_tasks()
 
+    def step(self) -> None:
+        """
+        Run one tick of the game: the tasks of the players, then the commands due.
+        """
+        self.load_task()
+        self.update()
+        journal = self.__command_list.get_journal()
+        if journal is not None:
+            journal.end_tick(self)
+
+    def get_ai_controller(self) -> AIController:
+        """
+        Returns the AI controller.
+        :return: The AI controller.
+        :rtype: AIController
+        """
+        return self.__ai_controller
+
     def game_loop(self) -> None:
         """
         The main game loop.
         """
         self.start()
         while self.__running:
-            self.load_task()
-            self.update() 
+            with self.__lock:
+                self.step()
             # Cap the loop time to ensure it doesn't run faster than the desired FPS
             time.Clock().tick(self.settings.fps.value * self.get_speed())
     
@@ -398,7 +458,7 @@ class GameController:
             self.__ai_thread.start()
         self.__view_controller.start_view()
     
-    def load_game(self, map: Map, players: list[Player], command_list: list[Command]) -> None:
+    def load_game(self, map: Map, players: list[Player], command_list: CommandScheduler) -> None:
         """
         Load the game with the given map, players and settings.
 
@@ -0,0 +1,134 @@
+import time
+from controller.command_journal import CommandJournal
+from controller.game_controller import GameController
+from controller.view_controller import ViewController
+from model.player.player import Player
+from model.player.strategy import Strategy1
+from util.settings import Settings
+
+class HeadlessController:
+    """
+    Controller running a whole game without view, menu nor clock, as fast as the CPU allows.
+
+    It takes the place of the MenuController for the GameController. The ticks are run in a fixed order:
+    every ``fps * refresh rate`` ticks the AIs take their decisions, then the tasks and the due commands are run,
+    so that two games with the same settings and seed are the same.
+    """
+
+    def __init__(self, settings: Settings, seed: int = None) -> None:
+        """
+        Initializes the HeadlessController with the settings of the game.
+
+        :param settings: The settings of the game.
+        :type settings: Settings
+        :param seed: The seed of the game, None to keep the seed of the settings.
+        :type seed: int
+        """
+        self.settings: Settings = settings
+        self.__seed: int = seed
+        self.__game_controller: GameController = None
+
+    def get_game_controller(self) -> GameController:
+        """
+        Returns the game controller of the last game run.
+
+        :return: The game controller.
+        :rtype: GameController
+        """
+        return self.__game_controller
+
+    def pause(self, game_controller: GameController) -> None:
+        """
+        Does nothing, a headless game cannot be paused.
+
+        :param game_controller: The game controller.
+        :type game_controller: GameController
+        """
+        pass
+
+    def exit(self) -> None:
+        """
+        Does nothing, the game stops when run returns.
+        """
+        pass
+
+    def run(self, ticks: int, unit_differences: list[int] = None, sample_interval: int = None, record: str = None) -> dict:
+        """
+        Runs a new game until a player has lost or the number of ticks is reached.
+
+        :param ticks: The maximum number of ticks to run.
+        :type ticks: int
+        :param unit_differences: The unit difference of the strategy of each player, the default strategies if None.
+        :type unit_differences: list[int]
+        :param sample_interval: The number of ticks between two samples of the resources of the players, no sample if None.
+        :type sample_interval: int
+        :param record: The directory where the whole game is journaled, to be replayed, None not to record it.
+        :type record: str
+        :return: The number of ticks run, the time it took, the simulated ticks per second, the stats and the resource curves of the players.
+        :rtype: dict
+        """
+        if self.__seed is not None:
+            self.settings.seed = self.__seed
+        self.__game_controller = GameController(self, True)
+        ai_controller = self.__game_controller.get_ai_controller()
+        ai_interval = max(1, self.settings.fps.value * ai_controller.get_refresh_rate())
+        players = self.__game_controller.get_players()
+        if unit_differences is not None:
+            for player, unit_difference in zip(players, unit_differences):
+                player.get_ai().set_strategy(Strategy1(player.get_ai(), unit_difference))
+        curves = [[] for _ in players]
+        journal = None
+        if record is not None:
+            journal = CommandJournal(record, None)
+            journal.start(self.__game_controller)
+        begin = time.perf_counter()
+        tick = 0
+        while tick < ticks and not any(self.__has_lost(player) for player in players):
+            if sample_interval and tick % sample_interval == 0:
+                self.__sample(tick, players, curves)
+            if tick % ai_interval == 0:
+                ai_controller.step()
+            self.__game_controller.step()
+            tick += 1
+        elapsed = time.perf_counter() - begin
+        if journal is not None:
+            journal.close()
+        if sample_interval:
+            self.__sample(tick, players, curves)
+        return {
+            "ticks": tick,
+            "seconds": elapsed,
+            "ticks_per_second": tick / elapsed if elapsed > 0 else float('inf'),
+            "losers": [player.get_name() for player in players if self.__has_lost(player)],
+            "players": [ViewController.generate_player_stats(player) for player in players],
+            "curves": curves,
+        }
+
+    @staticmethod
+    def __sample(tick: int, players: list[Player], curves: list[list[dict]]) -> None:
+        """
+        Records the resources of each player at a tick.
+
+        :param tick: The current tick.
+        :type tick: int
+        :param players: The players.
+        :type players: list[Player]
+        :param curves: The samples of each player, where the new ones are appended.
+        :type curves: list[list[dict]]
+        """
+        for player, curve in zip(players, curves):
+            sample = {type(resource).__name__: amount for resource, amount in player.get_resources().items()}
+            sample["tick"] = tick
+            curve.append(sample)
+
+    @staticmethod
+    def __has_lost(player: Player) -> bool:
+        """
+        Checks if a player has lost, having neither unit nor building left.
+
+        :param player: The player.
+        :type player: Player
+        :return: True if the player has lost, False otherwise.
+        :rtype: bool
+        """
+        return not player.get_units() and not player.get_buildings()
@@ -105,6 +105,10 @@ class Interactions:
             villager.stock_resource(resource.get_food(),1)
             if not resource.get_food().is_alive():
                 self.remove_object(resource)
+                owner = resource.get_player()
+                if owner is not None: # an exhausted farm is no longer a building of its owner
+                    owner.remove_building(resource)
+                    resource.set_player(None)
         else:
             if not isinstance(resource,Resource):
                 raise ValueError("Target is not a resource.")
@@ -1,11 +1,13 @@
+from controller.command_journal import CommandJournal
 from controller.game_controller import GameController
+from util.save_file import SaveFile
 from util.settings import Settings
 from util.state_manager import GameState, MenuOptions
 from view.menus.load_view import LoadMenu
 from view.menus.menu_view import MenuView
 from view.menus.settings_view import SettingsMenu
 from datetime import datetime
-import pickle, os
+import os, threading
 
 class MenuController:
     """Controller for all the menus in the game."""
@@ -98,43 +100,65 @@ class MenuController:
         self.__game_controller.resume()
     
     def save_game(self) -> None:
-        """Save the current game state"""
-        if self.__game_controller:
-            game_state = {
-                'settings': self.settings,
-                'map': self.__game_controller.get_map(),
-                'players': self.__game_controller.get_players(),
-                'command_list': self.__game_controller.get_commandlist()
-            }
+        """
+        Save the current game state. The game is captured between two ticks, then the save is compressed
+        and written on another thread, so that the menu and the game do not wait for it.
+        """
         try: 
+            save = self.__game_controller.capture_save()
+
             # Ensure the save directory exists
             save_dir = "save"
             os.makedirs(save_dir, exist_ok=True)
 
             # Generate a timestamped filename
             timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-            filename = os.path.join(save_dir, f"{timestamp}.pkl")
+            filename = os.path.join(save_dir, f"{timestamp}{SaveFile.EXTENSION}")
 
-            with open(filename, 'wb') as file:
-                pickle.dump(game_state, file)
-            print(f"Game successfully saved to {filename}.")
+            # Not a daemon: exiting the game waits for the save to be written
+            threading.Thread(target=self.__write_save, args=(save, filename), name="Save").start()
             self.call_menu()
         except Exception as e:
             print(f"Error saving game: {e}")
 
+    def __write_save(self, save: SaveFile, filename: str) -> None:
+        """
+        Write a captured game to a file.
+
+        :param save: The captured game.
+        :type save: SaveFile
+        :param filename: The path of the file.
+        :type filename: str
+        """
+        try:
+            save.write(filename)
+            print(f"Game successfully saved to {filename}.")
+        except Exception as e:
+            print(f"Error saving game: {e}")
+
     def load_game(self, filename: str) -> None:
-        """Load a saved game state"""
+        """
+        Load a saved game state, from a save file, from an autosave restored to its last tick, which then goes on,
+        or from a game pickled by the previous versions.
+        """
         try:
             save_dir = "save"
-            filepath = os.path.join(save_dir, filename + ".pkl")
-            with open(filepath, 'rb') as file:
-                game_state = pickle.load(file)
+            filepath = os.path.join(save_dir, filename + SaveFile.EXTENSION)
+            journal = os.path.join(save_dir, filename)
+            if os.path.isdir(journal):
+                game_state = SaveFile.read(CommandJournal.find_base(journal))
+            elif os.path.exists(filepath):
+                game_state = SaveFile.read(filepath)
+            else:
+                game_state = SaveFile.read_pickle(os.path.join(save_dir, filename + ".pkl"))
 
             self.settings = game_state['settings']
             self.__game_controller = GameController(self, True)
             self.__game_controller.load_game(game_state['map'], game_state['players'], game_state['command_list'])
+            if os.path.isdir(journal):
+                CommandJournal.replay(journal, self.__game_controller)
             self.state = GameState.PLAYING
-            self.__game_controller.start_all_threads()
+            self.__game_controller.start_all_threads(journal if os.path.isdir(journal) else None)
             print("Game successfully loaded.")
         except FileNotFoundError:
             print(f"Save file not found.")
@@ -0,0 +1,200 @@
+import asyncio
+import re
+import threading
+from controller.command import Process
+from model.units.unit import Unit
+from util.coordinate import Coordinate
+import typing
+if typing.TYPE_CHECKING:
+    from controller.game_controller import GameController
+
+"""
+This file contains the NetworkServer class which receives the commands of external players over TCP.
+"""
+
+class NetworkServer:
+    """
+    Server of the commands sent to a game over TCP, by scripted bots or other programs.
+
+    The connections are kept open and carry lines, each one a command, answered in order by a line:
+    ``ok`` once the command is scheduled, ``error <reason>`` otherwise. The only command is ``mov <id> (<x>,<y>)``,
+    which moves the unit with that entity id. A unit may still be named by the name of its type, as in the first protocol,
+    the first unit with that name being moved then.
+
+    The server runs an asyncio loop on a thread of its own. The lines received on every connection are gathered in batches,
+    and the batches waiting are issued together between two ticks, holding the lock of the game once for all of them.
+    A connection only reads its next lines once its last batch is answered and the answers are sent, and at most MAX_BATCHES
+    batches wait for the game: a client sending faster than the game takes its commands is slowed down by TCP.
+    """
+    HOST = '0.0.0.0'
+    PORT = 12345
+    READ_SIZE = 65536
+    MAX_LINE = 1024
+    MAX_BATCHES = 64
+    COMMAND = re.compile(rb"mov (\w+) \((\d+),(\d+)\)")
+
+    def __init__(self, game_controller: 'GameController', host: str = HOST, port: int = PORT) -> None:
+        """
+        Create a server issuing the commands it receives to a game.
+
+        :param game_controller: The game controller.
+        :type game_controller: GameController
+        :param host: The address the server listens on.
+        :type host: str
+        :param port: The port the server listens on, 0 for any free port.
+        :type port: int
+        """
+        self.__game_controller: 'GameController' = game_controller
+        self.__host: str = host
+        self.__port: int = port
+        self.__thread: threading.Thread = None
+        self.__loop: asyncio.AbstractEventLoop = None
+        self.__stopping: asyncio.Event = None
+        self.__batches: asyncio.Queue = None
+        self.__ready: threading.Event = threading.Event()
+        self.__error: OSError = None
+
+    def get_port(self) -> int:
+        """
+        Get the port the server listens on, once it is started.
+
+        :return: The port.
+        :rtype: int
+        """
+        return self.__port
+
+    def start(self) -> None:
+        """
+        Start listening on another thread, and wait until the server listens.
+
+        :raises OSError: If the server cannot listen on its address, the port being used by another game for instance.
+        """
+        self.__ready.clear()
+        self.__error = None
+        self.__thread = threading.Thread(target=asyncio.run, args=(self.__serve(),), daemon=True, name="Network")
+        self.__thread.start()
+        self.__ready.wait()
+        if self.__error is not None:
+            raise self.__error
+        print(f"Serveur en écoute sur {self.__host}:{self.__port}")
+
+    def stop(self) -> None:
+        """
+        Stop listening and close the connections, then wait for the thread of the server.
+        """
+        if self.__thread is None or not self.__thread.is_alive():
+            return
+        self.__loop.call_soon_threadsafe(self.__stopping.set)
+        if threading.current_thread() is not self.__thread:
+            self.__thread.join()
+
+    def execute_batch(self, lines: list[bytes]) -> list[bytes]:
+        """
+        Issue the commands of a batch of lines, between two ticks of the game.
+
+        :param lines: The lines, without their line breaks.
+        :type lines: list[bytes]
+        :return: The answer to each line, with its line break.
+        :rtype: list[bytes]
+        """
+        with self.__game_controller.get_lock():
+            return [self.__execute(line) for line in lines]
+
+    def __execute(self, line: bytes) -> bytes:
+        """
+        Issue the command of a line.
+
+        :param line: The line.
+        :type line: bytes
+        :return: The answer, with its line break.
+        :rtype: bytes
+        """
+        match = NetworkServer.COMMAND.fullmatch(line.strip())
+        if match is None:
+            return b"error invalid command\n"
+        unit_id, x, y = match.groups()
+        map = self.__game_controller.get_map()
+        if unit_id.isdigit():
+            unit = map.get_object(int(unit_id))
+        else:
+            name = unit_id.decode('utf-8')
+            unit = next((unit for player in self.__game_controller.get_players() for unit in player.get_units() if unit.get_name() == name), None)
+        if not isinstance(unit, Unit) or unit.get_player() is None:
+            return b"error unknown unit\n"
+        target_coord = Coordinate(int(x), int(y))
+        if not (0 <= target_coord.get_x() < map.get_size() and 0 <= target_coord.get_y() < map.get_size()):
+            return b"error target out of the map\n"
+        try:
+            unit.get_player().get_command_manager().command(unit, Process.MOVE, target_coord)
+        except ValueError as e:
+            return f"error {e}\n".encode('utf-8')
+        return b"ok\n"
+
+    async def __serve(self) -> None:
+        """
+        Listen and answer the connections until the server is stopped.
+        """
+        self.__loop = asyncio.get_running_loop()
+        self.__stopping = asyncio.Event()
+        try:
+            server = await asyncio.start_server(self.__handle, self.__host, self.__port)
+        except OSError as e:
+            self.__error = e
+            self.__ready.set()
+            return
+        self.__port = server.sockets[0].getsockname()[1]
+        self.__batches = asyncio.Queue(NetworkServer.MAX_BATCHES)
+        executor = asyncio.ensure_future(self.__execute_batches(self.__batches))
+        self.__ready.set()
+        await self.__stopping.wait()
+        # The connections left open are cancelled when the loop ends
+        server.close()
+        executor.cancel()
+
+    async def __handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Answer the lines of a connection until it is closed.
+
+        :param reader: The stream the lines are read from.
+        :type reader: asyncio.StreamReader
+        :param writer: The stream the answers are written to.
+        :type writer: asyncio.StreamWriter
+        """
+        buffer = b""
+        try:
+            while True:
+                data = await reader.read(NetworkServer.READ_SIZE)
+                if not data:
+                    break
+                lines = (buffer + data).split(b"\n")
+                buffer = lines.pop()
+                if len(buffer) > NetworkServer.MAX_LINE:
+                    writer.write(b"error line too long\n")
+                    break
+                lines = [line for line in lines if line.strip()]
+                if lines:
+                    answered = self.__loop.create_future()
+                    await self.__batches.put((lines, answered))
+                    writer.write(b"".join(await answered))
+                    await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def __execute_batches(self, batches: asyncio.Queue) -> None:
+        """
+        Issue the batches of every connection as they come, those waiting together, on a thread which can wait for the game.
+
+        :param batches: The batches, with the future of their answers.
+        :type batches: asyncio.Queue
+        """
+        while True:
+            waiting = [await batches.get()]
+            while not batches.empty():
+                waiting.append(batches.get_nowait())
+            answers = await self.__loop.run_in_executor(None, self.execute_batch, [line for lines, _ in waiting for line in lines])
+            for lines, answered in waiting:
+                if not answered.done():
+                    answered.set_result(answers[:len(lines)])
+                answers = answers[len(lines):]
@@ -0,0 +1,140 @@
+import time
+from controller.command_journal import CommandJournal
+from controller.game_controller import GameController
+from controller.view_controller import ViewController
+from util.save_file import SaveFile
+from util.settings import Settings
+
+class ReplayController:
+    """
+    Controller replaying a journaled game without clock, as fast as the CPU allows, to look at any of its ticks.
+
+    It takes the place of the MenuController for the GameController, like the HeadlessController.
+    The game is simulated again from the base saves of the journal and its logged commands. Every KEYFRAME_INTERVAL ticks
+    reached, the game is captured in memory: seeking a tick starts from the nearest keyframe or base save before it,
+    or goes on from the current tick if it is closer, so that going back and forth in a replay only simulates a few ticks.
+    """
+    KEYFRAME_INTERVAL = 600
+
+    def __init__(self, directory: str) -> None:
+        """
+        Initializes the ReplayController with a journaled game.
+
+        :param directory: The directory of the journal of the game.
+        :type directory: str
+        :raises ValueError: If the journal has no base save.
+        """
+        self.__directory: str = directory
+        self.__range: tuple[int, int] = CommandJournal.get_range(directory)
+        if self.__range is None:
+            raise ValueError(f"{directory} has no game to replay.")
+        self.__keyframes: dict[int, SaveFile] = {}
+        self.__game_controller: GameController = None
+        self.settings: Settings = None
+
+    def get_game_controller(self) -> GameController:
+        """
+        Returns the game controller of the replayed game.
+
+        :return: The game controller, None before the first seek.
+        :rtype: GameController
+        """
+        return self.__game_controller
+
+    def get_range(self) -> tuple[int, int]:
+        """
+        Returns the ticks which can be replayed.
+
+        :return: The first and the last tick.
+        :rtype: tuple[int, int]
+        """
+        return self.__range
+
+    def get_tick(self) -> int:
+        """
+        Returns the current tick of the replay.
+
+        :return: The tick, None before the first seek.
+        :rtype: int
+        """
+        return self.__game_controller.get_commandlist().get_now() if self.__game_controller is not None else None
+
+    def pause(self, game_controller: GameController) -> None:
+        """
+        Does nothing, the replay only moves when it is asked to seek.
+
+        :param game_controller: The game controller.
+        :type game_controller: GameController
+        """
+        pass
+
+    def exit(self) -> None:
+        """
+        Does nothing, the replay stops when its view is closed.
+        """
+        pass
+
+    def seek(self, tick: int = None) -> dict:
+        """
+        Brings the replay to a tick.
+
+        :param tick: The tick, the last one if None. It is brought into the range of the replay.
+        :type tick: int
+        :return: The tick reached, the number of ticks simulated, the time it took and the simulated ticks per second.
+        :rtype: dict
+        """
+        first, last = self.__range
+        target = last if tick is None else max(first, min(tick, last))
+        begin = time.perf_counter()
+        keyframe = max([frame for frame in self.__keyframes if frame <= target], default=None)
+        base = CommandJournal.find_base(self.__directory, target)
+        base_tick = SaveFile.read_header(base)["tick"]
+        current = self.get_tick()
+        if current is None or current > target or max(keyframe or first, base_tick) > current:
+            if keyframe is not None and keyframe >= base_tick:
+                self.__load(self.__keyframes[keyframe])
+            else:
+                self.__load(SaveFile.read(base))
+        start = self.get_tick()
+        while self.get_tick() < target:
+            now = self.get_tick()
+            CommandJournal.replay(self.__directory, self.__game_controller, min(target, (now // ReplayController.KEYFRAME_INTERVAL + 1) * ReplayController.KEYFRAME_INTERVAL))
+            if self.get_tick() == now:
+                break
+            if self.get_tick() % ReplayController.KEYFRAME_INTERVAL == 0:
+                self.__keyframes.setdefault(self.get_tick(), self.__game_controller.capture_save())
+        elapsed = time.perf_counter() - begin
+        ticks = self.get_tick() - start
+        return {
+            "tick": self.get_tick(),
+            "ticks": ticks,
+            "seconds": elapsed,
+            "ticks_per_second": ticks / elapsed if elapsed > 0 else float('inf'),
+        }
+
+    def render(self, view_2_5d: bool = False) -> None:
+        """
+        Shows the current tick of the replay, until the view is paused.
+
+        :param view_2_5d: True to show the 2.5D view, False for the terminal view.
+        :type view_2_5d: bool
+        """
+        if self.__game_controller is None:
+            self.seek(self.__range[0])
+        view_controller = ViewController(self.__game_controller)
+        if view_2_5d:
+            view_controller.switch_view()
+        else:
+            view_controller.start_view()
+
+    def __load(self, save) -> None:
+        """
+        Loads the game of a keyframe or a base save.
+
+        :param save: The keyframe, or the game read from a base save.
+        :type save: SaveFile or dict
+        """
+        game = save.load() if isinstance(save, SaveFile) else save
+        self.settings = game['settings']
+        self.__game_controller = GameController(self, True)
+        self.__game_controller.load_game(game['map'], game['players'], game['command_list'])
@@ -0,0 +1,124 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from controller.game_controller import GameController
+from controller.headless_controller import HeadlessController
+from util.settings import Settings
+
+class TournamentRunner:
+    """
+    Plays many seeded AI versus AI games with the same settings, one headless game per process,
+    and sums up their results: win rates, game lengths and resource curves.
+    """
+
+    def __init__(self, settings: Settings, ticks: int, unit_differences: list[int] = None, sample_interval: int = None, workers: int = None, map_cache: str = None) -> None:
+        """
+        Initializes the TournamentRunner with the settings of its games.
+
+        :param settings: The settings of every game.
+        :type settings: Settings
+        :param ticks: The maximum number of ticks of a game.
+        :type ticks: int
+        :param unit_differences: The unit difference of the strategy of each player, the default strategies if None.
+        :type unit_differences: list[int]
+        :param sample_interval: The number of ticks between two samples of the resources of the players, no curve if None.
+        :type sample_interval: int
+        :param workers: The number of processes, one per core if None. With 1, the games are played in the current process.
+        :type workers: int
+        :param map_cache: The directory where the generated maps are cached, shared by the processes, None to cache them in memory only.
+        :type map_cache: str
+        """
+        self.__settings: Settings = settings
+        self.__ticks: int = ticks
+        self.__unit_differences: list[int] = unit_differences
+        self.__sample_interval: int = sample_interval
+        self.__workers: int = workers or os.cpu_count() or 1
+        self.__map_cache: str = map_cache
+
+    @staticmethod
+    def play(match: tuple) -> dict:
+        """
+        Plays one game. It runs in a worker process, so it only takes and returns picklable values.
+
+        :param match: The settings, seed, maximum number of ticks, unit differences, sample interval and map cache directory of the game.
+        :type match: tuple
+        :return: The seed, length, winner and resource curves of the game.
+        :rtype: dict
+        """
+        settings, seed, ticks, unit_differences, sample_interval, map_cache = match
+        if map_cache is not None:
+            GameController.MAP_CACHE.set_directory(map_cache)
+        result = HeadlessController(settings, seed).run(ticks, unit_differences, sample_interval)
+        names = [player["name"] for player in result["players"]]
+        winners = [name for name in names if name not in result["losers"]]
+        return {
+            "seed": seed,
+            "ticks": result["ticks"],
+            "seconds": result["seconds"],
+            "winner": winners[0] if len(winners) == 1 else None,
+            "players": names,
+            "resources": [player["resources"] for player in result["players"]],
+            "curves": result["curves"],
+        }
+
+    def run(self, seeds: list[int]) -> dict:
+        """
+        Plays a game for each seed and sums up the results.
+
+        :param seeds: The seeds of the games.
+        :type seeds: list[int]
+        :return: The number of games, the wins and win rate of each player, the draws, the mean game length,
+            the mean resource curves of each player and the result of every game.
+        :rtype: dict
+        """
+        matches = [(self.__settings, seed, self.__ticks, self.__unit_differences, self.__sample_interval, self.__map_cache) for seed in seeds]
+        if self.__workers == 1 or len(matches) <= 1:
+            games = [TournamentRunner.play(match) for match in matches]
+        else:
+            with ProcessPoolExecutor(max_workers=min(self.__workers, len(matches))) as executor:
+                games = list(executor.map(TournamentRunner.play, matches))
+        return TournamentRunner.summarize(games)
+
+    @staticmethod
+    def summarize(games: list[dict]) -> dict:
+        """
+        Sums up the results of games played by the same players.
+
+        :param games: The results of the games, as returned by play.
+        :type games: list[dict]
+        :return: The summary of the games.
+        :rtype: dict
+        """
+        names = games[0]["players"] if games else []
+        wins = {name: sum(game["winner"] == name for game in games) for name in names}
+        return {
+            "games": len(games),
+            "wins": wins,
+            "win_rates": {name: count / len(games) for name, count in wins.items()},
+            "draws": sum(game["winner"] is None for game in games),
+            "mean_ticks": sum(game["ticks"] for game in games) / len(games) if games else 0,
+            "mean_curves": [TournamentRunner.__mean_curve([game["curves"][index] for game in games]) for index in range(len(names))],
+            "results": games,
+        }
+
+    @staticmethod
+    def __mean_curve(curves: list[list[dict]]) -> list[dict]:
+        """
+        Averages the resource curves of a player over several games, sample by sample.
+        A game which ended early counts with its last sample.
+
+        :param curves: The curve of the player in each game.
+        :type curves: list[list[dict]]
+        :return: The mean curve.
+        :rtype: list[dict]
+        """
+        curves = [curve for curve in curves if curve]
+        if not curves:
+            return []
+        longest = max(curves, key=len)
+        mean = []
+        for index, reference in enumerate(longest):
+            samples = [curve[min(index, len(curve) - 1)] for curve in curves]
+            point = {key: sum(sample[key] for sample in samples) / len(samples) for key in reference if key != "tick"}
+            point["tick"] = reference["tick"]
+            mean.append(point)
+        return mean
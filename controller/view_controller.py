@@ -4,6 +4,7 @@ from util.settings import Settings
 from view.base_view import BaseView
 from view.view_2_5D import View2_5D
 from view.terminal_view import TerminalView
+from view.tile_manager import TileManager
 from model.units.villager import Villager
 import os, json, typing, webbrowser
 if typing.TYPE_CHECKING:
@@ -18,6 +19,8 @@ class ViewController:
         self.__current_view: BaseView = TerminalView(self)
         self.__pause: bool = False
         self.__speed = 1  # Initialize speed
+        # The textures of the 2.5D view are loaded in the background while the game runs in the terminal
+        TileManager.preload()
     
     def toggle_speed(self) -> None:
         """Toggle the speed between 1 and 60."""
@@ -60,7 +63,8 @@ class ViewController:
             self.__current_view = TerminalView(self)
         self.start_view()
 
-    def generate_player_stats(self, player) -> dict:
+    @staticmethod
+    def generate_player_stats(player) -> dict:
         """
         Generate a dictionary containing stats for a single player.
 
@@ -0,0 +1,45 @@
+import argparse
+import json
+import os
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+from controller.game_controller import GameController
+from controller.headless_controller import HeadlessController
+from util.settings import Settings
+from util.state_manager import FPS, MapSize, MapType, StartingCondition
+
+"""
+Run an AI versus AI game without view nor clock, as fast as possible, and print the stats of the players.
+
+Example: python headless.py --ticks 36000 --map-size MEDIUM --seed 42 --output stats.json --record replays/42
+"""
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a headless AI versus AI game.")
+    parser.add_argument("--ticks", type=int, default=36000, help="Maximum number of ticks to simulate.")
+    parser.add_argument("--map-size", choices=[size.name for size in MapSize], default=MapSize.SMALL.name, help="Size of the map.")
+    parser.add_argument("--map-type", choices=[map_type.name for map_type in MapType], default=MapType.RICH.name, help="Type of the map.")
+    parser.add_argument("--starting-condition", choices=[condition.name for condition in StartingCondition], default=StartingCondition.LEAN.name, help="Starting resources of the players.")
+    parser.add_argument("--fps", choices=[fps.name for fps in FPS], default=FPS.FPS_60.name, help="Ticks per second of game time.")
+    parser.add_argument("--seed", type=int, default=None, help="Seed of the random generator, for a reproducible game.")
+    parser.add_argument("--map-cache", type=str, default=None, help="Directory where the seeded maps are cached, to reuse them in the next runs.")
+    parser.add_argument("--record", type=str, default=None, help="Directory where the game is journaled, to replay it with replay.py.")
+    parser.add_argument("--output", type=str, default=None, help="File where the stats of the players are written as JSON.")
+    arguments = parser.parse_args()
+
+    settings = Settings()
+    settings.map_size = MapSize[arguments.map_size]
+    settings.map_type = MapType[arguments.map_type]
+    settings.starting_condition = StartingCondition[arguments.starting_condition]
+    settings.fps = FPS[arguments.fps]
+
+    if arguments.map_cache:
+        GameController.MAP_CACHE.set_directory(arguments.map_cache)
+    result = HeadlessController(settings, arguments.seed).run(arguments.ticks, record=arguments.record)
+    print(f"{result['ticks']} ticks in {result['seconds']:.2f} s: {result['ticks_per_second']:.0f} ticks/s")
+    for player in result["players"]:
+        print(f"  {player['name']}: {len(player['units'])} units, {len(player['buildings'])} buildings, resources {player['resources']}")
+    if result["losers"]:
+        print(f"  Lost: {', '.join(result['losers'])}")
+    if arguments.output:
+        with open(arguments.output, "w") as file:
+            json.dump(result, file, indent=4)
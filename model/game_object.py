@@ -24,8 +24,36 @@ class GameObject:
         self.__alive: bool = True
         self.__size: int = 1
         self.__sprite_path: str = None
+        self.__id: int = None
+
+    def __setstate__(self, state: dict) -> None:
+        """
+        Restore a pickled object, the objects pickled before the ids were added having none.
+
+        :param state: The attributes of the object.
+        :type state: dict
+        """
+        self.__id = None
+        self.__dict__.update(state)
+
+    def get_id(self) -> int:
+        """
+        Returns the identifier of the object on the map, or None if it was never placed on a map.
+
+        :return: The identifier of the object.
+        :rtype: int
+        """
+        return self.__id
     
-    
+    def set_id(self, object_id: int) -> None:
+        """
+        Sets the identifier of the object on the map.
+
+        :param object_id: The new identifier of the object.
+        :type object_id: int
+        """
+        self.__id = object_id
+
     def get_name(self) -> str:
         """
         Returns the name of the object.
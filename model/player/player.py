@@ -6,7 +6,7 @@ from model.resources.resource import Resource
 from model.units.unit import Unit
 from model.buildings.building import Building
 from util.coordinate import Coordinate
-from typing import Set, TYPE_CHECKING
+from typing import AbstractSet, TYPE_CHECKING
 if TYPE_CHECKING:
     from controller.command import CommandManager, TaskManager
     from controller.AI_controller import AI
@@ -26,15 +26,28 @@ class Player:
         self.__name: str = name
         self.__color: str = color
         self.__resource: dict[Resource, int] = {Food(): 0, Gold(): 0, Wood(): 0}
-        self.__units: Set[Unit] = set()
+        # Ordered like sets, so that the players iterate over their entities in the same order in every run
+        self.__units: dict[Unit, None] = {}
         self.__unit_count: int = 0
-        self.__buildings: Set[Building] = set()
+        self.__buildings: dict[Building, None] = {}
         self.__max_population: int = 0
         self.__command_manager: 'CommandManager' = None
         self.__task_manager: 'TaskManager' = None
         self.__ai: 'AI' = None
         self.__centre_coordinate: Coordinate = None
 
+    def __setstate__(self, state: dict) -> None:
+        """
+        Restore a pickled player, the players pickled before keeping their units and buildings in sets.
+
+        :param state: The attributes of the player.
+        :type state: dict
+        """
+        self.__dict__.update(state)
+        if isinstance(self.__units, set):
+            self.__units = dict.fromkeys(self.__units)
+            self.__buildings = dict.fromkeys(self.__buildings)
+
     def __repr__(self):
         return f"{self.get_name()} : {self.get_color()}"
     def get_centre_coordinate(self) -> Coordinate:
@@ -143,14 +156,14 @@ class Player:
             raise ValueError("Not enough resources to consume")
         self.__resource[resource] -= amount
     
-    def get_units(self) -> Set[Unit]:
+    def get_units(self) -> AbstractSet[Unit]:
         """
-        Returns the units of the player.
+        Returns the units of the player, in the order they were added.
 
         :return: A set of units.
-        :rtype: Set[Unit]
+        :rtype: AbstractSet[Unit]
         """
-        return self.__units
+        return self.__units.keys()
     
     def get_unit_count(self) -> int:
         """
@@ -171,7 +184,7 @@ class Player:
         """
         if not self.__unit_count < self.__max_population:
             raise ValueError("Player has reached the maximum population")
-        self.__units.add(unit)
+        self.__units[unit] = None
         self.__unit_count += 1
 
     def remove_unit(self, unit: Unit) -> None:
@@ -181,17 +194,17 @@ class Player:
         :param unit: The unit to remove.
         :type unit: Unit
         """
-        self.__units.remove(unit)
+        del self.__units[unit]
         self.__unit_count -= 1
 
-    def get_buildings(self) -> Set[Building]:
+    def get_buildings(self) -> AbstractSet[Building]:
         """
-        Returns the buildings of the player.
+        Returns the buildings of the player, in the order they were added.
 
         :return: A set of buildings.
-        :rtype: Set[Building]
+        :rtype: AbstractSet[Building]
         """
-        return self.__buildings
+        return self.__buildings.keys()
 
     def add_building(self, building: Building) -> None:
         """
@@ -200,7 +213,7 @@ class Player:
         :param building: The building to add.
         :type building: Building
         """
-        self.__buildings.add(building)
+        self.__buildings[building] = None
 
     def remove_building(self, building: Building) -> None:
         """
@@ -209,7 +222,7 @@ class Player:
         :param building: The building to remove.
         :type building: Building
         """
-        self.__buildings.remove(building)
+        del self.__buildings[building]
     
     def get_max_population(self) -> int:
         """
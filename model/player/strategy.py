@@ -89,8 +89,8 @@ class Strategy1(Strategy):
     def defend(self):
         villagers = [u for u in self.get_ai().get_player().get_units() if isinstance(u, Villager) and u.get_task() is None]
         center_coordinate = self.get_ai().get_player().get_centre_coordinate()
-        build_points = self.get_ai().get_map_known().find_nearest_empty_zones(center_coordinate, TownCenter().get_size())
-        collect_points = self.get_ai().get_map_known().find_nearest_objects(center_coordinate, Resource) 
+        build_points = self.get_ai().get_map_known().find_nearest_empty_zones(center_coordinate, TownCenter().get_size(), len(villagers) // 3 + 2)
+        collect_points = self.get_ai().get_map_known().find_nearest_objects(center_coordinate, Resource, len(villagers) // 3 + 1)
         for i, villager in enumerate(villagers):
             match self.__villager_task_count% 3:
                 case 0:
@@ -114,8 +114,8 @@ class Strategy1(Strategy):
     def attack(self):
         villagers = [u for u in self.get_ai().get_player().get_units() if isinstance(u, Villager) and u.get_task() is None]
         center_coordinate = self.get_ai().get_player().get_centre_coordinate()
-        build_points = self.get_ai().get_map_known().find_nearest_empty_zones(center_coordinate, TownCenter().get_size())
-        collect_points = self.get_ai().get_map_known().find_nearest_objects(center_coordinate, Resource) 
+        build_points = self.get_ai().get_map_known().find_nearest_empty_zones(center_coordinate, TownCenter().get_size(), len(villagers) // 3 + 2)
+        collect_points = self.get_ai().get_map_known().find_nearest_objects(center_coordinate, Resource, len(villagers) // 3 + 1)
         for i, villager in enumerate(villagers):
             match self.__villager_task_count% 2:
                 case 0:
@@ -137,7 +137,7 @@ class Strategy1(Strategy):
 
     def collect(self, villager: Villager, collect_point: Coordinate):
         u = villager
-        drop_point = next(( drop_coord for drop_coord in self.get_ai().get_map_known().find_nearest_objects(u.get_coordinate(), Building) if self.get_ai().get_map_known().get(drop_coord).is_resources_drop_point() and self.get_ai().get_map_known().get(drop_coord).get_player() == self.get_ai().get_player() ), None)
+        drop_point = next(( drop_coord for drop_coord in self.get_ai().get_map_known().iter_nearest_objects(u.get_coordinate(), Building, self.get_ai().get_player()) if self.get_ai().get_map_known().get(drop_coord).is_resources_drop_point() ), None)
         #print(f"Villager {u} is collecting {self.get_ai().get_map_known().get(collect_point)} and dropping at {self.get_ai().get_map_known().get(drop_point)}")
         if drop_point and collect_point: 
             u.set_task(CollectAndDropTask(self.get_ai().get_player().get_command_manager(), u, collect_point, drop_point))
@@ -151,22 +151,23 @@ class Strategy1(Strategy):
                 task = SpawnTask(self.get_ai().get_player().get_command_manager(), building)
                 building.set_task(task)
     
-    def kill(self,unit: Unit, target_coord: Coordinate):
-        task = KillTask(self.get_ai().get_player().get_command_manager(), unit, target_coord)
+    def kill(self,unit: Unit, target_coord: Coordinate, flow: bool = False):
+        task = KillTask(self.get_ai().get_player().get_command_manager(), unit, target_coord, flow)
         unit.set_task(task)
 
     def dispatchAttackers(self, object_type: type)->None:
         units = [u for u in self.get_ai().get_player().get_units() if isinstance(u, object_type) and u.get_task() is None]
-        targets = self.get_ai().get_map_known().find_nearest_enemies(self.get_ai().get_player().get_centre_coordinate(), self.__target_player)
+        targets = self.get_ai().get_map_known().find_nearest_enemies(self.get_ai().get_player().get_centre_coordinate(), self.__target_player, len(units))
+        flow = len(units) > 1 # a group shares the flow fields of the regions of its targets
         for i, unit in enumerate(units):
             if i < len(targets):
-                self.kill(unit, targets[i])
+                self.kill(unit, targets[i], flow)
             else:
-                self.kill(unit, targets[0])
+                self.kill(unit, targets[0], flow)
     
     def spawnAll(self, object_type: type):
         buildings = [b for b in self.get_ai().get_player().get_buildings() if isinstance(b, object_type) and b.get_task() is None]
-        unit = UnitSpawner()[object_type().get_name()]
+        unit = UnitSpawner()[object_type]
         for building in buildings:
                 if all(self.get_ai().get_player().get_resources().get(key, 0) >= cost for key, cost in unit.get_cost().items()) and self.get_ai().get_player().get_unit_count() < self.get_ai().get_player().get_max_population():
                     self.spawn(building)
\ No newline at end of file
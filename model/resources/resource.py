@@ -1,7 +1,15 @@
 from model.game_object import GameObject
+import typing
+if typing.TYPE_CHECKING:
+    from util.resource_field import ResourceField
 
 class Resource(GameObject):
-    """This class represents the resources on the map"""
+    """
+    This class represents the resources on the map.
+
+    A resource generated with the map lives in the resource field of the map, which only keeps its amount:
+    the Resource read on such a tile is bound to the field, and reads and collects its amount there.
+    """
     
     def __init__(self, name: str, letter: str, amount: int, spawnable: bool):
         """
@@ -19,8 +27,21 @@ class Resource(GameObject):
         super().__init__(name, letter, 1)
         self.__amount: int = amount
         self.__spawnable: bool = spawnable
-        super().set_sprite_path(f"assets/sprites/resources/{self.get_name().lower()}.png")
-    
+        self.__field: 'ResourceField' = None
+        self.__index: int = None
+        super().set_sprite_path(f"assets/sprites/resources/{name.lower()}.png")
+
+    def __setstate__(self, state: dict) -> None:
+        """
+        Restore a pickled resource, the resources pickled before the resource field keeping their own amount.
+
+        :param state: The attributes of the resource.
+        :type state: dict
+        """
+        self.__field = None
+        self.__index = None
+        super().__setstate__(state)
+
     def get_amount(self) -> int:
         """
         Returns the amount of the resource.
@@ -28,7 +49,21 @@ class Resource(GameObject):
         :return: The amount of the resource.
         :rtype: int
         """
+        if self.__field is not None:
+            return self.__field.get_amount(self.__index)
         return self.__amount
+
+    def bind(self, field: 'ResourceField', index: int) -> None:
+        """
+        Binds the resource to a tile of a resource field, which keeps its amount from now on.
+
+        :param field: The resource field.
+        :type field: ResourceField
+        :param index: The index of the tile in the field.
+        :type index: int
+        """
+        self.__field = field
+        self.__index = index
     
     def is_spawnable(self) -> bool:
         """
@@ -48,20 +83,24 @@ class Resource(GameObject):
         :return: The amount collected.
         :rtype: int
         """
-        if amount > self.__amount:
-            amount = self.__amount
+        available = self.get_amount()
+        if amount > available:
+            amount = available
             super().damage(1)
-        self.__amount -= amount
+        if self.__field is not None:
+            self.__field.set_amount(self.__index, available - amount)
+        else:
+            self.__amount -= amount
         return amount
     
     def __hash__(self):
         """
-        Allows for the resource to be hashed.
+        Allows for the resource to be hashed, all the resources of a type sharing the same hash.
 
-        :return: The hash of the resource name.
+        :return: The hash of the resource type.
         :rtype: int
         """
-        return hash(super().get_name())
+        return hash(type(self).__name__)
     
     def __eq__(self, other: object) -> bool:
         """
@@ -74,7 +113,7 @@ class Resource(GameObject):
         """
         if not isinstance(other, Resource):
             return False
-        return super().get_name() == other.get_name()
+        return type(self) == type(other)
     
     def __repr__(self) -> str:
         """
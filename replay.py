@@ -0,0 +1,26 @@
+import argparse
+import os
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+from controller.replay_controller import ReplayController
+
+"""
+Replay a journaled game without clock, as fast as possible, up to a tick, then show that tick in a view.
+The games are journaled by headless.py --record, and the autosaves of the menu are journals too.
+
+Example: python replay.py replays/42 --seek 12000 --view 2.5d
+"""
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay a journaled game up to a tick.")
+    parser.add_argument("journal", type=str, help="Directory of the journal of the game.")
+    parser.add_argument("--seek", type=int, default=None, help="Tick to replay the game to, the last one by default.")
+    parser.add_argument("--view", choices=["none", "terminal", "2.5d"], default="none", help="View showing the tick reached.")
+    arguments = parser.parse_args()
+
+    replay = ReplayController(arguments.journal)
+    first, last = replay.get_range()
+    print(f"Ticks {first} to {last} can be replayed")
+    result = replay.seek(arguments.seek)
+    print(f"Tick {result['tick']} reached, {result['ticks']} ticks in {result['seconds']:.2f} s: {result['ticks_per_second']:.0f} ticks/s")
+    if arguments.view != "none":
+        replay.render(arguments.view == "2.5d")
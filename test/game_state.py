@@ -0,0 +1,37 @@
+from controller.game_controller import GameController
+from controller.headless_controller import HeadlessController
+from util.settings import Settings
+
+"""
+This file contains the helpers of the tests comparing whole games: a seeded game played headlessly and the state it ends in.
+"""
+
+def play(ticks: int, record: str = None) -> GameController:
+    """
+    Play a seeded game for some ticks.
+
+    :param ticks: The number of ticks.
+    :type ticks: int
+    :param record: The directory where the game is journaled, None not to record it.
+    :type record: str
+    :return: The game controller of the game.
+    :rtype: GameController
+    """
+    headless = HeadlessController(Settings(), 5)
+    headless.run(ticks, record=record)
+    return headless.get_game_controller()
+
+def state(game_controller: GameController) -> tuple:
+    """
+    Get the parts of a game which a saved, restored or replayed game must have: the map, the players and the tick.
+
+    :param game_controller: The game controller.
+    :type game_controller: GameController
+    :return: The state of the game.
+    :rtype: tuple
+    """
+    players = [
+        (player.get_name(), {type(resource).__name__: amount for resource, amount in player.get_resources().items()}, sorted(unit.get_id() for unit in player.get_units()))
+        for player in game_controller.get_players()
+    ]
+    return str(game_controller.get_map()), players, game_controller.get_commandlist().get_now()
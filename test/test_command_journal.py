@@ -0,0 +1,62 @@
+import os
+import tempfile
+import unittest
+from controller.command_journal import CommandJournal
+from controller.game_controller import GameController
+from controller.headless_controller import HeadlessController
+from util.save_file import SaveFile
+from test.game_state import play, state
+
+class TestCommandJournal(unittest.TestCase):
+    """Test cases for the CommandJournal class."""
+
+    def setUp(self):
+        """Start a new segment every 300 ticks."""
+        self.compact_interval = CommandJournal.COMPACT_INTERVAL
+        CommandJournal.COMPACT_INTERVAL = 300
+
+    def tearDown(self):
+        """Restore the interval between two segments."""
+        CommandJournal.COMPACT_INTERVAL = self.compact_interval
+
+    def restore(self, directory: str, tick: int = None) -> GameController:
+        """Restore a tick of a journaled game."""
+        game = SaveFile.read(CommandJournal.find_base(directory, tick))
+        game_controller = GameController(HeadlessController(game['settings']), True)
+        game_controller.load_game(game['map'], game['players'], game['command_list'])
+        CommandJournal.replay(directory, game_controller, tick)
+        return game_controller
+
+    def test_restore(self):
+        """Test that any tick of a journaled game is restored from the nearest base save and the logged commands."""
+        game_controller = play(0)
+        states = {}
+        with tempfile.TemporaryDirectory() as directory:
+            journal = CommandJournal(directory)
+            journal.start(game_controller)
+            for tick in range(1200):
+                if tick % 60 == 0:
+                    game_controller.get_ai_controller().step()
+                game_controller.step()
+                if tick + 1 in (450, 1000, 1200):
+                    states[tick + 1] = state(game_controller)
+            journal.close()
+            self.assertNotEqual(states[450], states[1200], "The game should have gone on")
+            self.assertEqual(CommandJournal.get_segments(directory), [300, 600, 900, 1200], "The oldest segments should be dropped")
+            self.assertEqual(CommandJournal.get_range(directory), (300, 1200), "The journal should restore the ticks of its segments")
+            self.assertEqual(state(self.restore(directory, 450)), states[450], "A tick between two base saves should be restored")
+            self.assertEqual(state(self.restore(directory)), states[1200], "The last tick should be restored")
+            os.remove(os.path.join(directory, f"{900:010d}{SaveFile.EXTENSION}"))
+            self.assertEqual(state(self.restore(directory, 1000)), states[1000], "A missing base save should only make the replay longer")
+
+    def test_prune_journals(self):
+        """Test that only the last changed journals are kept, and never the one being written."""
+        with tempfile.TemporaryDirectory() as parent:
+            for index, name in enumerate(["a", "b", "c", "d"]):
+                os.makedirs(os.path.join(parent, name))
+                os.utime(os.path.join(parent, name), (index, index))
+            CommandJournal.prune_journals(parent, 2, os.path.join(parent, "a"))
+            self.assertEqual(sorted(os.listdir(parent)), ["a", "c", "d"], "The oldest journals should be removed, but the current one")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import pickle
+import unittest
+from controller.command import MoveCommand, AttackCommand
+from controller.command_scheduler import CommandScheduler
+from model.player.player import Player
+from model.units.villager import Villager
+from util.coordinate import Coordinate
+from util.map import Map
+
+class TestCommandScheduler(unittest.TestCase):
+    """Test cases for the CommandScheduler class."""
+
+    def setUp(self):
+        """Set up a map with a villager and an empty scheduler."""
+        self.map = Map(10)
+        self.player = Player("Player 1", "blue")
+        self.villager = Villager()
+        self.villager.set_coordinate(Coordinate(1, 1))
+        self.map.add(self.villager, Coordinate(1, 1))
+        self.scheduler = CommandScheduler()
+
+    def run_tick(self) -> list:
+        """Run the due commands of the current tick and end it, like the game controller does."""
+        due = self.scheduler.pop_due()
+        for command in due:
+            command.run_command()
+        self.scheduler.advance()
+        return due
+
+    def test_command_runs_when_pushed_and_when_due(self):
+        """Test that a command only runs on the tick it is pushed and on the tick it is due."""
+        command = MoveCommand(self.map, self.player, self.villager, Coordinate(2, 2), 10, self.scheduler)
+        ticks = command.get_tick()
+        self.assertGreater(ticks, 1, "The move should last several ticks")
+        self.assertEqual(self.run_tick(), [command], "The command should start on the tick it is pushed")
+        self.assertIs(self.map.get(Coordinate(2, 2)), self.villager, "The villager should have moved")
+        for tick in range(1, ticks):
+            self.assertEqual(command.get_tick(), ticks - tick, "The tick should count down without running the command")
+            self.assertEqual(self.run_tick(), [], f"No command should run on tick {tick}")
+        self.assertEqual(command.get_tick(), 0, "The command should be due")
+        self.assertEqual(self.run_tick(), [command], "The command should run on the tick it is due")
+        self.assertEqual(len(self.scheduler), 0, "The finished command should be removed")
+        self.assertLess(command.get_tick(), 0, "The command should be over")
+
+    def test_duplicate_command(self):
+        """Test that an entity cannot get a second command of the same process, but can get another one."""
+        MoveCommand(self.map, self.player, self.villager, Coordinate(2, 2), 10, self.scheduler)
+        with self.assertRaises(ValueError):
+            MoveCommand(self.map, self.player, self.villager, Coordinate(2, 1), 10, self.scheduler)
+        AttackCommand(self.map, self.player, self.villager, Coordinate(2, 1), 10, self.scheduler)
+        self.assertEqual(len(self.scheduler.get_commands(self.villager)), 2, "The entity should have both commands")
+
+    def test_remove(self):
+        """Test that a removed command does not run anymore."""
+        command = MoveCommand(self.map, self.player, self.villager, Coordinate(2, 2), 10, self.scheduler)
+        command.remove_command_from_list(self.scheduler)
+        self.assertNotIn(command, self.scheduler, "The command should be removed")
+        self.assertEqual(self.run_tick(), [], "The removed command should not run")
+        self.assertEqual(self.scheduler.get_commands(self.villager), [], "The entity should have no command")
+
+    def test_pickle(self):
+        """Test that a pickled scheduler keeps its commands and their ticks."""
+        MoveCommand(self.map, self.player, self.villager, Coordinate(2, 2), 10, self.scheduler)
+        self.run_tick()
+        scheduler = pickle.loads(pickle.dumps(self.scheduler))
+        command = next(iter(scheduler))
+        self.assertEqual(scheduler.get_now(), 1, "The current tick should be kept")
+        self.assertEqual(command.get_tick(), command.get_due() - 1, "The command should keep its due tick")
+        self.assertEqual(scheduler.get_commands(command.get_entity()), [command], "The commands should stay indexed by entity")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,3 +1,4 @@
+import pickle
 import unittest
 from util.coordinate import Coordinate
 
@@ -176,6 +177,25 @@ class TestCoordinate(unittest.TestCase):
     def test_repr(self):
         """Test the official string representation of the coordinate."""
         self.assertEqual(repr(self.coordinate), "Coordinate(1, 1)", "The string should be equal to Coordinate(1, 1)")
+
+    def test_hash_after_set(self):
+        """Test that the cached hash follows the modifications of the coordinate."""
+        hash(self.coordinate)
+        self.coordinate.set_x(2)
+        self.assertEqual(hash(self.coordinate), hash((2, 1)), "The hash should be computed again")
+
+    def test_of(self):
+        """Test the shared coordinates of the intern table."""
+        self.assertIs(Coordinate.of(1, 1), Coordinate.of(1, 1), "The coordinate should be shared")
+        self.assertEqual(Coordinate.of(1, 1), self.coordinate, "The shared coordinate should be equal to a new one")
+        self.assertEqual(Coordinate.of(-1, Coordinate.INTERN_SIZE), Coordinate(-1, Coordinate.INTERN_SIZE), "A coordinate out of the table should be created")
+        with self.assertRaises(AttributeError):
+            Coordinate.of(1, 1).set_x(2)
+
+    def test_pickle(self):
+        """Test that the coordinates are pickled, the shared ones being shared again."""
+        self.assertEqual(pickle.loads(pickle.dumps(self.coordinate)), self.coordinate, "The coordinate should be restored")
+        self.assertIs(pickle.loads(pickle.dumps(Coordinate.of(1, 1))), Coordinate.of(1, 1), "The shared coordinate should be restored")
         
 if __name__ == '__main__':
     unittest.main()
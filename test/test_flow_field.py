@@ -0,0 +1,60 @@
+import unittest
+from util.map import Map
+from util.coordinate import Coordinate
+from model.resources.wood import Wood
+from model.units.villager import Villager
+
+class TestFlowField(unittest.TestCase):
+    """Test cases for the FlowField class, used through the Map class."""
+
+    def setUp(self):
+        """Set up the test environment before each test case. Initializes a 30x30 map with a wall of wood."""
+        self.map = Map(30)
+        for y in range(25):
+            self.map.add(Wood(), Coordinate(15, y))
+
+    def tearDown(self):
+        """Clean up the test environment after each test case."""
+        self.map = None
+
+    def follow(self, field, start: Coordinate) -> list[Coordinate]:
+        """Follow the next steps of a field from a coordinate until there is none."""
+        path = []
+        current = field.next_step(start)
+        while current is not None and len(path) < 100:
+            path.append(current)
+            current = field.next_step(current)
+        return path
+
+    def test_next_step(self):
+        """Test that following the field leads to the target, around the wall, as fast as the shortest path."""
+        target = Coordinate(25, 2)
+        field = self.map.get_flow_field(target)
+        path = self.follow(field, Coordinate(2, 2))
+        self.assertEqual(path[-1], target, "The field should lead to the target")
+        self.assertEqual(len(path), len(self.map.path_finding(Coordinate(2, 2), target)), "The field should be as short as the shortest path")
+        self.assertLess(field.get_settled_count(), 30 * 30, "The field should only be expanded as far as needed")
+
+    def test_units_are_avoided(self):
+        """Test that a unit on the best step is avoided, without making the target unreachable."""
+        field = self.map.get_flow_field(Coordinate(2, 2))
+        best = field.next_step(Coordinate(5, 2))
+        self.map.add(Villager(), best)
+        other = field.next_step(Coordinate(5, 2))
+        self.assertIsNotNone(other, "Another step should be found")
+        self.assertNotEqual(other, best, "The unit should be avoided")
+        self.assertIs(self.map.get_flow_field(Coordinate(2, 2)), field, "A unit should not drop the field")
+
+    def test_shared_and_invalidated(self):
+        """Test that the targets of a region share a field, which is dropped when a resource changes where it reached."""
+        field = self.map.get_flow_field(Coordinate(25, 2))
+        self.assertIs(self.map.get_flow_field(Coordinate(26, 3)), field, "The targets of the same region should share the field")
+        self.assertIsNot(self.map.get_flow_field(Coordinate(2, 28)), field, "Another region should have another field")
+        field.distance(Coordinate(17, 2))
+        self.map.add(Wood(), Coordinate(0, 29))
+        self.assertIs(self.map.get_flow_field(Coordinate(25, 2)), field, "A change out of the reached area should not drop the field")
+        self.map.remove(Coordinate(15, 2))
+        self.assertIsNot(self.map.get_flow_field(Coordinate(25, 2)), field, "A change in the reached area should drop the field")
+
+if __name__ == '__main__':
+    unittest.main()
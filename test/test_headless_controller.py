@@ -0,0 +1,27 @@
+import unittest
+from controller.headless_controller import HeadlessController
+from util.settings import Settings
+
+class TestHeadlessController(unittest.TestCase):
+    """Test cases for the HeadlessController class."""
+
+    def summary(self, result: dict) -> list:
+        """Keep the parts of the stats which do not depend on the names given to the objects."""
+        return [(player["resources"], [unit["hp"] for unit in player["units"]], [building["hp"] for building in player["buildings"]]) for player in result["players"]]
+
+    def test_run(self):
+        """Test that a game runs for the given number of ticks and reports the stats of the players."""
+        result = HeadlessController(Settings(), 1).run(300)
+        self.assertEqual(result["ticks"], 300, "The game should run for 300 ticks")
+        self.assertGreater(result["ticks_per_second"], 0, "The speed of the simulation should be reported")
+        self.assertEqual(len(result["players"]), 2, "The stats of both players should be reported")
+        self.assertEqual(result["losers"], [], "No player should have lost so early")
+
+    def test_same_seed(self):
+        """Test that two games with the same seed are the same."""
+        first = HeadlessController(Settings(), 7).run(600)
+        second = HeadlessController(Settings(), 7).run(600)
+        self.assertEqual(self.summary(first), self.summary(second), "The games should be the same")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+import unittest
+from util.map import Map
+from util.coordinate import Coordinate
+from util.path_finder import PathFinder
+from util.hierarchical_path_finder import HierarchicalPathFinder
+from model.resources.wood import Wood
+from model.units.villager import Villager
+
+class TestHierarchicalPathFinder(unittest.TestCase):
+    """Test cases for the HierarchicalPathFinder class."""
+
+    def setUp(self):
+        """Set up the test environment before each test case. Initializes a 40x40 map with two walls of wood and a hierarchical path finder with 8x8 clusters."""
+        self.map = Map(40)
+        for y in range(30):
+            self.map.add(Wood(), Coordinate(12, y))
+        for y in range(10, 40):
+            self.map.add(Wood(), Coordinate(27, y))
+        self.walkability = bytearray(self.map.get_walkability())
+        self.finder = HierarchicalPathFinder(self.map, self.walkability, PathFinder(self.walkability, 40), 8)
+
+    def tearDown(self):
+        """Clean up the test environment after each test case."""
+        self.map = None
+        self.finder = None
+
+    def assertValidPath(self, start: Coordinate, path: list[Coordinate], end: Coordinate):
+        """Assert that the path goes from start to end through adjacent free tiles."""
+        self.assertTrue(path, "A path should be found")
+        self.assertEqual(path[-1], end, "The path should end on the end coordinate")
+        previous = start
+        for coordinate in path[:-1]:
+            self.assertTrue(previous.is_adjacent(coordinate), f"{previous} and {coordinate} should be adjacent")
+            self.assertIsNone(self.map.get(coordinate), f"The path should not go through the object at {coordinate}")
+            previous = coordinate
+
+    def test_find_path(self):
+        """Test that the path goes around both walls and is close to the shortest one."""
+        start, end = Coordinate(2, 2), Coordinate(37, 37)
+        path = self.finder.find_path(start, end)
+        self.assertValidPath(start, path, end)
+        self.assertLessEqual(len(path), len(self.map.path_finding(start, end)) * 1.2, "The path should be close to the shortest one")
+        self.assertTrue(self.finder.is_built(20, 20), "The clusters on the way should be built")
+        self.assertFalse(self.finder.is_built(37, 2), "The clusters away from the path should not be built")
+
+    def test_invalidation(self):
+        """Test that an added object drops the graph of its cluster and of the neighbouring clusters on its border."""
+        start, end = Coordinate(2, 2), Coordinate(37, 37)
+        self.finder.find_path(start, end)
+        self.map.add(Wood(), Coordinate(16, 35))
+        self.walkability[35 * 40 + 16] = 0
+        self.finder.invalidate(Coordinate(16, 35))
+        self.assertFalse(self.finder.is_built(16, 35), "The cluster of the object should be dropped")
+        self.assertFalse(self.finder.is_built(15, 35), "The cluster on the other side of the border should be dropped")
+        self.assertValidPath(start, self.finder.find_path(start, end), end)
+
+    def test_units_are_avoided(self):
+        """Test that units are passable for the graph, but avoided by the path."""
+        start, end = Coordinate(2, 35), Coordinate(37, 2)
+        path = self.finder.find_path(start, end)
+        for coordinate in path[5:-5:3]:
+            villager = Villager()
+            villager.set_coordinate(coordinate)
+            self.map.add(villager, coordinate)
+            self.walkability[coordinate.get_y() * 40 + coordinate.get_x()] = 0
+        self.assertValidPath(start, self.finder.find_path(start, end), end)
+
+    def test_map_uses_hierarchical_path_finder(self):
+        """Test that only the medium and large maps use it, for long paths."""
+        self.assertIsNone(self.map.get_hierarchical_path_finder(), "A small map should not use a hierarchical path finder")
+        big_map = Map(240)
+        finder = big_map.get_hierarchical_path_finder()
+        big_map.path_finding(Coordinate(0, 0), Coordinate(10, 10))
+        self.assertFalse(finder.is_built(0, 0), "A short path should not use the hierarchical path finder")
+        path = big_map.path_finding(Coordinate(0, 0), Coordinate(200, 150))
+        self.assertLessEqual(len(path), 220, "The path should be close to a straight path")
+        self.assertTrue(finder.is_built(100, 75), "A long path should use the hierarchical path finder")
+
+    def test_units_keep_clusters(self):
+        """Test that a unit added to or removed from the map keeps the graph of its cluster, units being passable for the graph."""
+        big_map = Map(240)
+        finder = big_map.get_hierarchical_path_finder()
+        big_map.path_finding(Coordinate(0, 0), Coordinate(200, 150))
+        self.assertTrue(finder.is_built(0, 0), "The cluster of the start should be built")
+        villager = Villager()
+        villager.set_coordinate(Coordinate(1, 1))
+        big_map.add(villager, Coordinate(1, 1))
+        big_map.remove(Coordinate(1, 1))
+        self.assertTrue(finder.is_built(0, 0), "The cluster should be kept")
+        big_map.add(Wood(), Coordinate(1, 1))
+        self.assertFalse(finder.is_built(0, 0), "A resource should drop the cluster")
+
+if __name__ == '__main__':
+    unittest.main()
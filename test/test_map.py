@@ -1,9 +1,14 @@
+import pickle
 import unittest
 from collections import defaultdict
 from util.map import Map
 from util.coordinate import Coordinate
 from model.buildings.town_center import TownCenter
 from model.units.villager import Villager
+from model.resources.resource import Resource
+from model.resources.wood import Wood
+from model.buildings.farm import Farm
+from model.player.player import Player
 
 class TestMapCoordinate(unittest.TestCase):
     """Test cases for the Map class and its interactions with buildings and units."""
@@ -146,5 +151,197 @@ class TestMapCoordinate(unittest.TestCase):
         self.map.add(self.unit, Coordinate(4, 4))
         self.assertEqual(self.map.get_map_list_from_to(Coordinate(2, 2), Coordinate(4, 4)), expected, "The map should contain the building and the unit")
 
+    def test_get_xy(self):
+        """Test the get_xy method of the Map class. Asserts that it matches get and returns None outside of the map."""
+        self.map.add(self.building, Coordinate(0, 0))
+        self.map.add(self.unit, Coordinate(4, 4))
+        for x in range(5):
+            for y in range(5):
+                self.assertIs(self.map.get_xy(x, y), self.map.get(Coordinate(x, y)), f"get_xy and get should agree at position ({x}, {y})")
+        for x, y in [(-1, 0), (0, -1), (5, 0), (0, 5)]:
+            self.assertIsNone(self.map.get_xy(x, y), f"There should be nothing outside of the map at position ({x}, {y})")
+
+    def test_get_object(self):
+        """Test the get_object method of the Map class. Asserts that objects are reachable by id until their last tile is removed."""
+        self.map.add(self.building, Coordinate(0, 0))
+        self.assertIs(self.map.get_object(self.building.get_id()), self.building, "The building should be reachable by its id")
+        self.map.remove(Coordinate(0, 0))
+        self.assertIsNone(self.map.get_object(self.building.get_id()), "The building should not be reachable once removed")
+
+    def test_reading_empty_tiles(self):
+        """Test that reading empty tiles does not store anything in the map."""
+        for x in range(5):
+            for y in range(5):
+                self.map.get(Coordinate(x, y))
+        self.assertEqual(len(self.map.get_map()), 0, "Reading empty tiles should not add entries to the map")
+
+    def test_walkability(self):
+        """Test that the walkability bitmap follows the add, move and remove methods of the Map class."""
+        self.map.add(self.building, Coordinate(0, 0))
+        self.map.add(self.unit, Coordinate(4, 4))
+        self.map.move(self.unit, Coordinate(4, 3))
+        self.unit.set_coordinate(Coordinate(4, 3))
+        walkability = self.map.get_walkability()
+        for x in range(5):
+            for y in range(5):
+                occupied = self.map.get(Coordinate(x, y)) is not None
+                self.assertEqual(self.map.is_walkable_xy(x, y), not occupied, f"The walkability should match the map at position ({x}, {y})")
+                self.assertEqual(walkability[y * 5 + x], 0 if occupied else 1, f"The bitmap should match the map at position ({x}, {y})")
+        self.map.remove(Coordinate(0, 0))
+        self.assertTrue(all(self.map.is_walkable_xy(x, y) for x in range(4) for y in range(4)), "The tiles of a removed building should be walkable")
+        self.assertFalse(self.map.is_walkable_xy(5, 5), "Tiles outside of the map should not be walkable")
+
+    def test_add_all(self):
+        """Test that many objects are added at once, and that nothing is added if one of them cannot be placed."""
+        wood = Wood()
+        self.map.add(self.unit, Coordinate(4, 4))
+        self.assertEqual(self.map.get_free_indices(), list(range(24)), "Every tile but the one of the unit should be free")
+        with self.assertRaises(ValueError):
+            self.map.add_all([(wood, Coordinate(0, 4)), (Wood(), Coordinate(4, 4))])
+        with self.assertRaises(ValueError):
+            self.map.add_all([(wood, Coordinate(0, 4)), (self.building, Coordinate(0, 3))])
+        self.assertIsNone(self.map.get(Coordinate(0, 4)), "Nothing should be added when a placement fails")
+        version = self.map.get_version()
+        self.map.add_all([(wood, Coordinate(0, 4)), (wood, Coordinate(1, 4)), (self.building, Coordinate(0, 0))])
+        self.assertEqual(self.map.get_version(), version + 1, "The version should be increased once")
+        self.assertIs(self.map.get(Coordinate(1, 4)), wood, "The objects should be added")
+        self.assertIs(self.map.get(Coordinate(3, 3)), self.building, "Every tile of a building should be claimed")
+        self.assertEqual(self.map.find_nearest_objects(Coordinate(4, 4), Wood), [Coordinate(1, 4), Coordinate(0, 4)], "The objects should be indexed")
+        self.assertFalse(self.map.is_walkable_xy(0, 4), "The tiles of the objects should not be walkable")
+        self.map.remove(Coordinate(0, 4))
+        self.assertIs(self.map.get(Coordinate(1, 4)), wood, "An object added on many tiles should stay on the others")
+
+    def test_change_feed(self):
+        """Test that the written tiles are given since a revision, moves included, until they are dropped from the feed."""
+        revision = self.map.get_revision()
+        self.map.add(self.unit, Coordinate(4, 4))
+        self.map.move(self.unit, Coordinate(4, 3))
+        self.assertEqual(self.map.get_changes(revision), [24, 24, 19], "The tiles written by the add and the move should be given")
+        self.assertEqual(self.map.get_changes(self.map.get_revision()), [], "Nothing should be written since the last revision")
+        self.unit.set_coordinate(Coordinate(4, 3))
+        for step in range(Map.MAX_CHANGES):
+            coordinate = Coordinate(4, 4 if step % 2 == 0 else 3)
+            self.map.move(self.unit, coordinate)
+            self.unit.set_coordinate(coordinate)
+        self.assertIsNone(self.map.get_changes(revision), "A revision older than the feed should not be given")
+        self.assertEqual(pickle.loads(pickle.dumps(self.map)).get_revision(), self.map.get_revision(), "The revision should be kept by a pickled map")
+
+    def test_find_nearest_objects(self):
+        """Test that the nearest objects are found by increasing distance, farms included for resources, and that the index follows moves."""
+        big_map = Map(40)
+        coordinates = [Coordinate(3, 4), Coordinate(30, 2), Coordinate(12, 12), Coordinate(39, 39), Coordinate(0, 25)]
+        for coordinate in coordinates:
+            big_map.add(Wood(), coordinate)
+        big_map.add(Farm(), Coordinate(20, 20))
+        self.unit.set_coordinate(Coordinate(10, 10))
+        big_map.add(self.unit, Coordinate(10, 10))
+        distance = lambda coordinate: max(abs(coordinate.get_x() - 10), abs(coordinate.get_y() - 10))
+        expected = sorted(coordinates + [Coordinate(20 + x, 20 + y) for x in range(2) for y in range(2)], key=distance)
+        found = big_map.find_nearest_objects(Coordinate(10, 10), Resource)
+        self.assertEqual([distance(coordinate) for coordinate in found], [distance(coordinate) for coordinate in expected], "The resources should be found by increasing distance")
+        self.assertEqual(set(found), set(expected), "Every resource and farm tile should be found")
+        self.assertEqual(big_map.find_nearest_objects(Coordinate(10, 10), Wood, 2), [Coordinate(12, 12), Coordinate(3, 4)], "Only the nearest woods should be returned")
+        big_map.move(self.unit, Coordinate(11, 11))
+        self.assertEqual(big_map.find_nearest_objects(Coordinate(0, 0), Villager), [Coordinate(11, 11)], "The index should follow the moves")
+
+    def test_find_nearest_enemies(self):
+        """Test that only the entities of the given player are found."""
+        player, enemy = Player("Player", "blue"), Player("Enemy", "red")
+        self.unit.set_player(player)
+        self.building.set_player(enemy)
+        self.map.add(self.unit, Coordinate(0, 0))
+        self.map.add(self.building, Coordinate(1, 1))
+        self.assertEqual(self.map.find_nearest_enemies(Coordinate(0, 0), enemy, 1), [Coordinate(1, 1)], "The nearest tile of the enemy should be found")
+        self.assertEqual(len(self.map.find_nearest_enemies(Coordinate(0, 0), enemy)), self.building.get_size() ** 2, "Every tile of the enemy should be found")
+        self.assertEqual(self.map.find_nearest_enemies(Coordinate(4, 4), player), [Coordinate(0, 0)], "Only the entities of the player should be found")
+
+    def test_find_nearest_empty_zones(self):
+        """Test that the empty zones are free with a margin, do not overlap, come from the nearest rings and leave the map untouched."""
+        big_map = Map(30)
+        for x in range(30):
+            big_map.add(Wood(), Coordinate(x, 12))
+        zones = big_map.find_nearest_empty_zones(Coordinate(15, 15), 4)
+        self.assertTrue(zones, "Empty zones should be found")
+        for i, zone in enumerate(zones):
+            self.assertTrue(big_map.check_placement(self.building, zone), f"The zone {zone} should be free")
+            for other in zones[i + 1:]:
+                self.assertFalse(abs(zone.get_x() - other.get_x()) < 5 and abs(zone.get_y() - other.get_y()) < 5, f"The zones {zone} and {other} should not overlap")
+        self.assertEqual(big_map.find_nearest_empty_zones(Coordinate(15, 15), 4, 3), zones[:3], "The limit should keep the nearest zones")
+        self.assertEqual(len(big_map.get_map()), 30, "The map should not be modified")
+        self.assertEqual(big_map.find_nearest_empty_zones(Coordinate(15, 11), 1, 1), [Coordinate(15, 11)], "The first free zone of size 1 should be found")
+
+    def test_find_nearest_empty_zones_crowded(self):
+        """Test that the free squares follow the changes of a crowded map, where the limit of zones cannot be reached."""
+        big_map = Map(40)
+        big_map.add_resources(Wood, [Coordinate(x, y) for x in range(40) for y in range(40) if (x * 7 + y * 3) % 11 == 0 and not 30 <= y < 34])
+        for x in range(0, 40, 8):
+            big_map.add(TownCenter(), Coordinate(x, 30))
+        big_map.add(Villager(), Coordinate(20, 20))
+        for x in range(0, 40, 8):
+            big_map.remove(Coordinate(x, 30))
+        big_map.remove(Coordinate(0, 0))
+        rebuilt = Map(40)
+        rebuilt.restore_save_state(big_map.get_save_state())
+        for size in (1, 2, 4, 9):
+            zones = big_map.find_nearest_empty_zones(Coordinate(20, 20), size, 1000)
+            self.assertLess(len(zones), 1000, "The limit should not be reached")
+            self.assertEqual(zones, rebuilt.find_nearest_empty_zones(Coordinate(20, 20), size, 1000), f"The updated free squares should match the rebuilt ones for the size {size}")
+        self.assertEqual(big_map.find_nearest_empty_zones(Coordinate(20, 20), 1, 1), [Coordinate(20, 22)], "The zones should keep clear of the units")
+
+    def test_snapshot(self):
+        """Test that a snapshot keeps the state of the map at the time it was taken, whatever is written on the map afterwards."""
+        self.map.add(self.building, Coordinate(0, 0))
+        self.map.add(self.unit, Coordinate(4, 4))
+        snapshot = self.map.snapshot()
+        self.assertTrue(snapshot.is_snapshot(), "The snapshot should know it is one")
+        wood = Wood()
+        self.map.add(wood, Coordinate(4, 0))
+        self.map.remove(Coordinate(0, 0))
+        self.map.move(self.unit, Coordinate(4, 3))
+        self.assertIs(snapshot.get(Coordinate(1, 1)), self.building, "The removed building should stay in the snapshot")
+        self.assertIs(snapshot.get(Coordinate(4, 4)), self.unit, "The unit should stay at its old position in the snapshot")
+        self.assertIsNone(snapshot.get(Coordinate(4, 3)), "The new position of the unit should be empty in the snapshot")
+        self.assertIsNone(snapshot.get(Coordinate(4, 0)), "The added wood should not be in the snapshot")
+        self.assertEqual(len(snapshot.get_map()), self.building.get_size() ** 2 + 1, "The snapshot should list the old tiles")
+        self.assertEqual(len(snapshot.capture().get_map()), self.building.get_size() ** 2 + 1, "The copy of a snapshot should hold the old tiles")
+        self.assertEqual(snapshot.find_nearest_objects(Coordinate(4, 0), TownCenter, 1), [Coordinate(3, 0)], "The removed building should be found in the snapshot")
+        self.assertEqual(snapshot.find_nearest_objects(Coordinate(4, 0), Resource), [], "The added wood should not be found in the snapshot")
+        self.assertEqual(snapshot.find_nearest_empty_zones(Coordinate(0, 0), 1), [], "The removed building should still fill the snapshot")
+        self.assertTrue(self.map.find_nearest_empty_zones(Coordinate(0, 0), 1), "The removed building should free the live map")
+        self.assertEqual(self.map.find_nearest_objects(Coordinate(4, 0), Resource), [Coordinate(4, 0)], "The live map should see the wood")
+        with self.assertRaises(ValueError):
+            snapshot.add(Wood(), Coordinate(4, 2))
+        snapshot.release()
+        self.map.remove(Coordinate(4, 0))
+        self.assertIsNone(snapshot.get(Coordinate(4, 0)), "A released snapshot should not record the changes anymore")
+
+    def test_snapshot_walkability(self):
+        """Test that the placement checks, the free zones, the paths and the resources of a snapshot are those of the map when it was taken."""
+        big_map = Map(20)
+        big_map.add_resources(Wood, [Coordinate(19, 19)])
+        snapshot = big_map.snapshot()
+        zones = snapshot.find_nearest_empty_zones(Coordinate(10, 10), self.building.get_size(), 3)
+        big_map.add(self.building, zones[0])
+        big_map.add_resources(Wood, [Coordinate(5, y) for y in range(20)])
+        self.assertFalse(big_map.check_placement(self.building, zones[0]), "The building should fill the live map")
+        self.assertTrue(snapshot.check_placement(self.building, zones[0]), "The building should not fill the snapshot")
+        self.assertEqual(snapshot.find_nearest_empty_zones(Coordinate(10, 10), self.building.get_size(), 3), zones, "The free zones of the snapshot should not change")
+        self.assertEqual(big_map.path_finding(Coordinate(0, 0), Coordinate(10, 0)), [], "The wood should cut the live map")
+        self.assertTrue(snapshot.path_finding(Coordinate(0, 0), Coordinate(10, 0)), "The wood should not cut the snapshot")
+        self.assertIn(5, snapshot.get_free_indices(), "The tiles of the wood should be free in the snapshot")
+        wood = snapshot.get_xy(19, 19)
+        self.assertIsInstance(wood, Wood, "The resources of the snapshot should be read")
+        self.assertIsNot(big_map.get_xy(19, 19), wood, "The resources read on the snapshot should not be kept by the live map")
+        snapshot.release()
+
+    def test_snapshot_pickle(self):
+        """Test that a map with snapshots can be pickled without them."""
+        self.map.add(self.building, Coordinate(0, 0))
+        self.map.snapshot()
+        copy = pickle.loads(pickle.dumps(self.map))
+        self.assertEqual(len(copy.get_map()), self.building.get_size() ** 2, "The tiles should be pickled")
+        copy.add(Wood(), Coordinate(4, 3))
+        self.assertIsInstance(copy.get(Coordinate(4, 3)), Wood, "The unpickled map should be writable")
+
 if __name__ == '__main__':
     unittest.main()
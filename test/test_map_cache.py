@@ -0,0 +1,64 @@
+import os
+import tempfile
+import unittest
+from controller.game_controller import GameController
+from controller.headless_controller import HeadlessController
+from util.map_cache import MapCache
+from util.settings import Settings
+from util.state_manager import FPS
+
+class TestMapCache(unittest.TestCase):
+    """Test cases for the MapCache class."""
+
+    def test_get_copy(self):
+        """Test that every read of a cached map gives a new copy of it."""
+        cache = MapCache()
+        state = {"map": [1, 2, 3], "players": ["Player 1"]}
+        cache.put(MapCache.key(1, 120, 1, 60), state)
+        first = cache.get(MapCache.key(1, 120, 1, 60))
+        second = cache.get(MapCache.key(1, 120, 1, 60))
+        self.assertEqual(first, state, "The cached map should be returned")
+        self.assertIsNot(first, state, "The cached map should be a copy")
+        self.assertIsNot(first["map"], second["map"], "Each read should give a new copy")
+        self.assertIsNone(cache.get(MapCache.key(2, 120, 1, 60)), "A map which is not cached should not be found")
+
+    def test_eviction(self):
+        """Test that the least recently used map is dropped when the cache is full."""
+        cache = MapCache(max_size=2)
+        cache.put((1,), {"map": 1})
+        cache.put((2,), {"map": 2})
+        cache.get((1,))
+        cache.put((3,), {"map": 3})
+        self.assertEqual(len(cache), 2, "The cache should keep at most 2 maps")
+        self.assertIsNone(cache.get((2,)), "The least recently used map should be dropped")
+        self.assertEqual(cache.get((1,)), {"map": 1}, "The recently read map should be kept")
+
+    def test_directory(self):
+        """Test that the maps written to a directory are read back by another cache."""
+        with tempfile.TemporaryDirectory() as directory:
+            MapCache(directory).put(MapCache.key(1, 120, 1, 60), {"map": 1})
+            self.assertEqual(os.listdir(directory), ["map_1_120_1_60.pkl"], "The map should be written to the directory")
+            self.assertEqual(MapCache(directory).get(MapCache.key(1, 120, 1, 60)), {"map": 1}, "The map should be read from the directory")
+
+    def test_cached_game(self):
+        """Test that a game on a cached map is the same as on a generated one."""
+        GameController.MAP_CACHE.clear()
+        generated = HeadlessController(Settings(), 11).run(300)
+        self.assertEqual(len(GameController.MAP_CACHE), 1, "The generated map should be cached")
+        cached = HeadlessController(Settings(), 11).run(300)
+        self.assertEqual([player["resources"] for player in generated["players"]], [player["resources"] for player in cached["players"]], "The games should be the same")
+
+    def test_fps(self):
+        """Test that a seeded map cached at some fps is not reused at other fps, as the commands of its players would run at the wrong speed."""
+        GameController.MAP_CACHE.clear()
+        for fps in (FPS.FPS_60, FPS.FPS_15):
+            settings = Settings()
+            settings.fps = fps
+            headless = HeadlessController(settings, 11)
+            headless.run(0)
+            coefficients = [player.get_command_manager().get_convert_coeff() for player in headless.get_game_controller().get_players()]
+            self.assertEqual(coefficients, [fps.value] * 2, "The command managers should convert times with the fps of the game")
+        self.assertEqual(len(GameController.MAP_CACHE), 2, "The map should be cached for each fps")
+
+if __name__ == '__main__':
+    unittest.main()
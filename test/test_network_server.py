@@ -0,0 +1,46 @@
+import socket
+import unittest
+from controller.command import Process
+from controller.headless_controller import HeadlessController
+from controller.network_server import NetworkServer
+from util.settings import Settings
+
+class TestNetworkServer(unittest.TestCase):
+    """Test cases for the NetworkServer class."""
+
+    def setUp(self):
+        """Start a server on a free port for a new game."""
+        headless = HeadlessController(Settings(), 5)
+        headless.run(0)
+        self.game_controller = headless.get_game_controller()
+        self.server = NetworkServer(self.game_controller, '127.0.0.1', 0)
+        self.server.start()
+
+    def tearDown(self):
+        """Stop the server."""
+        self.server.stop()
+
+    def send(self, connection: socket.socket, data: bytes, answers: int) -> list[bytes]:
+        """Send lines on a connection and read their answers."""
+        connection.sendall(data)
+        received = b""
+        while received.count(b"\n") < answers:
+            received += connection.recv(4096)
+        return received.splitlines()
+
+    def test_commands(self):
+        """Test that the lines of a connection are answered in order and move the units by their id."""
+        units = [unit for player in self.game_controller.get_players() for unit in player.get_units()]
+        target = units[0].get_coordinate()
+        with socket.create_connection(('127.0.0.1', self.server.get_port())) as connection:
+            lines = b"".join(f"mov {unit.get_id()} ({target.get_x() + 1},{target.get_y()})\n".encode() for unit in units)
+            answers = self.send(connection, lines + b"jump 1 (2,3)\nmov 999999 (1,1)\n", len(units) + 2)
+            self.assertEqual(answers[:len(units)], [b"ok"] * len(units), "The units should be moved")
+            self.assertEqual(answers[len(units):], [b"error invalid command", b"error unknown unit"], "The invalid lines should be answered by an error")
+            for unit in units:
+                self.assertEqual([command.get_process() for command in self.game_controller.get_commandlist().get_commands(unit)], [Process.MOVE], "A move command should be scheduled for each unit")
+            answers = self.send(connection, f"mov {units[0].get_id()} ({target.get_x() + 1},{target.get_y()})\r\n".encode(), 1)
+            self.assertTrue(answers[0].startswith(b"error"), "The same connection should answer a unit already moving")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+from util.map import Map
+from util.coordinate import Coordinate
+from util.path_cache import PathCache
+from model.resources.wood import Wood
+from model.units.villager import Villager
+
+class TestPathCache(unittest.TestCase):
+    """Test cases for the PathCache class, used through the Map class."""
+
+    def setUp(self):
+        """Set up the test environment before each test case. Initializes an empty 10x10 map and its path cache."""
+        self.map = Map(10)
+        self.cache = self.map.get_path_cache()
+
+    def tearDown(self):
+        """Clean up the test environment after each test case."""
+        self.map = None
+        self.cache = None
+
+    def test_hit_and_miss(self):
+        """Test that the same request is answered from the cache, and that other modes are cached apart."""
+        path = self.map.path_finding(Coordinate(0, 0), Coordinate(9, 0))
+        self.assertEqual((self.cache.get_hits(), self.cache.get_misses()), (0, 1), "The first request should be a miss")
+        self.assertEqual(self.map.path_finding(Coordinate(0, 0), Coordinate(9, 0)), path, "The cached path should be the same")
+        self.assertEqual((self.cache.get_hits(), self.cache.get_misses()), (1, 1), "The second request should be a hit")
+        self.map.path_finding_non_diagonal(Coordinate(0, 0), Coordinate(9, 0))
+        self.map.path_finding_avoid(Coordinate(0, 0), Coordinate(9, 0), Coordinate(4, 0), Coordinate(5, 0))
+        self.assertEqual(self.cache.get_misses(), 3, "Other modes should not use the same entry")
+        self.assertEqual(len(self.cache), 3, "There should be three cached paths")
+
+    def test_invalidation(self):
+        """Test that adding or removing an object on a cached path drops it, but not when it is elsewhere."""
+        path = self.map.path_finding(Coordinate(0, 0), Coordinate(9, 0))
+        self.map.add(Wood(), Coordinate(0, 9))
+        self.assertEqual(len(self.cache), 1, "An object away from the path should not drop it")
+        version = self.map.get_version()
+        self.map.add(Wood(), path[3])
+        self.assertEqual(len(self.cache), 0, "An object on the path should drop it")
+        self.assertEqual(self.map.get_version(), version + 1, "Adding an object should increase the version")
+        self.assertNotIn(path[3], self.map.path_finding(Coordinate(0, 0), Coordinate(9, 0)), "The new path should avoid the new object")
+        self.map.path_finding(Coordinate(9, 9), Coordinate(0, 9))
+        self.map.remove(Coordinate(0, 9))
+        self.assertEqual(len(self.cache), 1, "Removing the end of a path should drop it")
+
+    def test_moving_unit(self):
+        """Test that a unit moving does not drop a cached path, but that a path blocked by a unit is searched again."""
+        path = self.map.path_finding(Coordinate(0, 0), Coordinate(9, 0))
+        villager = Villager()
+        villager.set_coordinate(Coordinate(path[4].get_x(), 2))
+        self.map.add(villager, villager.get_coordinate())
+        for y in (1, 0):
+            self.map.move(villager, Coordinate(path[4].get_x(), y))
+            villager.set_coordinate(Coordinate(path[4].get_x(), y))
+        self.assertEqual(len(self.cache), 1, "Moves should not drop the cached path")
+        new_path = self.map.path_finding(Coordinate(0, 0), Coordinate(9, 0))
+        self.assertEqual(self.cache.get_hits(), 0, "A path blocked by a unit should not be a hit")
+        self.assertNotIn(villager.get_coordinate(), new_path, "The new path should go around the unit")
+
+    def test_least_recently_used(self):
+        """Test that the least recently used path is evicted when the cache is full."""
+        cache = PathCache(bytearray(b'\x01') * 100, 10, 2)
+        keys = [cache.key(Coordinate(0, 0), Coordinate(x, 0)) for x in range(1, 4)]
+        cache.put(keys[0], [Coordinate(1, 0)])
+        cache.put(keys[1], [Coordinate(1, 0), Coordinate(2, 0)])
+        cache.get(keys[0])
+        cache.put(keys[2], [Coordinate(1, 0), Coordinate(2, 0), Coordinate(3, 0)])
+        self.assertIsNotNone(cache.get(keys[0]), "The recently used path should be kept")
+        self.assertIsNone(cache.get(keys[1]), "The least recently used path should be evicted")
+        cache.invalidate(Coordinate(1, 0))
+        self.assertEqual(len(cache), 0, "Every path through the tile should be dropped")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+from util.map import Map
+from util.coordinate import Coordinate
+from util.path_finder import PathFinder
+from model.buildings.town_center import TownCenter
+from model.resources.wood import Wood
+
+class TestPathFinder(unittest.TestCase):
+    """Test cases for the PathFinder class, used through the Map class."""
+
+    def setUp(self):
+        """Set up the test environment before each test case. Initializes a 10x10 map with a wall of wood in the middle and a town center."""
+        self.map = Map(10)
+        for y in range(8):
+            self.map.add(Wood(), Coordinate(5, y))
+        self.map.add(TownCenter(), Coordinate(0, 6))
+
+    def tearDown(self):
+        """Clean up the test environment after each test case."""
+        self.map = None
+
+    def assertValidPath(self, start: Coordinate, path: list[Coordinate], end: Coordinate, diagonal: bool = True):
+        """Assert that the path goes from start to end through adjacent walkable tiles."""
+        self.assertTrue(path, "A path should be found")
+        self.assertEqual(path[-1], end, "The path should end on the end coordinate")
+        previous = start
+        for coordinate in path:
+            self.assertTrue(previous.is_adjacent(coordinate), f"{previous} and {coordinate} should be adjacent")
+            if not diagonal:
+                self.assertTrue(previous.get_x() == coordinate.get_x() or previous.get_y() == coordinate.get_y(), f"{previous} to {coordinate} should not be a diagonal move")
+            if coordinate != end:
+                self.assertIsNone(self.map.get(coordinate), f"The path should not go through the object at {coordinate}")
+            previous = coordinate
+
+    def test_path_finding(self):
+        """Test that a diagonal path goes around the wall with the optimal number of moves."""
+        start, end = Coordinate(0, 0), Coordinate(9, 0)
+        path = self.map.path_finding(start, end)
+        self.assertValidPath(start, path, end)
+        self.assertEqual(len(path), 16, "The path should go down to the gap of the wall and back up")
+
+    def test_path_finding_non_diagonal(self):
+        """Test that a non diagonal path only uses straight moves."""
+        start, end = Coordinate(0, 0), Coordinate(9, 0)
+        path = self.map.path_finding_non_diagonal(start, end)
+        self.assertValidPath(start, path, end, False)
+        self.assertEqual(len(path), 25, "The path should be as long as the manhattan detour")
+
+    def test_path_finding_avoid(self):
+        """Test that the path avoids the given area while still reaching the end."""
+        start, end = Coordinate(0, 0), Coordinate(3, 3)
+        path = self.map.path_finding_avoid(start, end, Coordinate(1, 1), Coordinate(3, 3))
+        self.assertValidPath(start, path, end)
+        for coordinate in path[:-1]:
+            self.assertFalse(Coordinate(1, 1) <= coordinate <= Coordinate(3, 3), f"{coordinate} should be outside of the avoided area")
+
+    def test_path_to_occupied_end(self):
+        """Test that a path can lead to an occupied tile, like a building."""
+        start, end = Coordinate(3, 3), Coordinate(1, 6)
+        self.assertValidPath(start, self.map.path_finding(start, end), end)
+
+    def test_no_path(self):
+        """Test that an empty list is returned when the end cannot be reached."""
+        self.map.add(Wood(), Coordinate(5, 8))
+        self.map.add(Wood(), Coordinate(5, 9))
+        self.assertEqual(self.map.path_finding(Coordinate(0, 0), Coordinate(9, 0)), [], "There should be no path through a full wall")
+
+    def test_jump_point_search(self):
+        """Test that Jump Point Search finds paths as short as A*."""
+        finder = PathFinder(bytearray(self.map.get_walkability()), self.map.get_size(), True)
+        for start, end in [(Coordinate(0, 0), Coordinate(9, 0)), (Coordinate(9, 9), Coordinate(0, 0)), (Coordinate(2, 2), Coordinate(8, 3))]:
+            path = finder.find_path(start, end)
+            self.assertValidPath(start, path, end)
+            self.assertEqual(len(path), len(self.map.path_finding(start, end)), f"Jump Point Search and A* should find paths of the same length from {start} to {end}")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,35 @@
+import tempfile
+import unittest
+from controller.replay_controller import ReplayController
+from test.game_state import play, state
+
+class TestReplayController(unittest.TestCase):
+    """Test cases for the ReplayController class."""
+
+    def setUp(self):
+        """Capture a keyframe every 1000 ticks."""
+        self.keyframe_interval = ReplayController.KEYFRAME_INTERVAL
+        ReplayController.KEYFRAME_INTERVAL = 1000
+
+    def tearDown(self):
+        """Restore the interval between two keyframes."""
+        ReplayController.KEYFRAME_INTERVAL = self.keyframe_interval
+
+    def test_seek(self):
+        """Test that seeking forward and backward in a replay gives the ticks of the recorded game."""
+        with tempfile.TemporaryDirectory() as directory:
+            recorded = state(play(3000, directory))
+            replay = ReplayController(directory)
+            self.assertEqual(replay.get_range(), (0, 3000), "The whole game should be replayable")
+            result = replay.seek()
+            self.assertEqual(result["tick"], 3000, "The replay should reach the last tick")
+            self.assertEqual(state(replay.get_game_controller()), recorded, "The last tick should be the one of the recorded game")
+            result = replay.seek(1500)
+            self.assertEqual(result["ticks"], 500, "Seeking backward should start from the nearest keyframe")
+            self.assertEqual(state(replay.get_game_controller()), state(play(1500)), "A tick between two keyframes should be the one of the recorded game")
+            result = replay.seek(2200)
+            self.assertEqual(result["ticks"], 200, "Seeking forward should start from the nearest keyframe")
+            self.assertEqual(state(replay.get_game_controller()), state(play(2200)), "A tick after a keyframe should be the one of the recorded game")
+
+if __name__ == '__main__':
+    unittest.main()
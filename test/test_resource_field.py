@@ -0,0 +1,65 @@
+import gc
+import pickle
+import unittest
+from controller.interactions import Interactions
+from model.resources.gold import Gold
+from model.resources.wood import Wood
+from model.units.villager import Villager
+from util.coordinate import Coordinate
+from util.map import Map
+
+class TestResourceField(unittest.TestCase):
+    """Test cases for the resources kept in the resource field of a Map."""
+
+    def setUp(self):
+        """Set up a map with wood on the first row and gold on the second one."""
+        self.map = Map(10)
+        self.map.add_resources(Wood, [Coordinate(x, 0) for x in range(10)])
+        self.map.add_resources(Gold, [Coordinate(x, 1) for x in range(3)])
+
+    def test_read(self):
+        """Test that a tile gives a resource of its own, the same as long as it is used."""
+        wood = self.map.get(Coordinate(2, 0))
+        self.assertIsInstance(wood, Wood, "The tile should give a wood")
+        self.assertEqual(wood.get_coordinate(), Coordinate(2, 0), "The resource should know its tile")
+        self.assertEqual(wood.get_amount(), Wood().get_amount(), "The tile should have the full amount")
+        self.assertIs(self.map.get_xy(2, 0), wood, "A resource in use should be given again")
+        self.assertIsNot(self.map.get(Coordinate(3, 0)), wood, "Each tile should have its own resource")
+        self.assertIsInstance(self.map.get(Coordinate(1, 1)), Gold, "The type of each tile should be kept")
+        self.assertFalse(self.map.is_walkable_xy(2, 0), "A resource tile should not be walkable")
+        self.assertEqual(self.map.find_nearest_objects(Coordinate(9, 1), Gold, 1), [Coordinate(2, 1)], "The resources should be indexed")
+
+    def test_collect(self):
+        """Test that collecting a tile only changes the amount of this tile, even once its resource is dropped."""
+        wood = self.map.get(Coordinate(2, 0))
+        self.assertEqual(wood.collect(30), 30, "The amount should be collected")
+        del wood
+        gc.collect()
+        self.assertEqual(self.map.get(Coordinate(2, 0)).get_amount(), Wood().get_amount() - 30, "The amount should be kept by the field")
+        self.assertEqual(self.map.get(Coordinate(3, 0)).get_amount(), Wood().get_amount(), "The other tiles should keep their amount")
+
+    def test_deplete(self):
+        """Test that a villager collecting a tile until it is empty removes it from the map."""
+        villager = Villager()
+        interactions = Interactions(self.map)
+        interactions.place_object(villager, Coordinate(5, 1))
+        for _ in range(Wood().get_amount() + 1):
+            if self.map.get(Coordinate(5, 0)) is None:
+                break
+            interactions.collect_resource(villager, Coordinate(5, 0), 1)
+            villager.empty_resource()
+        self.assertIsNone(self.map.get(Coordinate(5, 0)), "An empty resource should be removed")
+        self.assertTrue(self.map.is_walkable_xy(5, 0), "The tile of an empty resource should be walkable")
+        self.assertIsInstance(self.map.get(Coordinate(4, 0)), Wood, "The other tiles should be kept")
+
+    def test_copies(self):
+        """Test that the amounts are kept by the pickled maps and the captures, and that the views give the shared resources."""
+        self.map.get(Coordinate(0, 0)).collect(10)
+        for copy in (pickle.loads(pickle.dumps(self.map)), self.map.capture()):
+            self.assertEqual(copy.get(Coordinate(0, 0)).get_amount(), Wood().get_amount() - 10, "The amount should be copied")
+            copy.get(Coordinate(0, 0)).collect(10)
+        self.assertEqual(self.map.get(Coordinate(0, 0)).get_amount(), Wood().get_amount() - 10, "The copies should not change the map")
+        self.assertEqual(len({id(object) for object in self.map.get_map().values()}), 2, "The views should give one shared resource per type")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import lzma
+import os
+import tempfile
+import unittest
+from controller.command_scheduler import CommandScheduler
+from controller.game_controller import GameController
+from controller.headless_controller import HeadlessController
+from util.coordinate import Coordinate
+from util.save_file import SaveFile
+from test.game_state import play, state
+
+class TestSaveFile(unittest.TestCase):
+    """Test cases for the SaveFile class."""
+
+    def test_round_trip(self):
+        """Test that a saved game is read back as it was, with every compression."""
+        game_controller = play(300)
+        save = game_controller.capture_save()
+        with tempfile.TemporaryDirectory() as directory:
+            for compression in (SaveFile.RAW, SaveFile.ZLIB, SaveFile.LZMA):
+                path = os.path.join(directory, f"{compression}{SaveFile.EXTENSION}")
+                save.write(path, compression)
+                game = SaveFile.read(path)
+                self.assertEqual(str(game['map']), str(game_controller.get_map()), "The map should be read back")
+                self.assertEqual(game['command_list'].get_now(), 300, "The pending commands should be read back")
+                self.assertEqual(game['settings'].seed, 5, "The settings should be read back")
+                self.assertIs(game['players'][0].get_ai().get_map_known(), game['map'], "The references to the map should point to the new map")
+            self.assertEqual(SaveFile.read_header(path)["tick"], 300, "The header should be read alone")
+            self.assertTrue(all(name.endswith(SaveFile.EXTENSION) for name in os.listdir(directory)), "No temporary file should be left")
+
+    def test_header(self):
+        """Test that the header and the thumbnail describe the saved game."""
+        game_controller = play(300)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, f"game{SaveFile.EXTENSION}")
+            game_controller.capture_save().write(path)
+            header = SaveFile.read_header(path)
+            width, letters, owners = SaveFile.read_thumbnail(path)
+        players = game_controller.get_players()
+        self.assertEqual(header["resources"], [{type(resource).__name__: amount for resource, amount in player.get_resources().items()} for player in players], "The header should give the resources of the players")
+        self.assertEqual(header["units"], [len(player.get_units()) for player in players], "The header should give the units of the players")
+        self.assertEqual(width, SaveFile.THUMBNAIL_SIZE, "The thumbnail should have its size")
+        coordinate, size = next(iter(players[0].get_buildings())).get_coordinate(), game_controller.get_map().get_size()
+        self.assertEqual(owners[coordinate.get_y() * width // size * width + coordinate.get_x() * width // size], 1, "The thumbnail should show the buildings of the players")
+        self.assertIn(ord("W"), letters, "The thumbnail should show the resources")
+
+    def test_resume(self):
+        """Test that a loaded game goes on as the game it was saved from."""
+        game_controller = play(300)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, f"game{SaveFile.EXTENSION}")
+            game_controller.capture_save().write(path)
+            game = SaveFile.read(path)
+        loaded = GameController(HeadlessController(game['settings']), True)
+        loaded.load_game(game['map'], game['players'], game['command_list'])
+        before = state(game_controller)
+        for tick in range(1200):
+            for controller in (game_controller, loaded):
+                if tick % 60 == 0:
+                    controller.get_ai_controller().step()
+                controller.step()
+        self.assertNotEqual(state(game_controller), before, "The game should have gone on")
+        self.assertEqual(state(loaded), state(game_controller), "The loaded game should go on the same way")
+
+    def test_read_pickle(self):
+        """Test that a game pickled by the previous versions, after 600 ticks of a seeded game, is loaded and goes on."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "game.pkl")
+            with lzma.open(os.path.join(os.path.dirname(__file__), "data", "legacy_game.pkl.xz")) as source, open(path, 'wb') as file:
+                file.write(source.read())
+            game = SaveFile.read_pickle(path)
+        map, commands = game['map'], game['command_list']
+        self.assertIsInstance(commands, CommandScheduler, "The pending commands should be in a scheduler")
+        self.assertEqual(len(commands), 3, "The pending commands should be kept")
+        for player in game['players']:
+            self.assertIs(player.get_command_manager().get_command_list(), commands, "The players should push their commands to the scheduler")
+            for entity in list(player.get_units()) + list(player.get_buildings()):
+                self.assertIs(map.get(entity.get_coordinate()), entity, "The entities should be on the grid")
+        self.assertIsNotNone(map.path_finding(Coordinate(0, 0), Coordinate(10, 10)), "The map should find paths on its grid")
+        loaded = GameController(HeadlessController(game['settings']), True)
+        loaded.load_game(map, game['players'], commands)
+        before = state(loaded)
+        for tick in range(1200):
+            if tick % 60 == 0:
+                loaded.get_ai_controller().step()
+            loaded.step()
+        self.assertNotEqual(state(loaded), before, "The loaded game should go on")
+
+    def test_not_a_save(self):
+        """Test that a file which is not a save is rejected."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, f"game{SaveFile.EXTENSION}")
+            with open(path, 'wb') as file:
+                file.write(b"not a saved game")
+            with self.assertRaises(ValueError):
+                SaveFile.read(path)
+
+if __name__ == '__main__':
+    unittest.main()
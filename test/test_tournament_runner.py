@@ -0,0 +1,30 @@
+import unittest
+from controller.tournament_runner import TournamentRunner
+from util.settings import Settings
+
+class TestTournamentRunner(unittest.TestCase):
+    """Test cases for the TournamentRunner class."""
+
+    def test_summarize(self):
+        """Test that the wins, draws, lengths and curves of the games are summed up."""
+        games = [
+            {"winner": "Player 1", "ticks": 100, "players": ["Player 1", "Player 2"], "curves": [[{"Wood": 10, "tick": 0}, {"Wood": 20, "tick": 50}], [{"Wood": 0, "tick": 0}]]},
+            {"winner": None, "ticks": 300, "players": ["Player 1", "Player 2"], "curves": [[{"Wood": 30, "tick": 0}], [{"Wood": 4, "tick": 0}]]},
+        ]
+        summary = TournamentRunner.summarize(games)
+        self.assertEqual(summary["wins"], {"Player 1": 1, "Player 2": 0}, "The wins should be counted")
+        self.assertEqual(summary["win_rates"]["Player 1"], 0.5, "The win rate should be computed")
+        self.assertEqual(summary["draws"], 1, "The draws should be counted")
+        self.assertEqual(summary["mean_ticks"], 200, "The mean length should be computed")
+        self.assertEqual(summary["mean_curves"][0], [{"Wood": 20, "tick": 0}, {"Wood": 25, "tick": 50}], "A short game should count with its last sample")
+
+    def test_run_in_processes(self):
+        """Test that games played in worker processes give the same results as in the current process."""
+        in_processes = TournamentRunner(Settings(), 120, [3, 8], 60, 2).run([1, 2])
+        in_process = TournamentRunner(Settings(), 120, [3, 8], 60, 1).run([1, 2])
+        self.assertEqual(in_processes["games"], 2, "Both games should be played")
+        self.assertEqual([game["seed"] for game in in_processes["results"]], [1, 2], "The results should follow the seeds")
+        self.assertEqual(in_processes["mean_curves"], in_process["mean_curves"], "The games should not depend on the process playing them")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+import argparse
+import json
+import os
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+from controller.tournament_runner import TournamentRunner
+from util.settings import Settings
+from util.state_manager import FPS, MapSize, MapType, StartingCondition
+
+"""
+Play many seeded AI versus AI games in parallel, one game per core, and print the win rates and game lengths.
+
+Example: python tournament.py --games 32 --map-size MEDIUM --unit-differences 5 10 --output tournament.json
+"""
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a tournament of headless AI versus AI games.")
+    parser.add_argument("--games", type=int, default=8, help="Number of games to play.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the first game, the next games use the following seeds.")
+    parser.add_argument("--ticks", type=int, default=36000, help="Maximum number of ticks of a game.")
+    parser.add_argument("--map-size", choices=[size.name for size in MapSize], default=MapSize.SMALL.name, help="Size of the map.")
+    parser.add_argument("--map-type", choices=[map_type.name for map_type in MapType], default=MapType.RICH.name, help="Type of the map.")
+    parser.add_argument("--starting-condition", choices=[condition.name for condition in StartingCondition], default=StartingCondition.LEAN.name, help="Starting resources of the players.")
+    parser.add_argument("--fps", choices=[fps.name for fps in FPS], default=FPS.FPS_60.name, help="Ticks per second of game time.")
+    parser.add_argument("--unit-differences", type=int, nargs="+", default=None, help="Unit difference of the strategy of each player.")
+    parser.add_argument("--sample-interval", type=int, default=600, help="Ticks between two samples of the resource curves.")
+    parser.add_argument("--workers", type=int, default=None, help="Number of processes, one per core by default.")
+    parser.add_argument("--map-cache", type=str, default=None, help="Directory where the seeded maps are cached, to reuse them in the next runs.")
+    parser.add_argument("--output", type=str, default=None, help="File where the summary and the results are written as JSON.")
+    arguments = parser.parse_args()
+
+    settings = Settings()
+    settings.map_size = MapSize[arguments.map_size]
+    settings.map_type = MapType[arguments.map_type]
+    settings.starting_condition = StartingCondition[arguments.starting_condition]
+    settings.fps = FPS[arguments.fps]
+
+    runner = TournamentRunner(settings, arguments.ticks, arguments.unit_differences, arguments.sample_interval, arguments.workers, arguments.map_cache)
+    summary = runner.run(list(range(arguments.seed, arguments.seed + arguments.games)))
+    print(f"{summary['games']} games, {summary['draws']} draws, {summary['mean_ticks']:.0f} ticks per game on average")
+    for name, rate in summary["win_rates"].items():
+        print(f"  {name}: {summary['wins'][name]} wins ({rate:.0%})")
+    if arguments.output:
+        with open(arguments.output, "w") as file:
+            json.dump(summary, file, indent=4)
@@ -1,6 +1,14 @@
 class Coordinate:
-    """Used to represent the coordinates of the tiles in the grid."""
-    
+    """
+    Used to represent the coordinates of the tiles in the grid.
+
+    The coordinates are slotted and cache their hash, as the map, the path finders and the AI create and hash a lot of them.
+    The coordinates of the tiles of the largest map can be shared with ``Coordinate.of``: the shared coordinates cannot be modified.
+    """
+    __slots__ = ('__x', '__y', '__hash')
+    INTERN_SIZE = 480
+    __interned: list['Coordinate'] = None
+
     def __init__(self, x: int, y: int):
         """
         Initialize a Coordinate object.
@@ -12,7 +20,51 @@ class Coordinate:
         """
         self.__x = x
         self.__y = y
-    
+        self.__hash = None
+
+    @staticmethod
+    def of(x: int, y: int) -> 'Coordinate':
+        """
+        Get the shared coordinate of a tile, or a new coordinate if it is out of the intern table.
+
+        :param x: The x coordinate.
+        :type x: int
+        :param y: The y coordinate.
+        :type y: int
+        :return: The coordinate, which must not be modified.
+        :rtype: Coordinate
+        """
+        size = Coordinate.INTERN_SIZE
+        if 0 <= x < size and 0 <= y < size:
+            interned = Coordinate.__interned
+            if interned is None:
+                interned = Coordinate.__interned = [None] * (size * size)
+            coordinate = interned[y * size + x]
+            if coordinate is None:
+                coordinate = interned[y * size + x] = _InternedCoordinate(x, y)
+            return coordinate
+        return Coordinate(x, y)
+
+    def __reduce__(self) -> tuple:
+        """
+        Pickle the coordinate as its constructor call.
+
+        :return: The function to call and its arguments.
+        :rtype: tuple
+        """
+        return (Coordinate, (self.__x, self.__y))
+
+    def __setstate__(self, state: dict) -> None:
+        """
+        Restore a coordinate pickled before the coordinates were slotted.
+
+        :param state: The attributes of the coordinate.
+        :type state: dict
+        """
+        self.__x = state['_Coordinate__x']
+        self.__y = state['_Coordinate__y']
+        self.__hash = None
+
     def set_x(self, x: int) -> None:
         """
         Setter method for the x coordinate.
@@ -21,6 +73,7 @@ class Coordinate:
         :type x: int
         """
         self.__x = x
+        self.__hash = None
     
     def set_y(self, y: int) -> None:
         """
@@ -30,6 +83,7 @@ class Coordinate:
         :type y: int
         """
         self.__y = y
+        self.__hash = None
     
     def get_x(self) -> int:
         """
@@ -60,7 +114,7 @@ class Coordinate:
         """
         if not isinstance(other, Coordinate):
             return None
-        return ((self.get_x() - other.get_x())**2 + (self.get_y() - other.get_y())**2)**0.5
+        return ((self.__x - other.__x)**2 + (self.__y - other.__y)**2)**0.5
     
     def is_in_range(self, other: 'Coordinate', distance_range: float) -> bool:
         """
@@ -92,12 +146,15 @@ class Coordinate:
     
     def __hash__(self) -> int:
         """
-        Hash for the coordinates to be used in dictionaries.
+        Hash for the coordinates to be used in dictionaries, computed once.
 
         :return: The hash value.
         :rtype: int
         """
-        return hash((self.get_x(), self.get_y()))
+        value = self.__hash
+        if value is None:
+            value = self.__hash = hash((self.__x, self.__y))
+        return value
     
     def __eq__(self, other: object) -> bool:
         """
@@ -108,9 +165,11 @@ class Coordinate:
         :return: True if the coordinates are equal, False otherwise.
         :rtype: bool
         """
+        if self is other:
+            return True
         if not isinstance(other, Coordinate):
             return False
-        return self.get_x() == other.get_x() and self.get_y() == other.get_y()
+        return self.__x == other.__x and self.__y == other.__y
     
     def __lt__(self, other: 'Coordinate') -> bool:
         """
@@ -127,7 +186,7 @@ class Coordinate:
         """
         if not isinstance(other, Coordinate):
             return False
-        return self.get_x() < other.get_x() and self.get_y() < other.get_y()
+        return self.__x < other.__x and self.__y < other.__y
     
     def __le__(self, other: 'Coordinate') -> bool:
         """
@@ -144,7 +203,7 @@ class Coordinate:
         """
         if not isinstance(other, Coordinate):
             return False
-        return self.get_x() <= other.get_x() and self.get_y() <= other.get_y()
+        return self.__x <= other.__x and self.__y <= other.__y
 
     def __gt__(self, other: 'Coordinate') -> bool:
         """
@@ -161,7 +220,7 @@ class Coordinate:
         """
         if not isinstance(other, Coordinate):
             return False
-        return self.get_x() > other.get_x() and self.get_y() > other.get_y()
+        return self.__x > other.__x and self.__y > other.__y
     
     def __ge__(self, other: 'Coordinate') -> bool:
         """
@@ -178,7 +237,7 @@ class Coordinate:
         """
         if not isinstance(other, Coordinate):
             return False
-        return self.get_x() >= other.get_x() and self.get_y() >= other.get_y()
+        return self.__x >= other.__x and self.__y >= other.__y
 
     def __add__(self, other: 'Coordinate') -> 'Coordinate':
         """
@@ -190,10 +249,10 @@ class Coordinate:
         :rtype: Coordinate
         """
         if isinstance(other, int):
-            return Coordinate(self.get_x() + other, self.get_y() + other)
+            return Coordinate(self.__x + other, self.__y + other)
         if not isinstance(other, Coordinate):
             return None
-        return Coordinate(self.get_x() + other.get_x(), self.get_y() + other.get_y())
+        return Coordinate(self.__x + other.__x, self.__y + other.__y)
     
     def __sub__(self, other: 'Coordinate') -> 'Coordinate':
         """
@@ -205,10 +264,10 @@ class Coordinate:
         :rtype: Coordinate
         """
         if isinstance(other, int):
-            return Coordinate(self.get_x() - other, self.get_y() - other)
+            return Coordinate(self.__x - other, self.__y - other)
         if not isinstance(other, Coordinate):
             return None
-        return Coordinate(self.get_x() - other.get_x(), self.get_y() - other.get_y())
+        return Coordinate(self.__x - other.__x, self.__y - other.__y)
     
     def __mul__(self, other: 'Coordinate') -> 'Coordinate':
         """
@@ -220,10 +279,10 @@ class Coordinate:
         :rtype: Coordinate
         """
         if isinstance(other, int):
-            return Coordinate(self.get_x() * other, self.get_y() * other)
+            return Coordinate(self.__x * other, self.__y * other)
         if not isinstance(other, Coordinate):
             return None
-        return Coordinate(self.get_x() * other.get_x(), self.get_y() * other.get_y())
+        return Coordinate(self.__x * other.__x, self.__y * other.__y)
     
     def __truediv__(self, other: 'Coordinate') -> 'Coordinate':
         """
@@ -235,10 +294,10 @@ class Coordinate:
         :rtype: Coordinate
         """
         if isinstance(other, int):
-            return Coordinate(self.get_x() / other, self.get_y() / other)
+            return Coordinate(self.__x / other, self.__y / other)
         if not isinstance(other, Coordinate):
             return None
-        return Coordinate(self.get_x() / other.get_x(), self.get_y() / other.get_y())
+        return Coordinate(self.__x / other.__x, self.__y / other.__y)
     
     def __floordiv__(self, other: 'Coordinate') -> 'Coordinate':
         """
@@ -250,10 +309,10 @@ class Coordinate:
         :rtype: Coordinate
         """
         if isinstance(other, int):
-            return Coordinate(self.get_x() // other, self.get_y() // other)
+            return Coordinate(self.__x // other, self.__y // other)
         if not isinstance(other, Coordinate):
             return None
-        return Coordinate(self.get_x() // other.get_x(), self.get_y() // other.get_y())
+        return Coordinate(self.__x // other.__x, self.__y // other.__y)
     
     def __mod__(self, other: 'Coordinate') -> 'Coordinate':
         """
@@ -265,10 +324,10 @@ class Coordinate:
         :rtype: Coordinate
         """
         if isinstance(other, int):
-            return Coordinate(self.get_x() % other, self.get_y() % other)
+            return Coordinate(self.__x % other, self.__y % other)
         if not isinstance(other, Coordinate):
             return None
-        return Coordinate(self.get_x() % other.get_x(), self.get_y() % other.get_y())
+        return Coordinate(self.__x % other.__x, self.__y % other.__y)
     
     def __pow__(self, other: 'Coordinate') -> 'Coordinate':
         """
@@ -280,10 +339,10 @@ class Coordinate:
         :rtype: Coordinate
         """
         if isinstance(other, int):
-            return Coordinate(self.get_x() ** other, self.get_y() ** other)
+            return Coordinate(self.__x ** other, self.__y ** other)
         if not isinstance(other, Coordinate):
             return None
-        return Coordinate(self.get_x() ** other.get_x(), self.get_y() ** other.get_y())
+        return Coordinate(self.__x ** other.__x, self.__y ** other.__y)
     
     def __lshift__(self, other: 'Coordinate') -> 'Coordinate':
         """
@@ -295,10 +354,10 @@ class Coordinate:
         :rtype: Coordinate
         """
         if isinstance(other, int):
-            return Coordinate(self.get_x() << other, self.get_y() << other)
+            return Coordinate(self.__x << other, self.__y << other)
         if not isinstance(other, Coordinate):
             return None
-        return Coordinate(self.get_x() << other.get_x(), self.get_y() << other.get_y())
+        return Coordinate(self.__x << other.__x, self.__y << other.__y)
     
     def __rshift__(self, other: 'Coordinate') -> 'Coordinate':
         """
@@ -310,10 +369,10 @@ class Coordinate:
         :rtype: Coordinate
         """
         if isinstance(other, int):
-            return Coordinate(self.get_x() >> other, self.get_y() >> other)
+            return Coordinate(self.__x >> other, self.__y >> other)
         if not isinstance(other, Coordinate):
             return None
-        return Coordinate(self.get_x() >> other.get_x(), self.get_y() >> other.get_y())
+        return Coordinate(self.__x >> other.__x, self.__y >> other.__y)
     
     def __and__(self, other: 'Coordinate') -> 'Coordinate':
         """
@@ -325,10 +384,10 @@ class Coordinate:
         :rtype: Coordinate
         """
         if isinstance(other, int):
-            return Coordinate(self.get_x() & other, self.get_y() & other)
+            return Coordinate(self.__x & other, self.__y & other)
         if not isinstance(other, Coordinate):
             return None
-        return Coordinate(self.get_x() & other.get_x(), self.get_y() & other.get_y())
+        return Coordinate(self.__x & other.__x, self.__y & other.__y)
     
     def __xor__(self, other: 'Coordinate') -> 'Coordinate':
         """
@@ -340,10 +399,10 @@ class Coordinate:
         :rtype: Coordinate
         """
         if isinstance(other, int):
-            return Coordinate(self.get_x() ^ other, self.get_y() ^ other)
+            return Coordinate(self.__x ^ other, self.__y ^ other)
         if not isinstance(other, Coordinate):
             return None
-        return Coordinate(self.get_x() ^ other.get_x(), self.get_y() ^ other.get_y())
+        return Coordinate(self.__x ^ other.__x, self.__y ^ other.__y)
     
     def __or__(self, other: 'Coordinate') -> 'Coordinate':
         """
@@ -355,10 +414,10 @@ class Coordinate:
         :rtype: Coordinate
         """
         if isinstance(other, int):
-            return Coordinate(self.get_x() | other, self.get_y() | other)
+            return Coordinate(self.__x | other, self.__y | other)
         if not isinstance(other, Coordinate):
             return None
-        return Coordinate(self.get_x() | other.get_x(), self.get_y() | other.get_y())
+        return Coordinate(self.__x | other.__x, self.__y | other.__y)
     
     def __neg__(self) -> 'Coordinate':
         """
@@ -367,7 +426,7 @@ class Coordinate:
         :return: The negated coordinate.
         :rtype: Coordinate
         """
-        return Coordinate(-self.get_x(), -self.get_y())
+        return Coordinate(-self.__x, -self.__y)
     
     def __pos__(self) -> 'Coordinate':
         """
@@ -376,7 +435,7 @@ class Coordinate:
         :return: The positive coordinate.
         :rtype: Coordinate
         """
-        return Coordinate(+self.get_x(), +self.get_y())
+        return Coordinate(+self.__x, +self.__y)
     
     def __abs__(self) -> 'Coordinate':
         """
@@ -385,7 +444,7 @@ class Coordinate:
         :return: The absolute coordinate.
         :rtype: Coordinate
         """
-        return Coordinate(abs(self.get_x()), abs(self.get_y()))
+        return Coordinate(abs(self.__x), abs(self.__y))
     
     def __invert__(self) -> 'Coordinate':
         """
@@ -394,7 +453,7 @@ class Coordinate:
         :return: The inverted coordinate.
         :rtype: Coordinate
         """
-        return Coordinate(~self.get_x(), ~self.get_y())
+        return Coordinate(~self.__x, ~self.__y)
     
     def __str__(self) -> str:
         """
@@ -403,7 +462,7 @@ class Coordinate:
         :return: The string representation.
         :rtype: str
         """
-        return f"({self.get_x()},{self.get_y()})"
+        return f"({self.__x},{self.__y})"
 
     def __repr__(self) -> str:
         """
@@ -412,4 +471,33 @@ class Coordinate:
         :return: The representation.
         :rtype: str
         """
-        return f"Coordinate({self.get_x()}, {self.get_y()})"
\ No newline at end of file
+        return f"Coordinate({self.__x}, {self.__y})"
+
+class _InternedCoordinate(Coordinate):
+    """A coordinate of the intern table, shared by all its users so it cannot be modified."""
+    __slots__ = ()
+
+    def set_x(self, x: int) -> None:
+        """
+        Refuse to modify a shared coordinate.
+
+        :raises AttributeError: Always.
+        """
+        raise AttributeError("A shared coordinate cannot be modified.")
+
+    def set_y(self, y: int) -> None:
+        """
+        Refuse to modify a shared coordinate.
+
+        :raises AttributeError: Always.
+        """
+        raise AttributeError("A shared coordinate cannot be modified.")
+
+    def __reduce__(self) -> tuple:
+        """
+        Pickle the coordinate so that it is shared again when it is loaded.
+
+        :return: The function to call and its arguments.
+        :rtype: tuple
+        """
+        return (Coordinate.of, (self.get_x(), self.get_y()))
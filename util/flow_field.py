@@ -0,0 +1,168 @@
+import heapq
+from util.coordinate import Coordinate
+from util.path_finder import PathFinder, SQRT2
+from model.units.unit import Unit
+import typing
+if typing.TYPE_CHECKING:
+    from util.map import Map
+
+"""
+This file contains the FlowField class which guides all the units heading to the same area of the map.
+"""
+
+class FlowField:
+    """
+    Distance field (Dijkstra) from a target, shared by all the units heading to the same region of the map.
+
+    The field is expanded lazily: a tile is only settled when a unit standing on it asks for its next step,
+    so an army costs at most one search of the map instead of one search per unit.
+    Like the hierarchical path finder, the field only knows the static obstacles and units are passable,
+    but a step is only given toward a tile which is free at the time of the request.
+    """
+    REGION_SIZE = 8
+    MOVES = tuple((dx, dy, 1.0) for dx, dy in PathFinder.STRAIGHT) + tuple((dx, dy, SQRT2) for dx, dy in PathFinder.DIAGONAL)
+
+    def __init__(self, map: 'Map', walkability: bytearray, target: Coordinate) -> None:
+        """
+        Create a distance field toward a target.
+
+        :param map: The map of the field.
+        :type map: Map
+        :param walkability: The walkability bitmap of the map, indexed by ``y * size + x``.
+        :type walkability: bytearray
+        :param target: The target of the field, it can be occupied.
+        :type target: Coordinate
+        """
+        self.__map: 'Map' = map
+        self.__walkability = walkability
+        self.__size: int = map.get_size()
+        self.__target: Coordinate = target
+        target_index = target.get_y() * self.__size + target.get_x()
+        self.__costs: dict[int, float] = {target_index: 0.0}
+        self.__distances: dict[int, float] = {}
+        self.__open: list[tuple[float, int]] = [(0.0, target_index)]
+
+    @staticmethod
+    def region(coordinate: Coordinate) -> tuple[int, int]:
+        """
+        Get the region of a coordinate: the targets of a region share the same field.
+
+        :param coordinate: The coordinate.
+        :type coordinate: Coordinate
+        :return: The region of the coordinate.
+        :rtype: tuple[int, int]
+        """
+        return (coordinate.get_x() // FlowField.REGION_SIZE, coordinate.get_y() // FlowField.REGION_SIZE)
+
+    def get_target(self) -> Coordinate:
+        """
+        Get the target of the field.
+
+        :return: The target of the field.
+        :rtype: Coordinate
+        """
+        return self.__target
+
+    def get_settled_count(self) -> int:
+        """
+        Get the number of tiles whose distance is known.
+
+        :return: The number of settled tiles.
+        :rtype: int
+        """
+        return len(self.__distances)
+
+    def reaches(self, coordinate: Coordinate, size: int = 1) -> bool:
+        """
+        Check if the search has reached a square area of the map or its border, in which case a change in this area makes the field wrong.
+        The border is checked as the search never enters a blocked tile, but has reached it if it reached a neighbour.
+
+        :param coordinate: The top left coordinate of the area.
+        :type coordinate: Coordinate
+        :param size: The size of the area.
+        :type size: int
+        :return: True if a tile of the area was reached, False otherwise.
+        :rtype: bool
+        """
+        for y in range(max(coordinate.get_y() - 1, 0), min(coordinate.get_y() + size + 1, self.__size)):
+            for x in range(max(coordinate.get_x() - 1, 0), min(coordinate.get_x() + size + 1, self.__size)):
+                if y * self.__size + x in self.__costs:
+                    return True
+        return False
+
+    def distance(self, coordinate: Coordinate) -> float:
+        """
+        Get the distance from a tile to the target, expanding the field until the tile is settled.
+
+        :param coordinate: The coordinate of the tile.
+        :type coordinate: Coordinate
+        :return: The distance to the target, None if the target cannot be reached from the tile.
+        :rtype: float
+        """
+        if not (0 <= coordinate.get_x() < self.__size and 0 <= coordinate.get_y() < self.__size):
+            return None
+        return self.__settle(coordinate.get_y() * self.__size + coordinate.get_x())
+
+    def next_step(self, coordinate: Coordinate) -> Coordinate:
+        """
+        Get the free neighbour of a tile which is the closest to the target.
+
+        :param coordinate: The coordinate of the unit.
+        :type coordinate: Coordinate
+        :return: The coordinate of the next step, None if the target cannot be reached or every step toward it is taken.
+        :rtype: Coordinate
+        """
+        distance = self.distance(coordinate)
+        if distance is None:
+            return None
+        size = self.__size
+        best, best_distance = None, distance
+        for dx, dy, _ in FlowField.MOVES:
+            nx, ny = coordinate.get_x() + dx, coordinate.get_y() + dy
+            if nx < 0 or ny < 0 or nx >= size or ny >= size:
+                continue
+            neighbour = ny * size + nx
+            # Every tile closer than a settled tile is settled as well
+            neighbour_distance = self.__distances.get(neighbour)
+            if neighbour_distance is not None and neighbour_distance < best_distance and self.__walkability[neighbour]:
+                best, best_distance = neighbour, neighbour_distance
+        return Coordinate.of(best % size, best // size) if best is not None else None
+
+    def __is_passable(self, index: int) -> bool:
+        """
+        Check if a tile has no static obstacle: it is free or holds a unit.
+
+        :param index: The index of the tile.
+        :type index: int
+        :return: True if the tile is passable, False otherwise.
+        :rtype: bool
+        """
+        return self.__walkability[index] == 1 or isinstance(self.__map.view_xy(index % self.__size, index // self.__size), Unit)
+
+    def __settle(self, index: int) -> float:
+        """
+        Continue the search until a tile is settled or the search is over.
+
+        :param index: The index of the tile.
+        :type index: int
+        :return: The distance of the tile, None if it cannot be reached.
+        :rtype: float
+        """
+        size = self.__size
+        costs, distances, open_list = self.__costs, self.__distances, self.__open
+        while index not in distances and open_list:
+            cost, current = heapq.heappop(open_list)
+            if current in distances:
+                continue
+            distances[current] = cost
+            x, y = current % size, current // size
+            for dx, dy, step in FlowField.MOVES:
+                nx, ny = x + dx, y + dy
+                if nx < 0 or ny < 0 or nx >= size or ny >= size:
+                    continue
+                neighbour = ny * size + nx
+                new_cost = cost + step
+                if new_cost < costs.get(neighbour, float('inf')) and neighbour not in distances and self.__is_passable(neighbour):
+                    costs[neighbour] = new_cost
+                    heapq.heappush(open_list, (new_cost, neighbour))
+        return distances.get(index)
@@ -0,0 +1,374 @@
+import heapq
+from util.coordinate import Coordinate
+from util.path_finder import PathFinder, SQRT2
+from model.units.unit import Unit
+import typing
+if typing.TYPE_CHECKING:
+    from util.map import Map
+
+"""
+This file contains the HierarchicalPathFinder class which searches long paths on big maps with HPA*.
+"""
+
+class HierarchicalPathFinder:
+    """
+    Hierarchical path finder (HPA*) for the medium and large maps.
+
+    The map is split into square clusters. The free tiles facing each other on the border of two clusters
+    form entrances, and one or two transition tiles are taken on each side of every entrance.
+    A search first walks the graph of the transitions, using the distances between the transitions of a cluster,
+    then refines each step of the abstract path with an A* bounded to a single cluster.
+
+    The graph only knows the static obstacles: units are considered walkable as they keep moving,
+    and are avoided by the refinement. The graph of a cluster is built when a search first needs it,
+    and is dropped when an object is added or removed in it (or on the border of a neighbouring cluster).
+    """
+    CLUSTER_SIZE = 16
+    MAX_ENTRANCE = 6
+    MIN_MAP_SIZE = 240
+    MOVES = tuple((dx, dy, 1.0) for dx, dy in PathFinder.STRAIGHT) + tuple((dx, dy, SQRT2) for dx, dy in PathFinder.DIAGONAL)
+
+    def __init__(self, map: 'Map', walkability: bytearray, path_finder: PathFinder, cluster_size: int = CLUSTER_SIZE) -> None:
+        """
+        Create a hierarchical path finder for a map.
+
+        :param map: The map to search on.
+        :type map: Map
+        :param walkability: The walkability bitmap of the map, indexed by ``y * size + x``.
+        :type walkability: bytearray
+        :param path_finder: The path finder used to refine the abstract paths.
+        :type path_finder: PathFinder
+        :param cluster_size: The size of the clusters.
+        :type cluster_size: int
+        """
+        self.__map: 'Map' = map
+        self.__walkability = walkability
+        self.__path_finder: PathFinder = path_finder
+        self.__size: int = map.get_size()
+        self.__cluster_size: int = cluster_size
+        self.__clusters_per_row: int = -(-self.__size // cluster_size)
+        self.__edges: dict[int, dict[int, list[tuple[int, float]]]] = {}
+        self.__transitions: dict[int, dict[int, list[int]]] = {}
+        self.__blocked_tiles: dict[int, set[int]] = {}
+
+    def __setstate__(self, state: dict) -> None:
+        """
+        Restore the state of a pickled path finder.
+
+        :param state: The state of the path finder.
+        :type state: dict
+        """
+        self.__dict__.update(state)
+        if '_HierarchicalPathFinder__blocked_tiles' not in state:
+            # Pickled before the blocked tiles were kept: the clusters are built again
+            self.__blocked_tiles = {}
+            self.clear()
+
+    def get_cluster_size(self) -> int:
+        """
+        Get the size of the clusters.
+
+        :return: The size of the clusters.
+        :rtype: int
+        """
+        return self.__cluster_size
+
+    def is_built(self, x: int, y: int) -> bool:
+        """
+        Check if the graph of the cluster containing a tile is built.
+
+        :param x: The x coordinate of the tile.
+        :type x: int
+        :param y: The y coordinate of the tile.
+        :type y: int
+        :return: True if the graph of the cluster is built, False otherwise.
+        :rtype: bool
+        """
+        return self.__cluster(y * self.__size + x) in self.__edges
+
+    def invalidate(self, coordinate: Coordinate, size: int = 1) -> None:
+        """
+        Drop the graph of the clusters touched by a change on a square area of the map.
+        A change on the border of a cluster also drops the neighbouring cluster, as their entrances change.
+
+        :param coordinate: The top left coordinate of the area.
+        :type coordinate: Coordinate
+        :param size: The size of the area.
+        :type size: int
+        """
+        clusters = set()
+        for y in range(max(coordinate.get_y(), 0), min(coordinate.get_y() + size, self.__size)):
+            for x in range(max(coordinate.get_x(), 0), min(coordinate.get_x() + size, self.__size)):
+                for nx, ny in ((x, y), (x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1)):
+                    if 0 <= nx < self.__size and 0 <= ny < self.__size:
+                        clusters.add(self.__cluster(ny * self.__size + nx))
+        for cluster in clusters:
+            self.__edges.pop(cluster, None)
+            self.__transitions.pop(cluster, None)
+            self.__blocked_tiles.pop(cluster, None)
+
+    def clear(self) -> None:
+        """
+        Drop the graph of every cluster.
+        """
+        self.__edges.clear()
+        self.__transitions.clear()
+        self.__blocked_tiles.clear()
+
+    def find_path(self, start: Coordinate, end: Coordinate) -> list[Coordinate]:
+        """
+        Find a path with diagonal moves to go from start to end.
+
+        :param start: The starting coordinate.
+        :type start: Coordinate
+        :param end: The ending coordinate.
+        :type end: Coordinate
+        :return: The coordinates to walk through, without the start and ending with the end. Empty if there is no path.
+        :rtype: list[Coordinate]
+        """
+        size = self.__size
+        if not (0 <= start.get_x() < size and 0 <= start.get_y() < size and 0 <= end.get_x() < size and 0 <= end.get_y() < size):
+            return []
+        start_index = start.get_y() * size + start.get_x()
+        end_index = end.get_y() * size + end.get_x()
+        if self.__cluster(start_index) != self.__cluster(end_index):
+            abstract = self.__abstract_path(start_index, end_index)
+            if abstract:
+                path = self.__refine(abstract)
+                if path is not None:
+                    return path
+        return self.__path_finder.find_path(start, end)
+
+    def __cluster(self, index: int) -> int:
+        """
+        Get the cluster containing a tile.
+
+        :param index: The index of the tile.
+        :type index: int
+        :return: The cluster of the tile.
+        :rtype: int
+        """
+        return (index // self.__size // self.__cluster_size) * self.__clusters_per_row + index % self.__size // self.__cluster_size
+
+    def __bounds(self, cluster: int) -> tuple[int, int, int, int]:
+        """
+        Get the area covered by a cluster.
+
+        :param cluster: The cluster.
+        :type cluster: int
+        :return: The (min x, min y, max x, max y) area of the cluster.
+        :rtype: tuple[int, int, int, int]
+        """
+        min_x = cluster % self.__clusters_per_row * self.__cluster_size
+        min_y = cluster // self.__clusters_per_row * self.__cluster_size
+        return (min_x, min_y, min(min_x + self.__cluster_size, self.__size) - 1, min(min_y + self.__cluster_size, self.__size) - 1)
+
+    def __is_passable(self, index: int) -> bool:
+        """
+        Check if a tile has no static obstacle: it is free or holds a unit.
+
+        :param index: The index of the tile.
+        :type index: int
+        :return: True if the tile is passable, False otherwise.
+        :rtype: bool
+        """
+        return self.__walkability[index] == 1 or isinstance(self.__map.view_xy(index % self.__size, index // self.__size), Unit)
+
+    def __blocked(self, cluster: int) -> set[int]:
+        """
+        Get the tiles of a cluster holding a static obstacle.
+
+        :param cluster: The cluster.
+        :type cluster: int
+        :return: The indexes of the blocked tiles.
+        :rtype: set[int]
+        """
+        size = self.__size
+        min_x, min_y, max_x, max_y = self.__bounds(cluster)
+        blocked = set()
+        for y in range(min_y, max_y + 1):
+            row = y * size
+            index = self.__walkability.find(0, row + min_x, row + max_x + 1)
+            while index != -1:
+                if not self.__is_passable(index):
+                    blocked.add(index)
+                index = self.__walkability.find(0, index + 1, row + max_x + 1)
+        return blocked
+
+    def __entrances(self, border: list[tuple[int, int]]) -> list[tuple[int, int]]:
+        """
+        Choose the transitions of a border: the middle of each entrance, or both of its ends if it is long.
+        The tiles are listed in the same order from both sides of the border, so that both clusters choose the same transitions.
+
+        :param border: The pairs of (inside, outside) tiles facing each other along the border.
+        :type border: list[tuple[int, int]]
+        :return: The chosen pairs of (inside, outside) tiles.
+        :rtype: list[tuple[int, int]]
+        """
+        transitions = []
+        entrance = []
+        for inside, outside in border + [(None, None)]:
+            if inside is not None and self.__is_passable(inside) and self.__is_passable(outside):
+                entrance.append((inside, outside))
+                continue
+            if len(entrance) > HierarchicalPathFinder.MAX_ENTRANCE:
+                transitions += [entrance[0], entrance[-1]]
+            elif entrance:
+                transitions.append(entrance[len(entrance) // 2])
+            entrance = []
+        return transitions
+
+    def __build(self, cluster: int) -> None:
+        """
+        Build the graph of a cluster if it is not built: its transitions, its blocked tiles and the distances between the transitions.
+
+        :param cluster: The cluster.
+        :type cluster: int
+        """
+        if cluster in self.__edges:
+            return
+        size = self.__size
+        min_x, min_y, max_x, max_y = self.__bounds(cluster)
+        borders = []
+        if min_x > 0:
+            borders.append([(y * size + min_x, y * size + min_x - 1) for y in range(min_y, max_y + 1)])
+        if max_x < size - 1:
+            borders.append([(y * size + max_x, y * size + max_x + 1) for y in range(min_y, max_y + 1)])
+        if min_y > 0:
+            borders.append([(min_y * size + x, (min_y - 1) * size + x) for x in range(min_x, max_x + 1)])
+        if max_y < size - 1:
+            borders.append([(max_y * size + x, (max_y + 1) * size + x) for x in range(min_x, max_x + 1)])
+        transitions: dict[int, list[int]] = {}
+        for border in borders:
+            for inside, outside in self.__entrances(border):
+                transitions.setdefault(inside, []).append(outside)
+        nodes = sorted(transitions)
+        self.__transitions[cluster] = transitions
+        blocked = self.__blocked_tiles[cluster] = self.__blocked(cluster)
+        edges: dict[int, list[tuple[int, float]]] = {node: [] for node in nodes}
+        for position, node in enumerate(nodes):
+            # The distances are symmetric: each pair of transitions is only searched once
+            for other, cost in self.__distances(node, cluster, set(nodes[position + 1:]), blocked).items():
+                edges[node].append((other, cost))
+                edges[other].append((node, cost))
+        self.__edges[cluster] = edges
+
+    def __distances(self, source: int, cluster: int, targets: set[int], blocked: set[int]) -> dict[int, float]:
+        """
+        Compute the distances from a tile to other tiles of its cluster, without leaving the cluster.
+
+        :param source: The index of the source tile, considered passable.
+        :type source: int
+        :param cluster: The cluster of the source tile.
+        :type cluster: int
+        :param targets: The indexes of the tiles to reach.
+        :type targets: set[int]
+        :param blocked: The indexes of the blocked tiles of the cluster.
+        :type blocked: set[int]
+        :return: The distance to each reachable target, except the source.
+        :rtype: dict[int, float]
+        """
+        size = self.__size
+        min_x, min_y, max_x, max_y = self.__bounds(cluster)
+        costs = {source: 0.0}
+        found = {}
+        remaining = len(targets - {source})
+        open_list = [(0.0, source)]
+        while open_list and remaining:
+            cost, current = heapq.heappop(open_list)
+            if cost > costs[current]:
+                continue
+            if current != source and current in targets:
+                found[current] = cost
+                remaining -= 1
+            x, y = current % size, current // size
+            for dx, dy, step in HierarchicalPathFinder.MOVES:
+                nx, ny = x + dx, y + dy
+                if nx < min_x or ny < min_y or nx > max_x or ny > max_y:
+                    continue
+                neighbour = ny * size + nx
+                new_cost = cost + step
+                if new_cost < costs.get(neighbour, float('inf')) and neighbour not in blocked:
+                    costs[neighbour] = new_cost
+                    heapq.heappush(open_list, (new_cost, neighbour))
+        return found
+
+    def __abstract_path(self, start_index: int, end_index: int) -> list[int]:
+        """
+        Search the path on the graph of the transitions, linking the start and the end to the transitions of their cluster.
+
+        :param start_index: The index of the start tile.
+        :type start_index: int
+        :param end_index: The index of the end tile.
+        :type end_index: int
+        :return: The indexes of the start, the transitions to go through and the end. Empty if there is no path.
+        :rtype: list[int]
+        """
+        size = self.__size
+        start_cluster, end_cluster = self.__cluster(start_index), self.__cluster(end_index)
+        self.__build(start_cluster)
+        self.__build(end_cluster)
+        start_edges = self.__distances(start_index, start_cluster, set(self.__transitions[start_cluster]), self.__blocked_tiles[start_cluster])
+        end_edges = self.__distances(end_index, end_cluster, set(self.__transitions[end_cluster]), self.__blocked_tiles[end_cluster])
+        if not start_edges and start_index not in self.__transitions[start_cluster] or not end_edges and end_index not in self.__transitions[end_cluster]:
+            return []
+        end_x, end_y = end_index % size, end_index // size
+        costs: dict[int, float] = {start_index: 0.0}
+        parents: dict[int, int] = {start_index: None}
+        closed: set[int] = set()
+        open_list = [(0.0, start_index)]
+        while open_list:
+            _, current = heapq.heappop(open_list)
+            if current == end_index:
+                path = []
+                while current is not None:
+                    path.append(current)
+                    current = parents[current]
+                path.reverse()
+                return path
+            if current in closed:
+                continue
+            closed.add(current)
+            cluster = self.__cluster(current)
+            self.__build(cluster)
+            neighbours = list(self.__edges[cluster].get(current, ()))
+            neighbours += [(outside, 1.0) for outside in self.__transitions[cluster].get(current, ())]
+            if current == start_index:
+                neighbours += start_edges.items()
+            if cluster == end_cluster and current in end_edges:
+                neighbours.append((end_index, end_edges[current]))
+            for neighbour, step in neighbours:
+                if neighbour in closed:
+                    continue
+                new_cost = costs[current] + step
+                if new_cost < costs.get(neighbour, float('inf')):
+                    costs[neighbour] = new_cost
+                    parents[neighbour] = current
+                    dx, dy = abs(neighbour % size - end_x), abs(neighbour // size - end_y)
+                    heapq.heappush(open_list, (new_cost + dx + dy + (SQRT2 - 2) * min(dx, dy), neighbour))
+        return []
+
+    def __refine(self, abstract: list[int]) -> list[Coordinate]:
+        """
+        Turn an abstract path into the tiles to walk through, with a bounded A* for each step inside a cluster.
+
+        :param abstract: The indexes of the start, the transitions and the end.
+        :type abstract: list[int]
+        :return: The coordinates to walk through, without the start. None if a step is blocked by a unit.
+        :rtype: list[Coordinate]
+        """
+        size = self.__size
+        path = []
+        for previous, current in zip(abstract, abstract[1:]):
+            coordinate = Coordinate.of(current % size, current // size)
+            if current != abstract[-1] and not self.__walkability[current]:
+                return None
+            cluster = self.__cluster(previous)
+            if cluster != self.__cluster(current):
+                path.append(coordinate)
+                continue
+            segment = self.__path_finder.find_path(Coordinate.of(previous % size, previous // size), coordinate, bounds=self.__bounds(cluster))
+            if not segment:
+                return None
+            path += segment
+        return path
@@ -1,13 +1,21 @@
+import threading
+from array import array
 from collections import defaultdict
+from itertools import compress, islice
+from typing import Iterable, Iterator
 from model.game_object import GameObject
 from model.entity import Entity
 from util.coordinate import Coordinate
 from model.entity import Entity
 from model.resources.resource import Resource
 from model.buildings.farm import Farm
-from pathfinding.core.diagonal_movement import DiagonalMovement
-from pathfinding.core.grid import Grid
-from pathfinding.finder.a_star import AStarFinder
+from util.path_finder import PathFinder
+from util.path_cache import PathCache
+from util.hierarchical_path_finder import HierarchicalPathFinder
+from util.flow_field import FlowField
+from util.spatial_index import SpatialIndex
+from util.resource_field import ResourceField
+from model.units.unit import Unit
 import typing
 if typing.TYPE_CHECKING:
     from model.player.player import Player
@@ -17,9 +25,38 @@ This file contains the Map class which is used to represent the map of the game
 It serves as the heart of the model-the representation of datas
 """
 class Map():
+    MAX_FLOW_FIELDS = 32
+    MAX_CHANGES = 4096
+    MAX_FREE_SQUARE = 8
+    # For each side, the table translating the free squares to 1 where a square of this side fits, 0 elsewhere
+    __FITS = [bytes(side >= fit for side in range(256)) for fit in range(MAX_FREE_SQUARE + 1)]
+    UNCHANGED = object()
     DIRECTIONS = [(-1, 0), (1, 0), (0, -1), (0, 1), (-1, -1), (-1, 1), (1, -1), (1, 1)]
     """
     The Map class is used to represent the map of the game. It contains the matrix of the map and the methods associated with it.
+
+    The tiles are stored in a flat array of object ids indexed by ``y * size + x`` (0 meaning an empty tile),
+    alongside a table linking each id to its game object.
+    A walkability bitmap using the same indexing (1 for a free tile, 0 for an occupied one) is kept up to date
+    by every write on the grid, so that path finding and placement checks never have to scan the objects.
+    Found paths are kept in a cache which drops them when an object is added or removed on one of their tiles,
+    and a version counter is increased on each of these changes.
+    On the medium and large maps, long diagonal paths are searched with a hierarchical path finder.
+    Groups of units heading to the same region share a flow field, dropped when a building or a resource changes in the area it covers.
+    The occupied tiles are also kept in a spatial index by type of object, to find the nearest objects without scanning the map.
+    The free squares, a byte per tile, give the side of the largest square starting at the tile (its top left tile)
+    without a building or a resource, up to ``MAX_FREE_SQUARE``: like the flow fields, they ignore the units, and are
+    updated around the buildings and resources added or removed, so that the search of empty zones skips the tiles where a zone cannot fit.
+    The resources generated with the map are kept in a resource field: their tiles point to one shared resource per type,
+    and the Resource of such a tile is only created when it is read with ``get`` or ``get_xy``.
+    The last written tiles are kept in a change feed, so that a view only redraws the tiles which changed since its last frame.
+
+    A snapshot is a read-only Map sharing the structures of a live map. Before a tile of the live map is written,
+    its previous object is recorded in the overlay of every snapshot, so that taking a snapshot only costs the changes made while it is used.
+    The reads of a snapshot always check the overlay after the live structures, so that a snapshot stays consistent
+    while the live map is written by another thread. Only the walkability bitmap and the free squares, a byte per tile each, are copied when a snapshot is taken,
+    with the path finder reading them, so that the placement checks, the free zones and the paths of a snapshot are those of the map when it was taken.
+    The resources read on a snapshot are bound to the resource field of the live map, which does not keep them.
     """
 
     def __init__(self, size: int):
@@ -30,7 +67,143 @@ class Map():
         :type size: int
         """
         self.__size: int = size
-        self.__matrix: defaultdict[Coordinate, GameObject] = defaultdict(lambda: None)
+        self.__grid: array = array('I', [0]) * (size * size)
+        self.__objects: dict[int, GameObject] = {}
+        self.__tile_counts: dict[int, int] = {}
+        self.__next_id: int = 1
+        self.__walkable: bytearray = bytearray(b'\x01') * (size * size)
+        self.__spatial_index: SpatialIndex = SpatialIndex(size)
+        self.__free_squares: bytearray = None
+        self.__build_free_squares()
+        self.__path_finder: PathFinder = PathFinder(self.__walkable, size)
+        self.__path_cache: PathCache = PathCache(self.__walkable, size)
+        self.__hierarchical_path_finder: HierarchicalPathFinder = None
+        if size >= HierarchicalPathFinder.MIN_MAP_SIZE:
+            self.__hierarchical_path_finder = HierarchicalPathFinder(self, self.__walkable, self.__path_finder)
+        self.__flow_fields: dict[tuple[int, int], FlowField] = {}
+        self.__version: int = 0
+        self.__lock: threading.Lock = threading.Lock()
+        self.__snapshots: tuple['Map', ...] = ()
+        self.__source: 'Map' = None
+        self.__overlay: dict[int, GameObject] = {}
+        self.__overlay_buckets: dict[int, dict[int, GameObject]] = {}
+        self.__field: ResourceField = ResourceField(size)
+        self.__changes: list[int] = []
+        self.__changes_base: int = 0
+
+    def __getstate__(self) -> dict:
+        """
+        Get the state of the map to be pickled, without its lock and its snapshots.
+
+        :return: The state of the map.
+        :rtype: dict
+        """
+        state = self.__dict__.copy()
+        state['_Map__lock'] = None
+        state['_Map__snapshots'] = ()
+        state['_Map__changes'] = []
+        state['_Map__changes_base'] = self.__changes_base + len(self.__changes)
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        """
+        Restore the state of a pickled map, with a new lock.
+        A map pickled before the grid only has its matrix of objects: it starts empty, and its objects,
+        which may not be unpickled yet, are written on the grid by restore_matrix.
+
+        :param state: The state of the map.
+        :type state: dict
+        """
+        if '_Map__matrix' in state:
+            self.__init__(state['_Map__size'])
+            self.__matrix = state['_Map__matrix']
+            return
+        self.__dict__.update(state)
+        self.__lock = threading.Lock()
+        if '_Map__field' not in state:
+            # Saved before the resource field: every resource is an object of its own
+            self.__field = ResourceField(self.__size)
+        if '_Map__changes' not in state:
+            self.__changes = []
+            self.__changes_base = 0
+        if '_Map__free_squares' not in state:
+            self.__build_free_squares()
+
+    def restore_matrix(self) -> None:
+        """
+        Write on the grid the objects of a map pickled before the grid, once they are all unpickled.
+        Nothing is done for the other maps.
+        """
+        matrix = self.__dict__.pop('_Map__matrix', None)
+        if matrix is None:
+            return
+        with self.__lock:
+            for coordinate, object in matrix.items():
+                # The matrix also kept the empty tiles which were read
+                if object is not None:
+                    self.__set_tile(coordinate.get_y() * self.__size + coordinate.get_x(), object)
+            self.__build_free_squares()
+
+    def snapshot(self) -> 'Map':
+        """
+        Take a read-only snapshot of the map, sharing its structures.
+        The snapshot keeps showing the map as it was until it is released, whatever is written on the map.
+
+        :return: The snapshot.
+        :rtype: Map
+        :raises ValueError: If the map is itself a snapshot.
+        """
+        if self.__source is not None:
+            raise ValueError("Cannot take a snapshot of a snapshot.")
+        with self.__lock:
+            snapshot = Map.__new__(Map)
+            snapshot.__dict__.update(self.__dict__)
+            snapshot.__walkable = bytearray(self.__walkable)
+            snapshot.__free_squares = bytearray(self.__free_squares)
+            snapshot.__path_finder = PathFinder(snapshot.__walkable, self.__size, self.__path_finder.is_jump_point_search())
+            snapshot.__path_cache = PathCache(snapshot.__walkable, self.__size)
+            snapshot.__hierarchical_path_finder = None
+            snapshot.__flow_fields = {}
+            snapshot.__lock = threading.Lock()
+            snapshot.__snapshots = ()
+            snapshot.__source = self
+            snapshot.__overlay = {}
+            snapshot.__overlay_buckets = {}
+            # The tuple is replaced and never modified, so that a write can go through it while a snapshot is added
+            self.__snapshots = self.__snapshots + (snapshot,)
+        return snapshot
+
+    def release(self) -> None:
+        """
+        Stop following the writes on the live map. A released snapshot must not be read anymore.
+        """
+        source = self.__source
+        if source is None:
+            return
+        with source.__lock:
+            source.__snapshots = tuple(snapshot for snapshot in source.__snapshots if snapshot is not self)
+
+    def is_snapshot(self) -> bool:
+        """
+        Check if the map is a snapshot of another map.
+
+        :return: True if the map is a snapshot, False otherwise.
+        :rtype: bool
+        """
+        return self.__source is not None
+
+    def __record(self, index: int, object: GameObject) -> None:
+        """
+        Record the object of a tile of the live map before it is written, if it is its first change since the snapshot.
+
+        :param index: The index of the tile.
+        :type index: int
+        :param object: The object on the tile before the write, None if it was empty.
+        :type object: GameObject
+        """
+        if index not in self.__overlay:
+            self.__overlay_buckets.setdefault(self.__spatial_index.bucket(index), {})[index] = object
+            self.__overlay[index] = object
 
     def get_size(self) -> int:
         """
@@ -41,6 +214,59 @@ class Map():
         """
         return self.__size
     
+    def __register(self, object: GameObject) -> int:
+        """
+        Give an id to the object if it does not have one yet and add it to the id table.
+
+        :param object: The game object to register.
+        :type object: GameObject
+        :return: The id of the object.
+        :rtype: int
+        """
+        object_id = object.get_id()
+        if object_id is None:
+            object_id = self.__next_id
+            object.set_id(object_id)
+        self.__next_id = max(self.__next_id, object_id + 1)
+        self.__objects[object_id] = object
+        return object_id
+
+    def __set_tile(self, index: int, object: GameObject) -> None:
+        """
+        Write an object (or None) on a tile, keeping the id table up to date.
+        An object leaves the id table when its last tile is cleared.
+
+        :param index: The index of the tile in the grid.
+        :type index: int
+        :param object: The game object to write, or None to clear the tile.
+        :type object: GameObject
+        :raises ValueError: If the map is a snapshot.
+        """
+        if self.__source is not None:
+            raise ValueError("A snapshot of the map cannot be modified.")
+        old_id = self.__grid[index]
+        self.__changed_tiles((index,))
+        # The snapshots must know the previous object before anything changes
+        for snapshot in self.__snapshots:
+            snapshot.__record(index, self.__objects.get(old_id))
+        if old_id:
+            self.__spatial_index.remove(index, type(self.__objects[old_id]))
+            count = self.__tile_counts[old_id] - 1
+            if count:
+                self.__tile_counts[old_id] = count
+            else:
+                del self.__tile_counts[old_id]
+                del self.__objects[old_id]
+        if object is None:
+            self.__grid[index] = 0
+            self.__walkable[index] = 1
+            return
+        object_id = self.__register(object)
+        self.__grid[index] = object_id
+        self.__walkable[index] = 0
+        self.__spatial_index.add(index, type(object))
+        self.__tile_counts[object_id] = self.__tile_counts.get(object_id, 0) + 1
+
     def check_placement(self, object: GameObject, coordinate: Coordinate) -> bool:
         """
         Check if an entity can be placed at a certain coordinate.
@@ -52,12 +278,29 @@ class Map():
         :return: True if the object can be placed, False otherwise.
         :rtype: bool
         """
-        for x in range(object.get_size()):
-            for y in range(object.get_size()):
-                if coordinate is None or not (Coordinate(0, 0) <= coordinate and (coordinate + object.get_size() - 1) <= Coordinate(self.get_size() - 1, self.get_size() - 1)):
-                    return False
-                if self.get(Coordinate(coordinate.get_x() + x, coordinate.get_y() + y)) is not None:
-                    return False
+        if coordinate is None:
+            return False
+        return self.__is_free(coordinate.get_x(), coordinate.get_y(), object.get_size())
+
+    def __is_free(self, x: int, y: int, size: int) -> bool:
+        """
+        Check if a square area is inside the map and free, reading its rows in the walkability bitmap.
+
+        :param x: The x coordinate of the top left tile of the area.
+        :type x: int
+        :param y: The y coordinate of the top left tile of the area.
+        :type y: int
+        :param size: The size of the area.
+        :type size: int
+        :return: True if the area is free, False otherwise.
+        :rtype: bool
+        """
+        if x < 0 or y < 0 or x + size > self.__size or y + size > self.__size:
+            return False
+        for row in range(y, y + size):
+            start = row * self.__size + x
+            if self.__walkable.find(0, start, start + size) != -1:
+                return False
         return True
 
     def add(self, object: GameObject, coordinate: Coordinate):
@@ -70,11 +313,110 @@ class Map():
         :type coordinate: Coordinate
         :raises ValueError: If the object cannot be placed at the given coordinate.
         """
-        if not self.check_placement(object, coordinate):
-            raise ValueError(f"Cannot place object at the given coordinate {coordinate}.")
+        with self.__lock:
+            if not self.check_placement(object, coordinate):
+                raise ValueError(f"Cannot place object at the given coordinate {coordinate}.")
+            self.__place(object, coordinate)
+            self.__changed(object, coordinate)
+
+    def add_all(self, placements: list[tuple[GameObject, Coordinate]]) -> None:
+        """
+        Add many entities at once, as when the map is generated.
+        Every placement is checked before the first one is written, and the path finding structures are reset once at the end
+        instead of being updated for each entity.
+
+        :param placements: The game objects to be added with their coordinates.
+        :type placements: list[tuple[GameObject, Coordinate]]
+        :raises ValueError: If an object cannot be placed at its coordinate, two objects claim the same tile or the map is a snapshot.
+        """
+        if self.__source is not None:
+            raise ValueError("A snapshot of the map cannot be modified.")
+        with self.__lock:
+            self.__add_all(placements)
+
+    def __add_all(self, placements: list[tuple[GameObject, Coordinate]]) -> list[int]:
+        """
+        Check and write many placements, the lock being held.
+
+        :param placements: The game objects to be added with their coordinates.
+        :type placements: list[tuple[GameObject, Coordinate]]
+        :return: The indices of the written tiles.
+        :rtype: list[int]
+        :raises ValueError: If an object cannot be placed at its coordinate or two objects claim the same tile.
+        """
+        map_size, walkable = self.__size, self.__walkable
+        claimed = set()
+        writes = []
+        for object, coordinate in placements:
+            x, y, size = coordinate.get_x(), coordinate.get_y(), object.get_size()
+            if size == 1:
+                tiles = [y * map_size + x]
+                free = 0 <= x < map_size and 0 <= y < map_size and walkable[tiles[0]]
+            else:
+                tiles = [(y + row) * map_size + x + column for row in range(size) for column in range(size)]
+                free = self.__is_free(x, y, size)
+            if not free:
+                raise ValueError(f"Cannot place object at the given coordinate {coordinate}.")
+            if not claimed.isdisjoint(tiles):
+                raise ValueError(f"Cannot place two objects on the same tile {coordinate}.")
+            claimed.update(tiles)
+            writes.append((object, tiles))
+        # The tiles are known to be free: only the new objects have to be written
+        grid, tile_counts, snapshots = self.__grid, self.__tile_counts, self.__snapshots
+        by_type: dict[type, list[int]] = {}
+        last, object_id = None, 0
+        for object, tiles in writes:
+            if object is not last:
+                last, object_id = object, self.__register(object)
+            for index in tiles:
+                for snapshot in snapshots:
+                    snapshot.__record(index, None)
+                grid[index] = object_id
+                walkable[index] = 0
+            tile_counts[object_id] = tile_counts.get(object_id, 0) + len(tiles)
+            by_type.setdefault(type(object), []).extend(tiles)
+        for object_type, indices in by_type.items():
+            self.__spatial_index.add_all(indices, object_type)
+        self.__changed_tiles(claimed)
+        if placements:
+            self.__path_cache.clear()
+            if self.__hierarchical_path_finder is not None:
+                self.__hierarchical_path_finder.clear()
+            if any(not isinstance(object, Unit) for object, _ in placements):
+                self.__flow_fields.clear()
+                self.__build_free_squares()
+            self.__version += 1
+        return list(claimed)
+
+    def add_resources(self, resource_type: type, coordinates: list[Coordinate]) -> None:
+        """
+        Add resources of a type on many tiles at once, each tile with the full amount of the type.
+        The resources are kept in the resource field of the map instead of being objects of their own.
+
+        :param resource_type: The type of the resources.
+        :type resource_type: type
+        :param coordinates: The coordinates of the tiles.
+        :type coordinates: list[Coordinate]
+        :raises ValueError: If a tile is not free, two coordinates are the same or the map is a snapshot.
+        """
+        if self.__source is not None:
+            raise ValueError("A snapshot of the map cannot be modified.")
+        shared = self.__field.get_shared(resource_type)
+        with self.__lock:
+            self.__field.fill_all(self.__add_all([(shared, coordinate) for coordinate in coordinates]), resource_type)
+
+    def __place(self, object: GameObject, coordinate: Coordinate):
+        """
+        Write an object on all the tiles it claims, without checking the placement.
+
+        :param object: The game object to be placed.
+        :type object: GameObject
+        :param coordinate: The coordinate where the object is to be placed.
+        :type coordinate: Coordinate
+        """
         for x in range(object.get_size()):
             for y in range(object.get_size()):
-                self.__matrix[Coordinate(coordinate.get_x() + x, coordinate.get_y() + y)] = object
+                self.__set_tile((coordinate.get_y() + y) * self.__size + coordinate.get_x() + x, object)
 
     def __force_add(self, object: GameObject, coordinate: Coordinate):
         """
@@ -85,7 +427,7 @@ class Map():
         :param coordinate: The coordinate where the object is to be added.
         :type coordinate: Coordinate
         """
-        self.__matrix[coordinate] = object
+        self.__set_tile(coordinate.get_y() * self.__size + coordinate.get_x(), object)
 
     def remove(self, coordinate: Coordinate) -> GameObject:
         """
@@ -99,13 +441,87 @@ class Map():
         """
         if not (Coordinate(0, 0) <= coordinate <= Coordinate(self.get_size(), self.get_size())):
             raise ValueError(f"Coordinate is out of bounds.{coordinate}")
-        object: GameObject = self.__matrix[coordinate]
-        if object is None:
-            raise ValueError(f"No entity at the given coordinate.{coordinate}")
-        for x in range(object.get_size()):
-            for y in range(object.get_size()):
-                self.__matrix[Coordinate(coordinate.get_x() + x, coordinate.get_y() + y)] = None
+        with self.__lock:
+            object: GameObject = self.get(coordinate)
+            if object is None:
+                raise ValueError(f"No entity at the given coordinate.{coordinate}")
+            self.__clear(object, coordinate)
+            self.__changed(object, coordinate)
         return object
+
+    def __changed(self, object: GameObject, coordinate: Coordinate):
+        """
+        Report an added or removed object to the path finding structures and increase the version of the map.
+        The flow fields, the clusters of the hierarchical path finder and the free squares ignore the units, as they keep moving.
+
+        :param object: The added or removed game object.
+        :type object: GameObject
+        :param coordinate: The coordinate of the object.
+        :type coordinate: Coordinate
+        """
+        size = object.get_size()
+        self.__path_cache.invalidate(coordinate, size)
+        if not isinstance(object, Unit):
+            if self.__hierarchical_path_finder is not None:
+                self.__hierarchical_path_finder.invalidate(coordinate, size)
+            for region in [region for region, field in self.__flow_fields.items() if field.reaches(coordinate, size)]:
+                del self.__flow_fields[region]
+            self.__update_free_squares(coordinate, size)
+        self.__version += 1
+
+    def __build_free_squares(self) -> None:
+        """
+        Compute the free squares of every tile at once. They are laid out as the grid with an extra blocked column and row,
+        ``y * (size + 1) + x``, and computed on big integers holding a byte per tile: the tiles without a building or a resource,
+        then the squares of each side, free where the four squares one tile smaller starting at the tile and its right, bottom
+        and bottom right neighbours are.
+        """
+        map_size, width = self.__size, self.__size + 1
+        free = bytearray(width * width)
+        for y in range(map_size):
+            free[y * width:y * width + map_size] = self.__walkable[y * map_size:(y + 1) * map_size]
+        for index in self.__spatial_index.tiles(Unit):
+            free[index // map_size * width + index % map_size] = 1
+        squares = total = int.from_bytes(free, 'little')
+        for _ in range(Map.MAX_FREE_SQUARE - 1):
+            squares &= (squares >> 8) & (squares >> 8 * width) & (squares >> 8 * (width + 1))
+            total += squares
+        self.__free_squares = bytearray(total.to_bytes(len(free), 'little'))
+
+    def __update_free_squares(self, coordinate: Coordinate, size: int) -> None:
+        """
+        Compute again the free squares of the tiles which can reach an added or removed object, from the bottom right to the top left.
+
+        :param coordinate: The coordinate of the object.
+        :type coordinate: Coordinate
+        :param size: The size of the object.
+        :type size: int
+        """
+        map_size, width, maximum = self.__size, self.__size + 1, Map.MAX_FREE_SQUARE
+        squares, grid, objects = self.__free_squares, self.__grid, self.__objects
+        left, top = max(coordinate.get_x() - maximum + 1, 0), max(coordinate.get_y() - maximum + 1, 0)
+        right, bottom = min(coordinate.get_x() + size, map_size) - 1, min(coordinate.get_y() + size, map_size) - 1
+        for y in range(bottom, top - 1, -1):
+            for x in range(right, left - 1, -1):
+                index = y * width + x
+                object_id = grid[y * map_size + x]
+                if object_id and not isinstance(objects[object_id], Unit):
+                    squares[index] = 0
+                else:
+                    squares[index] = min(maximum, 1 + min(squares[index + 1], squares[index + width], squares[index + width + 1]))
+
+    def __clear(self, object: GameObject, coordinate: Coordinate):
+        """
+        Clear all the tiles claimed by an object.
+
+        :param object: The game object to be cleared.
+        :type object: GameObject
+        :param coordinate: The coordinate of the object.
+        :type coordinate: Coordinate
+        """
+        for x in range(coordinate.get_x(), min(coordinate.get_x() + object.get_size(), self.__size)):
+            for y in range(coordinate.get_y(), min(coordinate.get_y() + object.get_size(), self.__size)):
+                self.__set_tile(y * self.__size + x, None)
     
     def __force_remove(self, coordinate: Coordinate) -> GameObject:
         """
@@ -116,13 +532,14 @@ class Map():
         :return: The removed game object.
         :rtype: GameObject
         """
-        object: GameObject = self.__matrix[coordinate]
-        self.__matrix[coordinate] = None
+        object: GameObject = self.get(coordinate)
+        self.__set_tile(coordinate.get_y() * self.__size + coordinate.get_x(), None)
         return object
 
     def move(self, object: GameObject, new_coordinate: Coordinate):
         """
         Move an entity to a new adjacent coordinate (8 surrounding coordinates).
+        Moves do not drop cached paths, a cached path is checked for moving units when it is read.
 
         :param object: The game object to be moved.
         :type object: GameObject
@@ -132,10 +549,13 @@ class Map():
         """
         if not object.get_coordinate().is_adjacent(new_coordinate):
             raise ValueError(f"New coordinate {new_coordinate} is not adjacent to the entity's current coordinate { object.get_coordinate()}.")
-        if not self.check_placement(object, new_coordinate):
-            raise ValueError("New coordinate is not available.")
-        self.remove(object.get_coordinate())
-        self.add(object, new_coordinate)
+        with self.__lock:
+            if not self.check_placement(object, new_coordinate):
+                raise ValueError("New coordinate is not available.")
+            if self.get(object.get_coordinate()) is None:
+                raise ValueError(f"No entity at the given coordinate.{object.get_coordinate()}")
+            self.__clear(object, object.get_coordinate())
+            self.__place(object, new_coordinate)
 
     def __force_move(self, object: GameObject, new_coordinate: Coordinate):
         """
@@ -155,19 +575,216 @@ class Map():
 
         :param coordinate: The coordinate from which the object is to be retrieved.
         :type coordinate: Coordinate
-        :return: The game object at the given coordinate.
+        :return: The game object at the given coordinate, None if the tile is empty or out of the map.
+        :rtype: GameObject
+        """
+        if coordinate is None:
+            return None
+        return self.get_xy(coordinate.get_x(), coordinate.get_y())
+    
+    def get_xy(self, x: int, y: int) -> GameObject:
+        """
+        Get the entity at a certain position without building a Coordinate.
+
+        :param x: The x coordinate of the tile.
+        :type x: int
+        :param y: The y coordinate of the tile.
+        :type y: int
+        :return: The game object at the given position, None if the tile is empty or out of the map.
+        :rtype: GameObject
+        """
+        object = self.__read(x, y)
+        if self.__field.is_shared(object):
+            return self.__field.get_resource(y * self.__size + x, object, self.__source is None)
+        return object
+
+    def view_xy(self, x: int, y: int) -> GameObject:
+        """
+        Get the object of a tile to draw it, without creating the Resource of a tile of the resource field.
+
+        :param x: The x coordinate of the tile.
+        :type x: int
+        :param y: The y coordinate of the tile.
+        :type y: int
+        :return: The game object at the given position, the shared resource of its type for a tile of the resource field,
+            None if the tile is empty or out of the map.
+        :rtype: GameObject
+        """
+        return self.__read(x, y)
+
+    def __read(self, x: int, y: int) -> GameObject:
+        """
+        Read the object of a tile as it is stored: the tiles of the resource field give the shared resource of their type.
+
+        :param x: The x coordinate of the tile.
+        :type x: int
+        :param y: The y coordinate of the tile.
+        :type y: int
+        :return: The game object at the given position, None if the tile is empty or out of the map.
+        :rtype: GameObject
+        """
+        if 0 <= x < self.__size and 0 <= y < self.__size:
+            index = y * self.__size + x
+            object = self.__objects.get(self.__grid[index])
+            if self.__source is not None:
+                old = self.__overlay.get(index, Map.UNCHANGED)
+                if old is not Map.UNCHANGED:
+                    return old
+            return object
+        return None
+    
+    def is_walkable_xy(self, x: int, y: int) -> bool:
+        """
+        Check if a tile is inside the map and free.
+
+        :param x: The x coordinate of the tile.
+        :type x: int
+        :param y: The y coordinate of the tile.
+        :type y: int
+        :return: True if the tile can be walked on, False otherwise.
+        :rtype: bool
+        """
+        return 0 <= x < self.__size and 0 <= y < self.__size and self.__walkable[y * self.__size + x] == 1
+    
+    def get_walkability(self) -> memoryview:
+        """
+        Get a read-only view of the walkability bitmap, indexed by ``y * size + x`` (1 for a free tile, 0 otherwise).
+
+        :return: The walkability bitmap.
+        :rtype: memoryview
+        """
+        return memoryview(self.__walkable).toreadonly()
+    
+    def get_free_indices(self) -> list[int]:
+        """
+        Get the indices of the free tiles, ``y * size + x``, in increasing order.
+
+        :return: The indices of the free tiles.
+        :rtype: list[int]
+        """
+        return list(compress(range(self.__size * self.__size), self.__walkable))
+
+    def get_path_finder(self) -> PathFinder:
+        """
+        Get the path finder searching on this map.
+
+        :return: The path finder.
+        :rtype: PathFinder
+        """
+        return self.__path_finder
+    
+    def get_hierarchical_path_finder(self) -> HierarchicalPathFinder:
+        """
+        Get the hierarchical path finder used for long paths.
+
+        :return: The hierarchical path finder, None if the map is too small to use one.
+        :rtype: HierarchicalPathFinder
+        """
+        return self.__hierarchical_path_finder
+    
+    def get_flow_field(self, target: Coordinate) -> FlowField:
+        """
+        Get the flow field shared by the units heading to the region of a target, creating it if needed.
+
+        :param target: The coordinate of the target.
+        :type target: Coordinate
+        :return: The flow field of the region of the target.
+        :rtype: FlowField
+        """
+        region = FlowField.region(target)
+        field = self.__flow_fields.get(region)
+        if field is None:
+            if len(self.__flow_fields) >= Map.MAX_FLOW_FIELDS:
+                del self.__flow_fields[next(iter(self.__flow_fields))]
+            field = FlowField(self, self.__walkable, target)
+            self.__flow_fields[region] = field
+        return field
+    
+    def get_path_cache(self) -> PathCache:
+        """
+        Get the cache of the paths found on this map, with its hit and miss counters.
+
+        :return: The path cache.
+        :rtype: PathCache
+        """
+        return self.__path_cache
+    
+    def __changed_tiles(self, indices: Iterable[int]) -> None:
+        """
+        Add written tiles to the change feed, dropping the oldest changes once it is full.
+
+        :param indices: The indices of the tiles.
+        :type indices: Iterable[int]
+        """
+        self.__changes.extend(indices)
+        if len(self.__changes) > 2 * Map.MAX_CHANGES:
+            dropped = len(self.__changes) - Map.MAX_CHANGES
+            del self.__changes[:dropped]
+            self.__changes_base += dropped
+
+    def get_revision(self) -> int:
+        """
+        Get the revision of the map, increased each time a tile is written, moves included.
+
+        :return: The revision of the map.
+        :rtype: int
+        """
+        return self.__changes_base + len(self.__changes)
+
+    def get_changes(self, revision: int) -> list[int]:
+        """
+        Get the tiles written since a revision of the map, ``y * size + x``, in the order of the writes.
+
+        :param revision: The revision, as given by get_revision.
+        :type revision: int
+        :return: The indices of the written tiles, None if the revision is too old to be in the change feed.
+        :rtype: list[int]
+        """
+        with self.__lock:
+            if revision < self.__changes_base:
+                return None
+            return self.__changes[revision - self.__changes_base:]
+
+    def get_version(self) -> int:
+        """
+        Get the version of the map, increased each time an object is added or removed (moves excluded).
+
+        :return: The version of the map.
+        :rtype: int
+        """
+        return self.__version
+    
+    def get_object(self, object_id: int) -> GameObject:
+        """
+        Get a game object placed on the map from its id.
+
+        :param object_id: The id of the object.
+        :type object_id: int
+        :return: The game object, None if no object with this id is on the map.
         :rtype: GameObject
         """
-        return self.__matrix[coordinate]
+        return self.__objects.get(object_id)
     
     def get_map(self) -> defaultdict[Coordinate, GameObject]:
         """
-        Get the map as a matrix.
+        Get the occupied tiles of the map as a matrix.
+        The tiles of the resource field give the shared resource of their type, which is enough to draw them.
 
         :return: The map as a matrix.
         :rtype: defaultdict[Coordinate, GameObject]
         """
-        return self.__matrix
+        result = defaultdict(lambda: None)
+        objects = self.__objects.copy()
+        for index, object_id in enumerate(self.__grid):
+            if object_id in objects:
+                result[Coordinate.of(index % self.__size, index // self.__size)] = objects[object_id]
+        for index, object in tuple(self.__overlay.items()):
+            coordinate = Coordinate.of(index % self.__size, index // self.__size)
+            if object is None:
+                result.pop(coordinate, None)
+            else:
+                result[coordinate] = object
+        return result
     
     def get_map_list(self) -> list[list[GameObject]]:
         """
@@ -176,7 +793,7 @@ class Map():
         :return: The map as a list of lists.
         :rtype: list[list[GameObject]]
         """
-        return [[self.__matrix[Coordinate(i, j)] for j in range(self.get_size())] for i in range(self.get_size())]
+        return [[self.get_xy(i, j) for j in range(self.get_size())] for i in range(self.get_size())]
     
     def get_from_to(self, from_coord: Coordinate, to_coord: Coordinate) -> 'Map':
         """
@@ -189,11 +806,11 @@ class Map():
         :return: A new map from the starting coordinate to the ending coordinate.
         :rtype: Map
         """
-        new_size = max(to_coord.get_x() - from_coord.get_x(), to_coord.get_y() - from_coord.get_y())
+        new_size = max(to_coord.get_x() - from_coord.get_x(), to_coord.get_y() - from_coord.get_y()) + 1
         new_map = Map(new_size)
         for x in range(from_coord.get_x(), to_coord.get_x() + 1):
             for y in range(from_coord.get_y(), to_coord.get_y() + 1):
-                obj = self.get(Coordinate(x, y))
+                obj = self.__read(x, y)
                 if obj is not None:
                     new_map.__force_add(obj, Coordinate(x - from_coord.get_x(), y - from_coord.get_y()))
         return new_map
@@ -212,9 +829,9 @@ class Map():
         result = defaultdict(lambda: None)
         for x in range(from_coord.get_x(), to_coord.get_x() + 1):
             for y in range(from_coord.get_y(), to_coord.get_y() + 1):
-                obj = self.get(Coordinate(x, y))
+                obj = self.get_xy(x, y)
                 if obj is not None:
-                    result[Coordinate(x, y)] = obj
+                    result[Coordinate.of(x, y)] = obj
         return result
     
     def get_map_list_from_to(self, from_coord: Coordinate, to_coord: Coordinate) -> list[list[GameObject]]:
@@ -232,7 +849,7 @@ class Map():
         result = [[None for _ in range(size)] for _ in range(size)]
         for x in range(from_coord.get_x(), to_coord.get_x() + 1):
             for y in range(from_coord.get_y(), to_coord.get_y() + 1):
-                result[x][y] = self.get(Coordinate(x, y))
+                result[x][y] = self.get_xy(x, y)
         return result
     
     def tabler_str(self) -> str:
@@ -250,7 +867,7 @@ class Map():
         for y in range(self.get_size()):
             row = []
             for x in range(self.get_size()):
-                object = self.get(Coordinate(x, y))
+                object = self.__read(x, y)
                 row.append(f" {object.get_letter() if object is not None else ' '} ")
             rows.append("│" + "│".join(row) + "│")
             if x < self.get_size() - 1:
@@ -269,7 +886,7 @@ class Map():
         for y in range(self.get_size()):
             row = []
             for x in range(self.get_size()):
-                obj = self.get(Coordinate(x, y))
+                obj = self.__read(x, y)
                 row.append(obj.get_letter() if obj else '·')
             rows.append("".join(row))
         return "\n".join(rows)
@@ -285,7 +902,7 @@ class Map():
         for y in range(self.get_size()):
             row = []
             for x in range(self.get_size()):
-                obj = self.get(Coordinate(x, y))
+                obj = self.__read(x, y)
                 row.append(obj.get_letter() if obj else '·')
             rows.append("".join(row))
         return "\n".join(rows)
@@ -301,14 +918,7 @@ class Map():
         :return: A list of coordinates representing the path from start to end.
         :rtype: list[Coordinate]
         """
-        m=[[1 if self.get(Coordinate(x, y)) is None or Coordinate(x,y) == start or Coordinate(x,y) == end else 0 for x in range(self.get_size())] for y in range(self.get_size())]
-        grid = Grid(matrix=m)
-        start_node = grid.node(start.get_x(), start.get_y())
-        end_node = grid.node(end.get_x(), end.get_y())
-        finder = AStarFinder(diagonal_movement=DiagonalMovement.always)
-        path, _ = finder.find_path(start_node, end_node, grid)
-        
-        return [Coordinate(x, y) for x, y in path[1:]]
+        return self.__find_path(start, end)
     
     def path_finding_avoid(self, start: Coordinate, end: Coordinate, avoid_from: Coordinate, avoid_to: Coordinate) -> list[Coordinate]:
         """
@@ -325,23 +935,7 @@ class Map():
         :return: A list of coordinates representing the path from start to end while avoiding the specified area.
         :rtype: list[Coordinate]
         """
-        
-        matrix=[[1 if self.get(Coordinate(x, y)) is None or Coordinate(x,y) == start or Coordinate(x,y) == end else 0 for x in range(self.get_size())] for y in range(self.get_size())]
-
-        # Mark the avoid area as non-walkable
-        for x in range(avoid_from.get_x(), avoid_to.get_x() + 1):
-            for y in range(avoid_from.get_y(), avoid_to.get_y() + 1):
-                if 0 <= x < self.get_size() and 0 <= y < self.get_size():
-                    matrix[y][x] = 0
-        matrix[end.get_y()][end.get_x()] = 1
-
-        grid = Grid(matrix=matrix)
-        start_node = grid.node(start.get_x(), start.get_y())
-        end_node = grid.node(end.get_x(), end.get_y())
-        finder = AStarFinder(diagonal_movement=DiagonalMovement.always)
-        path, _ = finder.find_path(start_node, end_node, grid)
-
-        return [Coordinate(x, y) for x, y in path[1:]]
+        return self.__find_path(start, end, True, avoid_from, avoid_to)
     
     def path_finding_non_diagonal(self, start: Coordinate, end: Coordinate) -> list[Coordinate]:
         """
@@ -354,57 +948,179 @@ class Map():
         :return: A list of coordinates representing the path from start to end without diagonal movement.
         :rtype: list[Coordinate]
         """
-        m=[[1 if self.get(Coordinate(x, y)) is None or Coordinate(x,y) == start or Coordinate(x,y) == end else 0 for x in range(self.get_size())] for y in range(self.get_size())]
-        grid = Grid(matrix=m)
-        start_node = grid.node(start.get_x(), start.get_y())
-        end_node = grid.node(end.get_x(), end.get_y())
-        finder = AStarFinder(diagonal_movement=DiagonalMovement.never)
-        path, _ = finder.find_path(start_node, end_node, grid)
-        
-        return [Coordinate(x, y) for x, y in path[1:]]
-    def find_nearest_empty_zones(self, coordinate: Coordinate, size: int) -> list[Coordinate]:
+        return self.__find_path(start, end, False)
+    
+    def __find_path(self, start: Coordinate, end: Coordinate, diagonal: bool = True, avoid_from: Coordinate = None, avoid_to: Coordinate = None) -> list[Coordinate]:
         """
-        Find the nearest empty zone to a given coordinate.
+        Find a path through the path cache, searching it only if it is not cached.
+
+        :param start: The starting coordinate.
+        :type start: Coordinate
+        :param end: The ending coordinate.
+        :type end: Coordinate
+        :param diagonal: True to allow diagonal moves, False otherwise.
+        :type diagonal: bool
+        :param avoid_from: The starting coordinate of the area to avoid.
+        :type avoid_from: Coordinate
+        :param avoid_to: The ending coordinate of the area to avoid.
+        :type avoid_to: Coordinate
+        :return: A list of coordinates representing the path from start to end.
+        :rtype: list[Coordinate]
+        """
+        key = self.__path_cache.key(start, end, diagonal, avoid_from, avoid_to)
+        path = self.__path_cache.get(key)
+        if path is None:
+            if diagonal and avoid_from is None and self.__is_long(start, end):
+                path = self.__hierarchical_path_finder.find_path(start, end)
+            else:
+                path = self.__path_finder.find_path(start, end, diagonal, avoid_from, avoid_to)
+            self.__path_cache.put(key, path)
+        return path
+    
+    def __is_long(self, start: Coordinate, end: Coordinate) -> bool:
+        """
+        Check if a path is long enough to be searched with the hierarchical path finder.
+
+        :param start: The starting coordinate.
+        :type start: Coordinate
+        :param end: The ending coordinate.
+        :type end: Coordinate
+        :return: True if the hierarchical path finder should be used, False otherwise.
+        :rtype: bool
+        """
+        if self.__hierarchical_path_finder is None:
+            return False
+        distance = max(abs(start.get_x() - end.get_x()), abs(start.get_y() - end.get_y()))
+        return distance >= 2 * self.__hierarchical_path_finder.get_cluster_size()
+    
+    def find_nearest_empty_zones(self, coordinate: Coordinate, size: int, limit: int = None) -> list[Coordinate]:
+        """
+        Find the nearest empty zones to a given coordinate, ring by ring around it.
+        Each zone keeps a free margin of one tile and the zones do not overlap each other.
+        For a zone of size 1, only the first ring with an empty zone is searched.
+        The sides of each ring are read at once in the free squares, and only the tiles where a zone fits
+        without the units are checked on the walkability bitmap.
 
         :param coordinate: The starting coordinate.
         :type coordinate: Coordinate
         :param size: The size of the zone.
         :type size: int
+        :param limit: The maximum number of zones to return, all of them if None.
+        :type limit: int
         :return: The nearest empty coordinate.
         :rtype: list[Coordinate]
         """
-        map = self.capture()
         zone_list = []
+        claimed = {}
         radius = 1
         size += 1
-        size_checker = GameObject("", "",1)
-        size_checker.set_size(size)
-        while radius < map.get_size():
-            for x in range(coordinate.get_x() - radius, coordinate.get_x() + radius + 1):
-                if map.check_placement(size_checker, Coordinate(x, coordinate.get_y() - radius)):
-                    current = Coordinate(x,coordinate.get_y() - radius)
-                    zone_list.append(current+1)
-                    map.add(size_checker, current)
-                if map.check_placement(size_checker, Coordinate(x, coordinate.get_y() + radius)):
-                    current = Coordinate(x, coordinate.get_y() + radius)
-                    zone_list.append(current+1)
-                    map.add(size_checker,current)
-            
-            for y in range(coordinate.get_y() - radius, coordinate.get_y() + radius + 1):
-                if map.check_placement(size_checker, Coordinate(coordinate.get_x() - radius, y)):
-                    current = Coordinate(coordinate.get_x() - radius, y)
-                    zone_list.append(current+1)
-                    map.add(size_checker,current)
-                if map.check_placement(size_checker, Coordinate(coordinate.get_x() + radius, y)):
-                    current = Coordinate(coordinate.get_x() + radius, y)
-                    zone_list.append(current+1)
-                    map.add(size_checker, current)
+        map_size, width = self.__size, self.__size + 1
+        fits = Map.__FITS[min(size, Map.MAX_FREE_SQUARE)]
+        center_x, center_y = coordinate.get_x(), coordinate.get_y()
+        # The farther rings are out of the map
+        last_radius = min(map_size - 1, max(center_x, center_y, map_size - 1 - center_x, map_size - 1 - center_y))
+        while radius <= last_radius and (limit is None or len(zone_list) < limit):
+            left, right = max(center_x - radius, 0), min(center_x + radius, map_size - 1)
+            top, bottom = max(center_y - radius, 0), min(center_y + radius, map_size - 1)
+            # The top and bottom rows are claimed column by column, then the left and right columns row by row
+            rows = []
+            for side, y in enumerate((center_y - radius, center_y + radius)):
+                if 0 <= y < map_size:
+                    rows += [(left + position, side, y) for position in self.__fitting(y * width + left, y * width + right + 1, 1, fits)]
+            for x, _, y in sorted(rows):
+                self.__claim_zone(x, y, size, claimed, zone_list)
+            columns = []
+            for side, x in enumerate((center_x - radius, center_x + radius)):
+                if 0 <= x < map_size:
+                    columns += [(top + position, side, x) for position in self.__fitting(top * width + x, bottom * width + x + 1, width, fits)]
+            for y, _, x in sorted(columns):
+                self.__claim_zone(x, y, size, claimed, zone_list)
             radius += 1
-            if size ==2 and len(zone_list) > 0:
+            if size == 2 and len(zone_list) > 0:
                 break
-        return zone_list
+        return zone_list[:limit]
+
+    def __fitting(self, start: int, stop: int, step: int, fits: bytes) -> list[int]:
+        """
+        Get the tiles of a row or a column of the free squares where a zone fits, without the units.
+
+        :param start: The index of the first tile in the free squares.
+        :type start: int
+        :param stop: The index after the last tile in the free squares.
+        :type stop: int
+        :param step: 1 for a row, the width of the free squares for a column.
+        :type step: int
+        :param fits: The table translating the free squares to 1 where the zone fits, 0 elsewhere.
+        :type fits: bytes
+        :return: The positions of the tiles along the row or the column, from 0.
+        :rtype: list[int]
+        """
+        flags = self.__free_squares[start:stop:step].translate(fits)
+        positions = []
+        position = flags.find(1)
+        while position != -1:
+            positions.append(position)
+            position = flags.find(1, position + 1)
+        return positions
+
+    def __claim_zone(self, x: int, y: int, size: int, claimed: dict[tuple[int, int], list[tuple[int, int]]], zone_list: list[Coordinate]) -> None:
+        """
+        Add a zone to the list if it is free and does not overlap the zones already claimed, without writing on the map.
+
+        :param x: The x coordinate of the top left tile of the zone, margin included.
+        :type x: int
+        :param y: The y coordinate of the top left tile of the zone, margin included.
+        :type y: int
+        :param size: The size of the zone, margin included.
+        :type size: int
+        :param claimed: The top left tiles of the zones already claimed, all of the same size, grouped by cells of this size.
+        :type claimed: dict[tuple[int, int], list[tuple[int, int]]]
+        :param zone_list: The list of the zones found, inside their margin.
+        :type zone_list: list[Coordinate]
+        """
+        if not self.__is_free(x, y, size):
+            return
+        cell_x, cell_y = x // size, y // size
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                for claimed_x, claimed_y in claimed.get((cell_x + dx, cell_y + dy), ()):
+                    if abs(x - claimed_x) < size and abs(y - claimed_y) < size:
+                        return
+        claimed.setdefault((cell_x, cell_y), []).append((x, y))
+        zone_list.append(Coordinate(x + 1, y + 1))
     
-    def find_nearest_objects(self, coordinate: Coordinate, object_type: type) -> list[Coordinate]:
+    def iter_nearest_objects(self, coordinate: Coordinate, object_type: type, player: 'Player' = None) -> Iterator[Coordinate]:
+        """
+        Iterate lazily over the tiles holding an object of a type, from the nearest to the farthest (Chebyshev distance).
+        Farms are included when looking for resources.
+
+        :param coordinate: The starting coordinate.
+        :type coordinate: Coordinate
+        :param object_type: The type of the objects to find.
+        :type object_type: type
+        :param player: If given, only the entities owned by this player are found.
+        :type player: Player
+        :return: The coordinates of the tiles of the objects found.
+        :rtype: Iterator[Coordinate]
+        """
+        types = self.__spatial_index.types(object_type)
+        if object_type == Resource:
+            types += [farm_type for farm_type in self.__spatial_index.types(Farm) if farm_type not in types]
+        accepted = tuple(types)
+        extra_tiles = None
+        if self.__source is not None:
+            # The tiles changed since the snapshot may have held an object of the type
+            extra_tiles = lambda bucket: tuple(self.__overlay_buckets.get(bucket, ()))
+        for index in self.__spatial_index.nearest(coordinate.get_x(), coordinate.get_y(), types, extra_tiles):
+            object = self.__read(index % self.__size, index // self.__size)
+            # The map may have changed since the index was read
+            if not isinstance(object, accepted):
+                continue
+            if player is not None and object.get_player() != player:
+                continue
+            yield Coordinate.of(index % self.__size, index // self.__size)
+
+    def find_nearest_objects(self, coordinate: Coordinate, object_type: type, limit: int = None) -> list[Coordinate]:
         """
         Find the nearest object of the same type to a given coordinate.
 
@@ -412,30 +1128,14 @@ class Map():
         :type coordinate: Coordinate
         :param object_type: The type of the object to find.
         :type object_type: type
+        :param limit: The maximum number of coordinates to return, all of them if None.
+        :type limit: int
         :return: The list of coordinate of nearest objects of the same type.
         :rtype: List[Coordinate]
         """
-        visited = set()
-        queue = [coordinate]
-        list_of_objects = []
-        while queue:
-            current = queue.pop(0)
-            if current in visited:
-                continue
-            visited.add(current)
-            if isinstance(self.get(current), object_type):
-                list_of_objects.append(current)
-            # Include farms when searching for resources
-            if object_type == Resource and isinstance(self.get(current), Farm):
-                list_of_objects.append(current)
-            for dx, dy in Map.DIRECTIONS:
-                neighbor = Coordinate(current.get_x() + dx, current.get_y() + dy)
-                if Coordinate(0,0) <= neighbor <= Coordinate(self.get_size() - 1, self.get_size() - 1):
-                    queue.append(neighbor)
-
-        return list_of_objects
+        return list(islice(self.iter_nearest_objects(coordinate, object_type), limit))
     
-    def find_nearest_enemies(self, coordinate: Coordinate, player: 'Player') -> list[Coordinate]:
+    def find_nearest_enemies(self, coordinate: Coordinate, player: 'Player', limit: int = None) -> list[Coordinate]:
         """
         Find the nearest enemies to a given coordinate.
 
@@ -443,23 +1143,106 @@ class Map():
         :type coordinate: Coordinate
         :param player: The player to find the nearest enemy of.
         :type player: Player
+        :param limit: The maximum number of coordinates to return, all of them if None.
+        :type limit: int
         :return: A list of coordinates of the nearest enemies.
         :rtype: list[Coordinate]
         """
-        list_of_enemies_coordinate = [coord for coord in self.find_nearest_objects(coordinate, Entity) if self.get(coord).get_player() == player]
-        return list_of_enemies_coordinate
+        return list(islice(self.iter_nearest_objects(coordinate, Entity, player), limit))
     
     def capture(self) -> 'Map':
         """
-        Copy the map.
+        Copy the map. The copy of a snapshot is a map as it was when the snapshot was taken.
 
         :return: A copy of the map.
         :rtype: Map
         """
-        new_map = Map(self.__size)
-        new_map.__matrix = self.__matrix.copy()
+        live = self.__source if self.__source is not None else self
+        with live.__lock:
+            new_map = Map(self.__size)
+            new_map.__grid = array('I', self.__grid)
+            new_map.__objects = self.__objects.copy()
+            new_map.__tile_counts = self.__tile_counts.copy()
+            new_map.__next_id = self.__next_id
+            new_map.__version = self.__version
+            new_map.__walkable[:] = self.__walkable
+            new_map.__free_squares[:] = self.__free_squares
+            new_map.__spatial_index = self.__spatial_index.copy()
+            new_map.__field = self.__field.copy()
+            new_map.__path_finder.set_jump_point_search(self.__path_finder.is_jump_point_search())
+            for index, object in tuple(self.__overlay.items()):
+                new_map.__set_tile(index, object)
         return new_map
     
+    def get_save_state(self) -> dict:
+        """
+        Get the state of the map to be saved: the grid and the amounts of the resource field as flat arrays,
+        and the objects of the grid, without the structures which are rebuilt from the grid.
+
+        :return: The state of the map.
+        :rtype: dict
+        :raises ValueError: If the map is a snapshot.
+        """
+        if self.__source is not None:
+            raise ValueError("A snapshot of the map cannot be saved.")
+        with self.__lock:
+            amounts, shared = self.__field.get_save_state()
+            return {
+                'size': self.__size,
+                'grid': array('I', self.__grid),
+                'amounts': amounts,
+                'shared': shared,
+                'objects': self.__objects.copy(),
+                'tile_counts': self.__tile_counts.copy(),
+                'next_id': self.__next_id,
+                'version': self.__version,
+                'revision': self.__changes_base + len(self.__changes),
+                'jump_point_search': self.__path_finder.is_jump_point_search(),
+            }
+
+    def restore_save_state(self, state: dict) -> None:
+        """
+        Restore a saved state on a new map of the same size.
+        The walkability bitmap, the spatial index and the free squares are rebuilt from the grid, the path caches start empty.
+
+        :param state: The state of the map, as given by get_save_state.
+        :type state: dict
+        :raises ValueError: If the state is not of the size of the map.
+        """
+        if state['size'] != self.__size or len(state['grid']) != self.__size * self.__size:
+            raise ValueError("The saved map is not of the size of the map.")
+        self.__grid[:] = state['grid']
+        grid, objects = self.__grid, state['objects']
+        self.__objects = objects
+        self.__tile_counts = state['tile_counts']
+        self.__next_id = state['next_id']
+        self.__version = state['version']
+        self.__walkable[:] = bytes(not object_id for object_id in grid)
+        self.__spatial_index = SpatialIndex(self.__size)
+        indices_by_type: dict[type, list[int]] = {}
+        for index in compress(range(len(grid)), grid):
+            indices_by_type.setdefault(type(objects[grid[index]]), []).append(index)
+        for object_type, indices in indices_by_type.items():
+            self.__spatial_index.add_all(indices, object_type)
+        self.__build_free_squares()
+        self.__field.restore_save_state(state['amounts'], state['shared'])
+        self.__path_finder.set_jump_point_search(state['jump_point_search'])
+        self.__path_cache.clear()
+        if self.__hierarchical_path_finder is not None:
+            self.__hierarchical_path_finder.clear()
+        self.__flow_fields = {}
+        self.__changes = []
+        self.__changes_base = state['revision']
+
+    def get_resource_field(self) -> ResourceField:
+        """
+        Get the resource field of the map.
+
+        :return: The resource field.
+        :rtype: ResourceField
+        """
+        return self.__field
+
     def indicate_color(self, coordinate: Coordinate) -> str:
         """
         Get the color of the object coordinate.
@@ -469,20 +1252,9 @@ class Map():
         :return: The color of the coordinate.
         :rtype: str
         """
-        object: GameObject = self.get(coordinate)
+        object: GameObject = self.__read(coordinate.get_x(), coordinate.get_y())
         if object is None:
             return "white"
         if isinstance(object, Entity):
             return object.get_player().get_color()
         return "white"
-    
-    def __getstate__(self):
-        # Méthode spéciale pour la sérialisation
-        state = self.__dict__.copy()
-        state['_Map__matrix'] = dict(self.__matrix)  # Convertir defaultdict en dict pour la sérialisation
-        return state
-
-    def __setstate__(self, state):
-        # Méthode spéciale pour la désérialisation
-        self.__dict__.update(state)
-        self.__matrix = defaultdict(lambda: None, state['_Map__matrix'])
\ No newline at end of file
@@ -0,0 +1,138 @@
+import os
+import pickle
+from collections import OrderedDict
+
+"""
+This file contains the MapCache class which keeps the generated maps so that a seeded game does not generate its map again.
+"""
+
+class MapCache:
+    """
+    Cache of generated maps keyed by (seed, size, type, fps), kept in memory and optionally on disk.
+
+    A map is stored with the players and the command list it was generated with, pickled together
+    so that they keep referencing each other, and every read gives a new copy of them.
+    """
+
+    def __init__(self, directory: str = None, max_size: int = 8) -> None:
+        """
+        Create an empty cache.
+
+        :param directory: The directory where the maps are also written, None to keep them in memory only.
+        :type directory: str
+        :param max_size: The maximum number of maps kept in memory.
+        :type max_size: int
+        """
+        self.__directory: str = directory
+        self.__max_size: int = max_size
+        self.__entries: OrderedDict[tuple, bytes] = OrderedDict()
+
+    @staticmethod
+    def key(seed: int, size: int, map_type: int, fps: int) -> tuple:
+        """
+        Build the key of a generated map. The fps are part of it, as the command managers of the cached players convert times to ticks with them.
+
+        :param seed: The seed of the game.
+        :type seed: int
+        :param size: The size of the map.
+        :type size: int
+        :param map_type: The type of the map.
+        :type map_type: int
+        :param fps: The ticks per second of the game.
+        :type fps: int
+        :return: The key of the map.
+        :rtype: tuple
+        """
+        return (seed, size, map_type, fps)
+
+    def set_directory(self, directory: str) -> None:
+        """
+        Set the directory where the maps are also written.
+
+        :param directory: The directory, None to keep the maps in memory only.
+        :type directory: str
+        """
+        self.__directory = directory
+
+    def get(self, key: tuple) -> dict:
+        """
+        Get a copy of a cached map, from memory or else from disk.
+
+        :param key: The key of the map.
+        :type key: tuple
+        :return: The map, the players and the command list, None if the map is not cached.
+        :rtype: dict
+        """
+        data = self.__entries.get(key)
+        if data is not None:
+            self.__entries.move_to_end(key)
+        else:
+            path = self.__path(key)
+            if path is None or not os.path.exists(path):
+                return None
+            with open(path, 'rb') as file:
+                data = file.read()
+            self.__remember(key, data)
+        return pickle.loads(data)
+
+    def put(self, key: tuple, state: dict) -> None:
+        """
+        Cache a generated map.
+
+        :param key: The key of the map.
+        :type key: tuple
+        :param state: The map, the players and the command list.
+        :type state: dict
+        """
+        data = pickle.dumps(state)
+        self.__remember(key, data)
+        path = self.__path(key)
+        if path is not None:
+            os.makedirs(self.__directory, exist_ok=True)
+            # Written then renamed, so that a process reading the cache never sees half a map
+            temporary = f"{path}.{os.getpid()}.tmp"
+            with open(temporary, 'wb') as file:
+                file.write(data)
+            os.replace(temporary, path)
+
+    def clear(self) -> None:
+        """
+        Drop the maps kept in memory. The files are kept.
+        """
+        self.__entries.clear()
+
+    def __len__(self) -> int:
+        """
+        Get the number of maps kept in memory.
+
+        :return: The number of maps.
+        :rtype: int
+        """
+        return len(self.__entries)
+
+    def __remember(self, key: tuple, data: bytes) -> None:
+        """
+        Keep a pickled map in memory, evicting the least recently used one if the cache is full.
+
+        :param key: The key of the map.
+        :type key: tuple
+        :param data: The pickled map.
+        :type data: bytes
+        """
+        self.__entries[key] = data
+        self.__entries.move_to_end(key)
+        while len(self.__entries) > self.__max_size:
+            self.__entries.popitem(last=False)
+
+    def __path(self, key: tuple) -> str:
+        """
+        Get the file of a map.
+
+        :param key: The key of the map.
+        :type key: tuple
+        :return: The path of the file, None if the maps are kept in memory only.
+        :rtype: str
+        """
+        if self.__directory is None:
+            return None
+        return os.path.join(self.__directory, "map_" + "_".join(str(part) for part in key) + ".pkl")
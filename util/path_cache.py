@@ -0,0 +1,175 @@
+from collections import OrderedDict
+from util.coordinate import Coordinate
+
+"""
+This file contains the PathCache class which keeps the last paths found on a Map so that they can be reused.
+"""
+
+class PathCache:
+    """
+    Least recently used cache of paths, keyed by (start, end, diagonal, avoided area).
+
+    Every cached path is indexed by the tiles it walks through, so that a change on one tile
+    only drops the paths going through it. A path is also checked against the walkability bitmap
+    when it is read, since moving units are not reported to the cache.
+    Paths that were not found are never cached, as any removal could open them.
+    """
+
+    def __init__(self, walkability: bytearray, size: int, max_size: int = 512) -> None:
+        """
+        Create an empty path cache for a map.
+
+        :param walkability: The walkability bitmap of the map, indexed by ``y * size + x``.
+        :type walkability: bytearray
+        :param size: The size of the map.
+        :type size: int
+        :param max_size: The maximum number of paths kept.
+        :type max_size: int
+        """
+        self.__walkability = walkability
+        self.__size: int = size
+        self.__max_size: int = max_size
+        self.__paths: OrderedDict[tuple, list[Coordinate]] = OrderedDict()
+        self.__tiles: dict[int, set[tuple]] = {}
+        self.__hits: int = 0
+        self.__misses: int = 0
+
+    def key(self, start: Coordinate, end: Coordinate, diagonal: bool = True, avoid_from: Coordinate = None, avoid_to: Coordinate = None) -> tuple:
+        """
+        Build the key of a path request.
+
+        :param start: The starting coordinate.
+        :type start: Coordinate
+        :param end: The ending coordinate.
+        :type end: Coordinate
+        :param diagonal: True if diagonal moves are allowed.
+        :type diagonal: bool
+        :param avoid_from: The starting coordinate of the area to avoid.
+        :type avoid_from: Coordinate
+        :param avoid_to: The ending coordinate of the area to avoid.
+        :type avoid_to: Coordinate
+        :return: The key of the request.
+        :rtype: tuple
+        """
+        avoid = None
+        if avoid_from is not None and avoid_to is not None:
+            avoid = (avoid_from.get_x(), avoid_from.get_y(), avoid_to.get_x(), avoid_to.get_y())
+        return (start.get_x(), start.get_y(), end.get_x(), end.get_y(), diagonal, avoid)
+
+    def get(self, key: tuple) -> list[Coordinate]:
+        """
+        Get a copy of a cached path, counting a hit or a miss.
+        A path blocked by an object since it was cached counts as a miss and is dropped.
+
+        :param key: The key of the request.
+        :type key: tuple
+        :return: The path, None if it is not cached.
+        :rtype: list[Coordinate]
+        """
+        path = self.__paths.get(key)
+        if path is not None:
+            size = self.__size
+            if all(self.__walkability[coordinate.get_y() * size + coordinate.get_x()] for coordinate in path[:-1]):
+                self.__paths.move_to_end(key)
+                self.__hits += 1
+                return list(path)
+            self.__discard(key)
+        self.__misses += 1
+        return None
+
+    def put(self, key: tuple, path: list[Coordinate]) -> None:
+        """
+        Cache a path, evicting the least recently used one if the cache is full.
+
+        :param key: The key of the request.
+        :type key: tuple
+        :param path: The path found for the request.
+        :type path: list[Coordinate]
+        """
+        if not path:
+            return
+        if key in self.__paths:
+            self.__discard(key)
+        elif len(self.__paths) >= self.__max_size:
+            self.__discard(next(iter(self.__paths)))
+        self.__paths[key] = list(path)
+        for index in self.__indexes(path):
+            self.__tiles.setdefault(index, set()).add(key)
+
+    def invalidate(self, coordinate: Coordinate, size: int = 1) -> None:
+        """
+        Drop the paths going through a square area of the map.
+
+        :param coordinate: The top left coordinate of the area.
+        :type coordinate: Coordinate
+        :param size: The size of the area.
+        :type size: int
+        """
+        if not self.__tiles:
+            return
+        for y in range(max(coordinate.get_y(), 0), min(coordinate.get_y() + size, self.__size)):
+            for x in range(max(coordinate.get_x(), 0), min(coordinate.get_x() + size, self.__size)):
+                keys = self.__tiles.get(y * self.__size + x)
+                if keys:
+                    for key in list(keys):
+                        self.__discard(key)
+
+    def clear(self) -> None:
+        """
+        Drop every cached path. The counters are kept.
+        """
+        self.__paths.clear()
+        self.__tiles.clear()
+
+    def get_hits(self) -> int:
+        """
+        Get the number of requests answered from the cache.
+
+        :return: The number of hits.
+        :rtype: int
+        """
+        return self.__hits
+
+    def get_misses(self) -> int:
+        """
+        Get the number of requests that had to be searched.
+
+        :return: The number of misses.
+        :rtype: int
+        """
+        return self.__misses
+
+    def __len__(self) -> int:
+        """
+        Get the number of cached paths.
+
+        :return: The number of cached paths.
+        :rtype: int
+        """
+        return len(self.__paths)
+
+    def __indexes(self, path: list[Coordinate]) -> set[int]:
+        """
+        Get the tile indexes a path walks through.
+
+        :param path: The path.
+        :type path: list[Coordinate]
+        :return: The indexes of the tiles of the path.
+        :rtype: set[int]
+        """
+        return {coordinate.get_y() * self.__size + coordinate.get_x() for coordinate in path}
+
+    def __discard(self, key: tuple) -> None:
+        """
+        Remove a path from the cache and from the tile index.
+
+        :param key: The key of the path.
+        :type key: tuple
+        """
+        path = self.__paths.pop(key)
+        for index in self.__indexes(path):
+            keys = self.__tiles.get(index)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self.__tiles[index]
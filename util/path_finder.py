@@ -0,0 +1,347 @@
+import heapq
+from util.coordinate import Coordinate
+
+"""
+This file contains the PathFinder class which searches paths directly on the walkability bitmap of a Map.
+"""
+
+SQRT2 = 2 ** 0.5
+
+class PathFinder:
+    """
+    Grid path finder working directly on a walkability bitmap indexed by ``y * size + x`` (1 for a free tile, 0 otherwise).
+    It uses a heapq based A* with an octile heuristic (manhattan without diagonals),
+    and can use Jump Point Search for diagonal paths.
+
+    Diagonal moves are always allowed, even between two occupied tiles, like the units of the game do.
+    The start and end tiles are always considered walkable, so that a path can lead to a building or a resource.
+    """
+    STRAIGHT = ((1, 0), (-1, 0), (0, 1), (0, -1))
+    DIAGONAL = ((1, 1), (1, -1), (-1, 1), (-1, -1))
+
+    def __init__(self, walkability: bytearray, size: int, jump_point_search: bool = False) -> None:
+        """
+        Create a path finder reading the given walkability bitmap.
+
+        :param walkability: The walkability bitmap, read at each search.
+        :type walkability: bytearray
+        :param size: The size of the map.
+        :type size: int
+        :param jump_point_search: True to use Jump Point Search for diagonal paths, False to use A*.
+        :type jump_point_search: bool
+        """
+        self.__walkability = walkability
+        self.__size: int = size
+        self.__jump_point_search: bool = jump_point_search
+
+    def is_jump_point_search(self) -> bool:
+        """
+        Check if Jump Point Search is used for diagonal paths.
+
+        :return: True if Jump Point Search is used, False otherwise.
+        :rtype: bool
+        """
+        return self.__jump_point_search
+
+    def set_jump_point_search(self, jump_point_search: bool) -> None:
+        """
+        Choose whether Jump Point Search is used for diagonal paths.
+
+        :param jump_point_search: True to use Jump Point Search, False to use A*.
+        :type jump_point_search: bool
+        """
+        self.__jump_point_search = jump_point_search
+
+    def find_path(self, start: Coordinate, end: Coordinate, diagonal: bool = True, avoid_from: Coordinate = None, avoid_to: Coordinate = None, bounds: tuple[int, int, int, int] = None) -> list[Coordinate]:
+        """
+        Find the path to go from start to end.
+
+        :param start: The starting coordinate.
+        :type start: Coordinate
+        :param end: The ending coordinate.
+        :type end: Coordinate
+        :param diagonal: True to allow diagonal moves, False otherwise.
+        :type diagonal: bool
+        :param avoid_from: The starting coordinate of an area to avoid (the end tile stays reachable).
+        :type avoid_from: Coordinate
+        :param avoid_to: The ending coordinate of an area to avoid.
+        :type avoid_to: Coordinate
+        :param bounds: The (min x, min y, max x, max y) area the path has to stay in, the whole map if None. A* is always used when given.
+        :type bounds: tuple[int, int, int, int]
+        :return: The coordinates to walk through, without the start and ending with the end. Empty if there is no path.
+        :rtype: list[Coordinate]
+        """
+        size = self.__size
+        if not (0 <= start.get_x() < size and 0 <= start.get_y() < size and 0 <= end.get_x() < size and 0 <= end.get_y() < size):
+            return []
+        walkable = bytearray(self.__walkability)
+        start_index = start.get_y() * size + start.get_x()
+        end_index = end.get_y() * size + end.get_x()
+        walkable[start_index] = 1
+        if avoid_from is not None and avoid_to is not None:
+            for y in range(max(avoid_from.get_y(), 0), min(avoid_to.get_y() + 1, size)):
+                for x in range(max(avoid_from.get_x(), 0), min(avoid_to.get_x() + 1, size)):
+                    walkable[y * size + x] = 0
+        walkable[end_index] = 1
+
+        if diagonal and self.__jump_point_search and bounds is None:
+            indexes = self.__jump_point_search_path(walkable, start_index, end_index)
+        else:
+            indexes = self.__a_star(walkable, start_index, end_index, diagonal, bounds or (0, 0, size - 1, size - 1))
+        return [Coordinate.of(index % size, index // size) for index in indexes]
+
+    def __heuristic(self, index: int, end_index: int, diagonal: bool) -> float:
+        """
+        Estimate the cost between two tiles: octile distance with diagonals, manhattan distance otherwise.
+
+        :param index: The index of the tile.
+        :type index: int
+        :param end_index: The index of the end tile.
+        :type end_index: int
+        :param diagonal: True if diagonal moves are allowed.
+        :type diagonal: bool
+        :return: The estimated cost.
+        :rtype: float
+        """
+        size = self.__size
+        dx = abs(index % size - end_index % size)
+        dy = abs(index // size - end_index // size)
+        if diagonal:
+            return dx + dy + (SQRT2 - 2) * min(dx, dy)
+        return dx + dy
+
+    def __rebuild(self, parents: dict[int, int], end_index: int) -> list[int]:
+        """
+        Rebuild the list of tiles from the parents of the search, without the start tile.
+
+        :param parents: The parent of each reached tile.
+        :type parents: dict[int, int]
+        :param end_index: The index of the end tile.
+        :type end_index: int
+        :return: The indexes of the tiles, from the tile after the start to the end.
+        :rtype: list[int]
+        """
+        path = []
+        current = end_index
+        while parents[current] is not None:
+            path.append(current)
+            current = parents[current]
+        path.reverse()
+        return path
+
+    def __a_star(self, walkable: bytearray, start_index: int, end_index: int, diagonal: bool, bounds: tuple[int, int, int, int]) -> list[int]:
+        """
+        Search the path with A*.
+
+        :param walkable: The walkability bitmap to search on.
+        :type walkable: bytearray
+        :param start_index: The index of the start tile.
+        :type start_index: int
+        :param end_index: The index of the end tile.
+        :type end_index: int
+        :param diagonal: True if diagonal moves are allowed.
+        :type diagonal: bool
+        :param bounds: The (min x, min y, max x, max y) area the search stays in.
+        :type bounds: tuple[int, int, int, int]
+        :return: The indexes of the tiles of the path, without the start tile.
+        :rtype: list[int]
+        """
+        size = self.__size
+        min_x, min_y, max_x, max_y = bounds
+        moves = [(dx, dy, 1.0) for dx, dy in PathFinder.STRAIGHT]
+        if diagonal:
+            moves += [(dx, dy, SQRT2) for dx, dy in PathFinder.DIAGONAL]
+        end_x, end_y = end_index % size, end_index // size
+        costs: dict[int, float] = {start_index: 0.0}
+        parents: dict[int, int] = {start_index: None}
+        closed: set[int] = set()
+        start_h = self.__heuristic(start_index, end_index, diagonal)
+        open_list = [(start_h, start_h, start_index)]
+        while open_list:
+            _, _, current = heapq.heappop(open_list)
+            if current == end_index:
+                return self.__rebuild(parents, end_index)
+            if current in closed:
+                continue
+            closed.add(current)
+            cost = costs[current]
+            x, y = current % size, current // size
+            for dx, dy, step in moves:
+                nx, ny = x + dx, y + dy
+                if nx < min_x or ny < min_y or nx > max_x or ny > max_y:
+                    continue
+                neighbour = ny * size + nx
+                if not walkable[neighbour] or neighbour in closed:
+                    continue
+                new_cost = cost + step
+                if new_cost < costs.get(neighbour, float('inf')):
+                    costs[neighbour] = new_cost
+                    parents[neighbour] = current
+                    hx, hy = abs(nx - end_x), abs(ny - end_y)
+                    h = hx + hy + (SQRT2 - 2) * min(hx, hy) if diagonal else hx + hy
+                    heapq.heappush(open_list, (new_cost + h, h, neighbour))
+        return []
+
+    def __is_walkable(self, walkable: bytearray, x: int, y: int) -> bool:
+        """
+        Check if a tile is inside the map and walkable.
+
+        :param walkable: The walkability bitmap.
+        :type walkable: bytearray
+        :param x: The x coordinate of the tile.
+        :type x: int
+        :param y: The y coordinate of the tile.
+        :type y: int
+        :return: True if the tile is walkable, False otherwise.
+        :rtype: bool
+        """
+        return 0 <= x < self.__size and 0 <= y < self.__size and walkable[y * self.__size + x] == 1
+
+    def __jump(self, walkable: bytearray, x: int, y: int, dx: int, dy: int, end_index: int) -> int:
+        """
+        Walk from a tile in a direction until a jump point is found.
+
+        :param walkable: The walkability bitmap.
+        :type walkable: bytearray
+        :param x: The x coordinate of the first tile to check.
+        :type x: int
+        :param y: The y coordinate of the first tile to check.
+        :type y: int
+        :param dx: The x direction.
+        :type dx: int
+        :param dy: The y direction.
+        :type dy: int
+        :param end_index: The index of the end tile.
+        :type end_index: int
+        :return: The index of the jump point, -1 if the walk reached an obstacle.
+        :rtype: int
+        """
+        is_walkable = self.__is_walkable
+        while True:
+            if not is_walkable(walkable, x, y):
+                return -1
+            index = y * self.__size + x
+            if index == end_index:
+                return index
+            if dx and dy:
+                if (is_walkable(walkable, x - dx, y + dy) and not is_walkable(walkable, x - dx, y)) or \
+                        (is_walkable(walkable, x + dx, y - dy) and not is_walkable(walkable, x, y - dy)):
+                    return index
+                if self.__jump(walkable, x + dx, y, dx, 0, end_index) != -1 or self.__jump(walkable, x, y + dy, 0, dy, end_index) != -1:
+                    return index
+            elif dx:
+                if (is_walkable(walkable, x + dx, y + 1) and not is_walkable(walkable, x, y + 1)) or \
+                        (is_walkable(walkable, x + dx, y - 1) and not is_walkable(walkable, x, y - 1)):
+                    return index
+            else:
+                if (is_walkable(walkable, x + 1, y + dy) and not is_walkable(walkable, x + 1, y)) or \
+                        (is_walkable(walkable, x - 1, y + dy) and not is_walkable(walkable, x - 1, y)):
+                    return index
+            x += dx
+            y += dy
+
+    def __jump_directions(self, walkable: bytearray, index: int, parent: int) -> list[tuple[int, int]]:
+        """
+        Get the directions to explore from a jump point, pruning the ones reachable more cheaply from its parent.
+
+        :param walkable: The walkability bitmap.
+        :type walkable: bytearray
+        :param index: The index of the jump point.
+        :type index: int
+        :param parent: The index of the parent jump point, None for the start tile.
+        :type parent: int
+        :return: The list of directions (dx, dy).
+        :rtype: list[tuple[int, int]]
+        """
+        if parent is None:
+            return list(PathFinder.STRAIGHT + PathFinder.DIAGONAL)
+        size = self.__size
+        is_walkable = self.__is_walkable
+        x, y = index % size, index // size
+        dx = (x > parent % size) - (x < parent % size)
+        dy = (y > parent // size) - (y < parent // size)
+        directions = []
+        if dx and dy:
+            directions += [(0, dy), (dx, 0), (dx, dy)]
+            if not is_walkable(walkable, x - dx, y):
+                directions.append((-dx, dy))
+            if not is_walkable(walkable, x, y - dy):
+                directions.append((dx, -dy))
+        elif dx:
+            directions.append((dx, 0))
+            if not is_walkable(walkable, x, y + 1):
+                directions.append((dx, 1))
+            if not is_walkable(walkable, x, y - 1):
+                directions.append((dx, -1))
+        else:
+            directions.append((0, dy))
+            if not is_walkable(walkable, x + 1, y):
+                directions.append((1, dy))
+            if not is_walkable(walkable, x - 1, y):
+                directions.append((-1, dy))
+        return directions
+
+    def __jump_point_search_path(self, walkable: bytearray, start_index: int, end_index: int) -> list[int]:
+        """
+        Search the path with Jump Point Search, then expand the jump points into adjacent tiles.
+
+        :param walkable: The walkability bitmap to search on.
+        :type walkable: bytearray
+        :param start_index: The index of the start tile.
+        :type start_index: int
+        :param end_index: The index of the end tile.
+        :type end_index: int
+        :return: The indexes of the tiles of the path, without the start tile.
+        :rtype: list[int]
+        """
+        size = self.__size
+        costs: dict[int, float] = {start_index: 0.0}
+        parents: dict[int, int] = {start_index: None}
+        closed: set[int] = set()
+        start_h = self.__heuristic(start_index, end_index, True)
+        open_list = [(start_h, start_h, start_index)]
+        while open_list:
+            _, _, current = heapq.heappop(open_list)
+            if current == end_index:
+                return self.__expand(self.__rebuild(parents, end_index), start_index)
+            if current in closed:
+                continue
+            closed.add(current)
+            x, y = current % size, current // size
+            for dx, dy in self.__jump_directions(walkable, current, parents[current]):
+                jump_point = self.__jump(walkable, x + dx, y + dy, dx, dy, end_index)
+                if jump_point == -1 or jump_point in closed:
+                    continue
+                distance_x = abs(jump_point % size - x)
+                distance_y = abs(jump_point // size - y)
+                new_cost = costs[current] + max(distance_x, distance_y) + (SQRT2 - 1) * min(distance_x, distance_y)
+                if new_cost < costs.get(jump_point, float('inf')):
+                    costs[jump_point] = new_cost
+                    parents[jump_point] = current
+                    h = self.__heuristic(jump_point, end_index, True)
+                    heapq.heappush(open_list, (new_cost + h, h, jump_point))
+        return []
+
+    def __expand(self, jump_points: list[int], start_index: int) -> list[int]:
+        """
+        Expand a list of jump points into the list of every tile walked through.
+
+        :param jump_points: The jump points of the path, without the start tile.
+        :type jump_points: list[int]
+        :param start_index: The index of the start tile.
+        :type start_index: int
+        :return: The indexes of every tile of the path, without the start tile.
+        :rtype: list[int]
+        """
+        size = self.__size
+        path = []
+        x, y = start_index % size, start_index // size
+        for jump_point in jump_points:
+            target_x, target_y = jump_point % size, jump_point // size
+            dx = (target_x > x) - (target_x < x)
+            dy = (target_y > y) - (target_y < y)
+            while (x, y) != (target_x, target_y):
+                x += dx
+                y += dy
+                path.append(y * size + x)
+        return path
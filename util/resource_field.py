@@ -0,0 +1,172 @@
+import weakref
+from array import array
+from model.resources.resource import Resource
+from util.coordinate import Coordinate
+
+"""
+This file contains the ResourceField class which keeps the amounts of the resources generated with a Map.
+"""
+
+class ResourceField:
+    """
+    Compact storage of the resource tiles of a map: one shared resource per type and a flat array of amounts
+    indexed by ``y * size + x``, instead of one game object per tile.
+
+    On the grid of the map, a resource tile holds the id of the shared resource of its type, so that the type of every tile
+    stays in the grid. A Resource bound to its tile is only created when the tile is read, and kept as long as it is used,
+    so that two reads of a tile give the same object.
+    """
+
+    def __init__(self, size: int) -> None:
+        """
+        Create an empty resource field for a map.
+
+        :param size: The size of the map.
+        :type size: int
+        """
+        self.__size: int = size
+        self.__amounts: array = array('I', [0]) * (size * size)
+        self.__shared: dict[type, Resource] = {}
+        self.__resources: weakref.WeakValueDictionary[int, Resource] = weakref.WeakValueDictionary()
+
+    def __getstate__(self) -> dict:
+        """
+        Get the state of the field to be pickled, without the resources in use.
+
+        :return: The state of the field.
+        :rtype: dict
+        """
+        state = self.__dict__.copy()
+        state['_ResourceField__resources'] = None
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        """
+        Restore the state of a pickled field.
+
+        :param state: The state of the field.
+        :type state: dict
+        """
+        self.__dict__.update(state)
+        self.__resources = weakref.WeakValueDictionary()
+
+    def get_shared(self, resource_type: type) -> Resource:
+        """
+        Get the resource shared by all the tiles of a type, which the grid of the map points to.
+
+        :param resource_type: The type of the resource.
+        :type resource_type: type
+        :return: The shared resource.
+        :rtype: Resource
+        """
+        shared = self.__shared.get(resource_type)
+        if shared is None:
+            shared = self.__shared[resource_type] = resource_type()
+        return shared
+
+    def is_shared(self, object: object) -> bool:
+        """
+        Check if an object is the shared resource of its type.
+
+        :param object: The object read on the grid.
+        :type object: object
+        :return: True if the object stands for a resource tile of the field, False otherwise.
+        :rtype: bool
+        """
+        return object is not None and self.__shared.get(type(object)) is object
+
+    def fill_all(self, indices: list[int], resource_type: type) -> None:
+        """
+        Give many tiles the full amount of a type of resource.
+
+        :param indices: The indices of the tiles.
+        :type indices: list[int]
+        :param resource_type: The type of the resource.
+        :type resource_type: type
+        """
+        amounts, amount = self.__amounts, self.get_shared(resource_type).get_amount()
+        for index in indices:
+            amounts[index] = amount
+        if self.__resources:
+            for index in indices:
+                self.__resources.pop(index, None)
+
+    def get_amount(self, index: int) -> int:
+        """
+        Get the amount left on a tile.
+
+        :param index: The index of the tile.
+        :type index: int
+        :return: The amount.
+        :rtype: int
+        """
+        return self.__amounts[index]
+
+    def set_amount(self, index: int, amount: int) -> None:
+        """
+        Set the amount left on a tile.
+
+        :param index: The index of the tile.
+        :type index: int
+        :param amount: The amount.
+        :type amount: int
+        """
+        self.__amounts[index] = amount
+
+    def get_resource(self, index: int, shared: Resource, keep: bool = True) -> Resource:
+        """
+        Get the resource of a tile, bound to the field, creating it if it is not in use.
+
+        :param index: The index of the tile.
+        :type index: int
+        :param shared: The shared resource read on the tile.
+        :type shared: Resource
+        :param keep: True to keep a created resource while it is in use, False not to write on the field, as for the reads of a snapshot.
+        :type keep: bool
+        :return: The resource of the tile.
+        :rtype: Resource
+        """
+        resource = self.__resources.get(index)
+        if resource is None or type(resource) is not type(shared):
+            resource = type(shared)()
+            resource.bind(self, index)
+            resource.set_coordinate(Coordinate.of(index % self.__size, index // self.__size))
+            if keep:
+                self.__resources[index] = resource
+        return resource
+
+    def get_save_state(self) -> tuple[array, dict[type, Resource]]:
+        """
+        Get the state of the field to be saved.
+
+        :return: A copy of the amounts of the tiles, and the shared resource of each type.
+        :rtype: tuple[array, dict[type, Resource]]
+        """
+        return array('I', self.__amounts), self.__shared.copy()
+
+    def restore_save_state(self, amounts: array, shared: dict[type, Resource]) -> None:
+        """
+        Restore a saved state on the field.
+
+        :param amounts: The amounts of the tiles.
+        :type amounts: array
+        :param shared: The shared resource of each type.
+        :type shared: dict[type, Resource]
+        """
+        self.__amounts = amounts
+        self.__shared = shared
+        self.__resources = weakref.WeakValueDictionary()
+
+    def copy(self) -> 'ResourceField':
+        """
+        Copy the field. The copy shares the resources of each type, but not the resources of the tiles.
+
+        :return: A copy of the field.
+        :rtype: ResourceField
+        """
+        new_field = ResourceField.__new__(ResourceField)
+        new_field.__size = self.__size
+        new_field.__amounts = array('I', self.__amounts)
+        new_field.__shared = self.__shared.copy()
+        new_field.__resources = weakref.WeakValueDictionary()
+        return new_field
@@ -0,0 +1,445 @@
+import io
+import json
+import lzma
+import os
+import pickle
+import struct
+import sys
+import zlib
+from array import array
+from datetime import datetime
+from controller.command_scheduler import CommandScheduler
+from model.entity import Entity
+from util.map import Map
+from util.settings import Settings
+from util.state_manager import FPS, MapType, StartingCondition
+import typing
+if typing.TYPE_CHECKING:
+    from model.player.player import Player
+
+"""
+This file contains the SaveFile class which writes and reads the saved games.
+"""
+
+class SaveFile:
+    """
+    A saved game, made of typed sections:
+
+    - ``HEAD``: the settings, the tick, the players and their resources, as JSON, never compressed so that it can be read alone;
+    - ``THMB``: a thumbnail of the map, never compressed, written right after the header so that it is read without the rest:
+      the letter of the main object of each square of tiles and the player owning it;
+    - ``GRID``: the object id of every tile of the map, as a flat array of 32-bit integers;
+    - ``AMNT``: the amount left on every resource tile, as a flat array of 32-bit integers;
+    - ``OBJS``: the table of the objects of the grid, the players and the pending commands, pickled together
+      so that they keep referencing each other. The map and its resource field are written as references,
+      so that the structures rebuilt from the grid (walkability, spatial index, path caches) are never written.
+
+    The file starts with ``MAGIC`` and the version of the format, then each section is written as its tag,
+    its compression, its length and its data. A SaveFile is captured from the game in memory, then written,
+    so that the game only waits for the capture and the compression and the writing can run on another thread.
+    Reading a save skips the sections it does not need, so that the thumbnail costs nothing to a loaded game.
+    """
+    MAGIC = b"AIGESAVE"
+    VERSION = 1
+    EXTENSION = ".sav"
+    RAW = 0
+    ZLIB = 1
+    LZMA = 2
+    THUMBNAIL_SIZE = 40
+    __PREFIX = struct.Struct("<8sH")
+    __SECTION = struct.Struct("<4sBI")
+    __SIZE = struct.Struct("<I")
+
+    def __init__(self, header: dict, sections: dict[bytes, bytes], thumbnail: tuple = None) -> None:
+        """
+        Create a save from its sections.
+
+        :param header: The header of the game.
+        :type header: dict
+        :param sections: The data of each section but the header and the thumbnail, by tag.
+        :type sections: dict[bytes, bytes]
+        :param thumbnail: What the thumbnail is drawn from when the save is written, as given by __capture_thumbnail, None for no thumbnail.
+        :type thumbnail: tuple
+        """
+        self.__header: dict = header
+        self.__sections: dict[bytes, bytes] = sections
+        self.__thumbnail: tuple = thumbnail
+
+    def get_header(self) -> dict:
+        """
+        Get the header of the game.
+
+        :return: The header.
+        :rtype: dict
+        """
+        return self.__header
+
+    @staticmethod
+    def capture(settings: Settings, map: Map, players: list['Player'], command_list: 'CommandScheduler') -> 'SaveFile':
+        """
+        Capture a game in memory. The game must not change during the capture, which is why nothing is compressed here.
+
+        :param settings: The settings of the game.
+        :type settings: Settings
+        :param map: The map.
+        :type map: Map
+        :param players: The players.
+        :type players: list[Player]
+        :param command_list: The pending commands.
+        :type command_list: CommandScheduler
+        :return: The save.
+        :rtype: SaveFile
+        """
+        state = map.get_save_state()
+        grid, amounts = state.pop('grid'), state.pop('amounts')
+        buffer = io.BytesIO()
+        pickler = pickle.Pickler(buffer, pickle.HIGHEST_PROTOCOL)
+        field = map.get_resource_field()
+        # The map, its snapshots and its resource field are written as references to the map being loaded
+        pickler.persistent_id = lambda object: "map" if isinstance(object, Map) else "field" if object is field else None
+        pickler.dump({'settings': settings, 'map': state, 'players': players, 'command_list': command_list})
+        thumbnail = SaveFile.__capture_thumbnail(state['size'], grid, state['objects'], players)
+        header = {
+            "version": SaveFile.VERSION,
+            "time": datetime.now().isoformat(timespec="seconds"),
+            "tick": command_list.get_now(),
+            "map_size": state['size'],
+            "map_type": MapType(settings.map_type).name,
+            "starting_condition": StartingCondition(settings.starting_condition).name,
+            "fps": FPS(settings.fps).name,
+            "seed": settings.seed,
+            "players": [player.get_name() for player in players],
+            "colors": [player.get_color() for player in players],
+            "resources": [{type(resource).__name__: amount for resource, amount in player.get_resources().items()} for player in players],
+            "units": [len(player.get_units()) for player in players],
+            "buildings": [len(player.get_buildings()) for player in players],
+        }
+        return SaveFile(header, {
+            b"GRID": SaveFile.__SIZE.pack(state['size']) + SaveFile.__to_bytes(grid),
+            b"AMNT": SaveFile.__to_bytes(amounts),
+            b"OBJS": buffer.getvalue(),
+        }, thumbnail)
+
+    def write(self, path: str, compression: int = ZLIB) -> None:
+        """
+        Write the save to a file. It is written to a temporary file first, so that a file with the same name is only replaced once the save is complete.
+
+        :param path: The path of the file.
+        :type path: str
+        :param compression: The compression of the sections, RAW, ZLIB or LZMA.
+        :type compression: int
+        """
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, 'wb') as file:
+            file.write(SaveFile.__PREFIX.pack(SaveFile.MAGIC, SaveFile.VERSION))
+            SaveFile.__write_section(file, b"HEAD", SaveFile.RAW, json.dumps(self.__header).encode('utf-8'))
+            if self.__thumbnail is not None:
+                SaveFile.__write_section(file, b"THMB", SaveFile.RAW, SaveFile.__draw_thumbnail(*self.__thumbnail))
+            for tag, data in self.__sections.items():
+                SaveFile.__write_section(file, tag, compression, SaveFile.__compress(data, compression))
+        os.replace(temporary, path)
+
+    @staticmethod
+    def read_header(path: str) -> dict:
+        """
+        Read the header of a saved game, without reading the rest of the file.
+
+        :param path: The path of the file.
+        :type path: str
+        :return: The header.
+        :rtype: dict
+        :raises ValueError: If the file is not a saved game.
+        """
+        with open(path, 'rb') as file:
+            SaveFile.__read_prefix(file)
+            tag, data = SaveFile.__read_section(file)
+        if tag != b"HEAD":
+            raise ValueError(f"{path} has no header.")
+        return json.loads(data.decode('utf-8'))
+
+    @staticmethod
+    def read_thumbnail(path: str) -> tuple[int, bytes, bytes]:
+        """
+        Read the thumbnail of a saved game, without reading the rest of the file.
+
+        :param path: The path of the file.
+        :type path: str
+        :return: The width of the thumbnail, the letter of each square and the player owning it, from 1, 0 for none, row by row.
+            None if the save has no thumbnail.
+        :rtype: tuple[int, bytes, bytes]
+        :raises ValueError: If the file is not a saved game.
+        """
+        with open(path, 'rb') as file:
+            SaveFile.__read_prefix(file)
+            SaveFile.__read_section(file)
+            section = SaveFile.__read_section(file)
+        if section is None or section[0] != b"THMB":
+            return None
+        data = section[1]
+        size = SaveFile.__SIZE.unpack_from(data)[0]
+        letters = data[SaveFile.__SIZE.size:SaveFile.__SIZE.size + size * size]
+        return size, letters, data[SaveFile.__SIZE.size + size * size:]
+
+    @staticmethod
+    def read(path: str) -> dict:
+        """
+        Read a saved game and rebuild its map.
+
+        :param path: The path of the file.
+        :type path: str
+        :return: The settings, the map, the players, the pending commands and the header of the game.
+        :rtype: dict
+        :raises ValueError: If the file is not a saved game or a section is missing.
+        """
+        needed = {b"HEAD", b"GRID", b"AMNT", b"OBJS"}
+        sections = {}
+        with open(path, 'rb') as file:
+            SaveFile.__read_prefix(file)
+            while True:
+                section = SaveFile.__read_section(file, needed)
+                if section is None:
+                    break
+                if section[0] in needed:
+                    sections[section[0]] = section[1]
+        missing = needed - sections.keys()
+        if missing:
+            raise ValueError(f"{path} is missing the sections {sorted(missing)}.")
+        return SaveFile(json.loads(sections.pop(b"HEAD").decode('utf-8')), sections).load()
+
+    @staticmethod
+    def read_pickle(path: str) -> dict:
+        """
+        Read a game pickled by the previous versions, in a ``.pkl`` file.
+        Its maps, the map of the game and the maps known by the AIs, are rebuilt on a grid from their matrix,
+        and its list of pending commands is replaced by a scheduler, wherever the players and the commands referenced it.
+
+        :param path: The path of the file.
+        :type path: str
+        :return: The settings, the map, the players and the pending commands of the game.
+        :rtype: dict
+        """
+        with open(path, 'rb') as file:
+            game = pickle.load(file)
+        game['map'].restore_matrix()
+        for player in game['players']:
+            if player.get_ai() is not None and player.get_ai().get_map_known() is not None:
+                player.get_ai().get_map_known().restore_matrix()
+        commands = game['command_list']
+        if isinstance(commands, list):
+            scheduler = CommandScheduler()
+            for holder in [player.get_command_manager() for player in game['players']] + commands:
+                for name, value in vars(holder).items():
+                    if value is commands:
+                        setattr(holder, name, scheduler)
+            for command in commands:
+                command.push_command_to_list(scheduler)
+            game['command_list'] = scheduler
+        return game
+
+    def load(self) -> dict:
+        """
+        Rebuild the saved game, without writing it to a file. Every call gives a new copy of the game.
+
+        :return: The settings, the map, the players, the pending commands and the header of the game.
+        :rtype: dict
+        """
+        sections = self.__sections
+        size = SaveFile.__SIZE.unpack_from(sections[b"GRID"])[0]
+        map = Map(size)
+        unpickler = pickle.Unpickler(io.BytesIO(sections[b"OBJS"]))
+        references = {"map": map, "field": map.get_resource_field()}
+        unpickler.persistent_load = references.__getitem__
+        game = unpickler.load()
+        state = game['map']
+        state['grid'] = SaveFile.__from_bytes(sections[b"GRID"][SaveFile.__SIZE.size:])
+        state['amounts'] = SaveFile.__from_bytes(sections[b"AMNT"])
+        map.restore_save_state(state)
+        game['map'] = map
+        game['header'] = dict(self.__header)
+        return game
+
+    @staticmethod
+    def __write_section(file: typing.BinaryIO, tag: bytes, compression: int, data: bytes) -> None:
+        """
+        Write a section.
+
+        :param file: The file.
+        :type file: typing.BinaryIO
+        :param tag: The tag of the section.
+        :type tag: bytes
+        :param compression: The compression of the data.
+        :type compression: int
+        :param data: The data, already compressed.
+        :type data: bytes
+        """
+        file.write(SaveFile.__SECTION.pack(tag, compression, len(data)))
+        file.write(data)
+
+    @staticmethod
+    def __read_prefix(file: typing.BinaryIO) -> None:
+        """
+        Read the magic number and the version at the start of a file.
+
+        :param file: The file.
+        :type file: typing.BinaryIO
+        :raises ValueError: If the file is not a saved game of a known version.
+        """
+        prefix = file.read(SaveFile.__PREFIX.size)
+        if len(prefix) != SaveFile.__PREFIX.size:
+            raise ValueError("The file is not a saved game.")
+        magic, version = SaveFile.__PREFIX.unpack(prefix)
+        if magic != SaveFile.MAGIC:
+            raise ValueError("The file is not a saved game.")
+        if version > SaveFile.VERSION:
+            raise ValueError(f"The saved game has the version {version} of the format, only {SaveFile.VERSION} is known.")
+
+    @staticmethod
+    def __read_section(file: typing.BinaryIO, tags: set[bytes] = None) -> tuple[bytes, bytes]:
+        """
+        Read the next section of a file.
+
+        :param file: The file.
+        :type file: typing.BinaryIO
+        :param tags: The tags of the sections to read, the data of the others being skipped, all of them if None.
+        :type tags: set[bytes]
+        :return: The tag and the decompressed data of the section, None as data for a skipped section, None at the end of the file.
+        :rtype: tuple[bytes, bytes]
+        :raises ValueError: If the section is truncated or its compression is unknown.
+        """
+        prefix = file.read(SaveFile.__SECTION.size)
+        if not prefix:
+            return None
+        if len(prefix) != SaveFile.__SECTION.size:
+            raise ValueError("The saved game is truncated.")
+        tag, compression, length = SaveFile.__SECTION.unpack(prefix)
+        if tags is not None and tag not in tags:
+            file.seek(length, os.SEEK_CUR)
+            return tag, None
+        data = file.read(length)
+        if len(data) != length:
+            raise ValueError("The saved game is truncated.")
+        if compression == SaveFile.ZLIB:
+            return tag, zlib.decompress(data)
+        if compression == SaveFile.LZMA:
+            return tag, lzma.decompress(data)
+        if compression == SaveFile.RAW:
+            return tag, data
+        raise ValueError(f"Unknown compression {compression}.")
+
+    @staticmethod
+    def __capture_thumbnail(size: int, grid: array, objects: dict, players: list['Player']) -> tuple:
+        """
+        Capture what the thumbnail of a map is drawn from: the squares of the entities, placed from the objects,
+        and the letters of the resources, whose tiles are only found in the grid, which is why they are sampled when the save is written.
+
+        :param size: The size of the map.
+        :type size: int
+        :param grid: A copy of the object id of every tile.
+        :type grid: array
+        :param objects: The objects of the grid, by id.
+        :type objects: dict
+        :param players: The players.
+        :type players: list[Player]
+        :return: The size of the map, the grid, the letter of each square, the player owning it and the letter of each resource by id.
+        :rtype: tuple
+        """
+        width = min(SaveFile.THUMBNAIL_SIZE, size)
+        letters, owners = bytearray(b" " * (width * width)), bytearray(width * width)
+        owner_indexes = {id(player): index + 1 for index, player in enumerate(players)}
+        resources = {}
+        for object_id, object in objects.items():
+            coordinate = object.get_coordinate()
+            if coordinate is None:
+                resources[object_id] = ord(object.get_letter()[0])
+            elif isinstance(object, Entity):
+                square = coordinate.get_y() * width // size * width + coordinate.get_x() * width // size
+                if letters[square] == 32:
+                    letters[square] = ord(object.get_letter()[0])
+                    owners[square] = owner_indexes.get(id(object.get_player()), 0)
+        return size, grid, letters, owners, resources
+
+    @staticmethod
+    def __draw_thumbnail(size: int, grid: array, letters: bytearray, owners: bytearray, resources: dict[int, int]) -> bytes:
+        """
+        Draw the thumbnail of a map: each square of tiles shows its first entity, else a resource of its tiles.
+        The resources are sampled three tiles per side of a square at most, so that the thumbnail costs the same on every size of map.
+
+        :param size: The size of the map.
+        :type size: int
+        :param grid: The object id of every tile.
+        :type grid: array
+        :param letters: The letter of the entity of each square, a space if there is none.
+        :type letters: bytearray
+        :param owners: The player owning the entity of each square, from 1, 0 for none.
+        :type owners: bytearray
+        :param resources: The letter of each resource, by id.
+        :type resources: dict[int, int]
+        :return: The width of the thumbnail, then the letter of each square, a space if it is empty, then the player owning it.
+        :rtype: bytes
+        """
+        width = int(len(letters) ** 0.5)
+        letters = bytearray(letters)
+        step = max(1, size // width // 3)
+        for square in range(width * width):
+            if letters[square] != 32:
+                continue
+            from_x, from_y = square % width * size // width, square // width * size // width
+            to_x, to_y = (square % width + 1) * size // width, (square // width + 1) * size // width
+            for y in range(from_y, to_y, step):
+                found = resources.keys() & grid[y * size + from_x:y * size + to_x:step]
+                if found:
+                    letters[square] = resources[min(found)]
+                    break
+        return SaveFile.__SIZE.pack(width) + bytes(letters) + bytes(owners)
+
+    @staticmethod
+    def __compress(data: bytes, compression: int) -> bytes:
+        """
+        Compress the data of a section.
+
+        :param data: The data.
+        :type data: bytes
+        :param compression: The compression, RAW, ZLIB or LZMA.
+        :type compression: int
+        :return: The compressed data.
+        :rtype: bytes
+        :raises ValueError: If the compression is unknown.
+        """
+        if compression == SaveFile.ZLIB:
+            return zlib.compress(data)
+        if compression == SaveFile.LZMA:
+            return lzma.compress(data)
+        if compression == SaveFile.RAW:
+            return data
+        raise ValueError(f"Unknown compression {compression}.")
+
+    @staticmethod
+    def __to_bytes(values: array) -> bytes:
+        """
+        Get the bytes of an array of 32-bit integers, in little-endian order whatever the machine.
+
+        :param values: The array.
+        :type values: array
+        :return: The bytes.
+        :rtype: bytes
+        """
+        if sys.byteorder == 'big':
+            values = array('I', values)
+            values.byteswap()
+        return values.tobytes()
+
+    @staticmethod
+    def __from_bytes(data: bytes) -> array:
+        """
+        Get an array of 32-bit integers from little-endian bytes.
+
+        :param data: The bytes.
+        :type data: bytes
+        :return: The array.
+        :rtype: array
+        """
+        values = array('I')
+        values.frombytes(data)
+        if sys.byteorder == 'big':
+            values.byteswap()
+        return values
@@ -1,3 +1,4 @@
+import random
 from util.state_manager import FPS, MapSize, MapType, StartingCondition
 
 class Settings:
@@ -12,6 +13,10 @@ class Settings:
     :vartype starting_condition: StartingCondition
     :ivar fps: The frames per second setting.
     :vartype fps: int
+    :ivar seed: The seed of the games, None for a different game each time.
+    :vartype seed: int
+    :ivar random: The random generator of the current game, used by the map generation and the AI.
+    :vartype random: random.Random
     """
     def __init__(self) -> None:
         """Create a new Settings object with default values."""
@@ -19,3 +24,26 @@ class Settings:
         self.map_size: MapSize = MapSize.SMALL
         self.starting_condition: StartingCondition = StartingCondition.LEAN
         self.fps: int = FPS.FPS_60
+        self.seed: int = None
+        self.random: random.Random = random.Random()
+
+    def __setstate__(self, state: dict) -> None:
+        """
+        Restore pickled settings, the settings saved before the seed was added having none.
+
+        :param state: The attributes of the settings.
+        :type state: dict
+        """
+        self.seed = None
+        self.random = random.Random()
+        self.__dict__.update(state)
+
+    def reset_random(self) -> random.Random:
+        """
+        Create the random generator of a new game, from the seed if there is one.
+
+        :return: The random generator of the game.
+        :rtype: random.Random
+        """
+        self.random = random.Random(self.seed)
+        return self.random
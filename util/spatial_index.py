@@ -0,0 +1,161 @@
+import heapq
+from typing import Callable, Iterable, Iterator
+
+"""
+This file contains the SpatialIndex class which finds the nearest objects of a type on a Map.
+"""
+
+class SpatialIndex:
+    """
+    Uniform bucket grid of the occupied tiles of a map, with one grid per concrete type of game object.
+
+    Tiles are indexed by ``y * size + x``. A nearest query visits the buckets ring by ring around the query point
+    and yields tiles in order of Chebyshev distance (then by index), as soon as no unvisited bucket can hold a closer tile:
+    the callers only pay for the buckets around the results they actually read.
+    """
+    BUCKET_SIZE = 8
+
+    def __init__(self, size: int) -> None:
+        """
+        Create an empty index for a map.
+
+        :param size: The size of the map.
+        :type size: int
+        """
+        self.__size: int = size
+        self.__buckets_per_row: int = -(-size // SpatialIndex.BUCKET_SIZE)
+        self.__types: dict[type, dict[int, set[int]]] = {}
+
+    def bucket(self, index: int) -> int:
+        """
+        Get the bucket of a tile.
+
+        :param index: The index of the tile.
+        :type index: int
+        :return: The bucket of the tile.
+        :rtype: int
+        """
+        return (index // self.__size // SpatialIndex.BUCKET_SIZE) * self.__buckets_per_row + index % self.__size // SpatialIndex.BUCKET_SIZE
+
+    def add(self, index: int, object_type: type) -> None:
+        """
+        Index a tile holding an object of a type.
+
+        :param index: The index of the tile.
+        :type index: int
+        :param object_type: The concrete type of the object.
+        :type object_type: type
+        """
+        self.__types.setdefault(object_type, {}).setdefault(self.bucket(index), set()).add(index)
+
+    def add_all(self, indices: Iterable[int], object_type: type) -> None:
+        """
+        Index many tiles holding objects of the same type.
+
+        :param indices: The indices of the tiles.
+        :type indices: Iterable[int]
+        :param object_type: The concrete type of the objects.
+        :type object_type: type
+        """
+        buckets = self.__types.setdefault(object_type, {})
+        for index in indices:
+            bucket = self.bucket(index)
+            tiles = buckets.get(bucket)
+            if tiles is None:
+                tiles = buckets[bucket] = set()
+            tiles.add(index)
+
+    def remove(self, index: int, object_type: type) -> None:
+        """
+        Remove a tile from the index.
+
+        :param index: The index of the tile.
+        :type index: int
+        :param object_type: The concrete type of the object it held.
+        :type object_type: type
+        """
+        buckets = self.__types[object_type]
+        bucket = self.bucket(index)
+        tiles = buckets[bucket]
+        tiles.discard(index)
+        if not tiles:
+            del buckets[bucket]
+
+    def copy(self) -> 'SpatialIndex':
+        """
+        Copy the index.
+
+        :return: A copy of the index.
+        :rtype: SpatialIndex
+        """
+        new_index = SpatialIndex(self.__size)
+        new_index.__types = {object_type: {bucket: set(tiles) for bucket, tiles in buckets.items()} for object_type, buckets in self.__types.items()}
+        return new_index
+
+    def types(self, object_type: type) -> list[type]:
+        """
+        Get the indexed concrete types which are subclasses of a type.
+
+        :param object_type: The type.
+        :type object_type: type
+        :return: The indexed concrete types.
+        :rtype: list[type]
+        """
+        return [indexed_type for indexed_type in self.__types if issubclass(indexed_type, object_type)]
+
+    def tiles(self, object_type: type) -> list[int]:
+        """
+        Get the indexed tiles holding an object of a type or of one of its subclasses.
+
+        :param object_type: The type.
+        :type object_type: type
+        :return: The indices of the tiles, in no particular order.
+        :rtype: list[int]
+        """
+        return [index for indexed_type in self.types(object_type) for tiles in self.__types[indexed_type].values() for index in tiles]
+
+    def nearest(self, x: int, y: int, types: list[type], extra_tiles: Callable[[int], Iterable[int]] = None) -> Iterator[int]:
+        """
+        Iterate lazily over the tiles holding an object of the given concrete types, from the nearest to the farthest.
+        Other tiles of a bucket can be added to the results, the caller then has to check what each tile holds.
+
+        :param x: The x coordinate of the query point.
+        :type x: int
+        :param y: The y coordinate of the query point.
+        :type y: int
+        :param types: The concrete types of objects to look for.
+        :type types: list[type]
+        :param extra_tiles: A function giving other tiles to yield for a bucket, called after the bucket is read.
+        :type extra_tiles: Callable[[int], Iterable[int]]
+        :return: The indexes of the tiles, by Chebyshev distance then by index.
+        :rtype: Iterator[int]
+        """
+        size, bucket_size, buckets_per_row = self.__size, SpatialIndex.BUCKET_SIZE, self.__buckets_per_row
+        grids = [self.__types[object_type] for object_type in types if object_type in self.__types]
+        if not grids:
+            return
+        bucket_x, bucket_y = x // bucket_size, y // bucket_size
+        max_ring = max(bucket_x, bucket_y, buckets_per_row - 1 - bucket_x, buckets_per_row - 1 - bucket_y)
+        found: list[tuple[int, int]] = []
+        seen: set[int] = set()
+        for ring in range(max_ring + 1):
+            for cell_y in range(max(bucket_y - ring, 0), min(bucket_y + ring, buckets_per_row - 1) + 1):
+                on_edge = cell_y == bucket_y - ring or cell_y == bucket_y + ring
+                step = 1 if on_edge else 2 * ring
+                for cell_x in range(bucket_x - ring, bucket_x + ring + 1, step):
+                    if cell_x < 0 or cell_x >= buckets_per_row:
+                        continue
+                    bucket = cell_y * buckets_per_row + cell_x
+                    # Copy the buckets, the map may change while the caller reads the results
+                    tiles = [index for grid in grids for index in tuple(grid.get(bucket, ()))]
+                    if extra_tiles is not None:
+                        tiles += extra_tiles(bucket)
+                    for index in tiles:
+                        if index not in seen:
+                            seen.add(index)
+                            heapq.heappush(found, (max(abs(index % size - x), abs(index // size - y)), index))
+            # The unvisited buckets only hold tiles farther than ring * bucket_size
+            while found and found[0][0] <= ring * bucket_size:
+                yield heapq.heappop(found)[1]
+        while found:
+            yield heapq.heappop(found)[1]
@@ -1,4 +1,7 @@
 from blessed import Terminal
+from util.save_file import SaveFile
+from util.state_manager import FPS
+from view.terminal_view import TerminalView
 import os
 
 class LoadMenu:
@@ -12,6 +15,7 @@ class LoadMenu:
         """Initialize the menu view."""
         self.current_option: int = 0
         self.term: Terminal = Terminal()
+        self.__details: dict[tuple[str, float], list[str]] = {}
 
     def __get_menu_options(self) -> list[str]:
         """
@@ -27,18 +31,102 @@ class LoadMenu:
             # Lister les fichiers dans le répertoire
             if os.path.exists(save_directory):
                 save_files = sorted(
-                    [os.path.splitext(f)[0] for f in os.listdir(save_directory) if os.path.isfile(os.path.join(save_directory, f))],
-                    key=lambda x: os.path.getmtime(os.path.join(save_directory, x + ".pkl")),
+                    [f for f in os.listdir(save_directory) if os.path.isfile(os.path.join(save_directory, f)) and os.path.splitext(f)[1] in (".sav", ".pkl")],
+                    key=lambda x: os.path.getmtime(os.path.join(save_directory, x)),
                     reverse=True
                 )
+                # Les sauvegardes automatiques, restaurées au dernier tick de leur journal
+                autosave_directory = os.path.join(save_directory, "autosave")
+                if os.path.isdir(autosave_directory):
+                    save_files += sorted(
+                        [os.path.join("autosave", d) for d in os.listdir(autosave_directory) if os.path.isdir(os.path.join(autosave_directory, d))],
+                        key=lambda x: os.path.getmtime(os.path.join(save_directory, x)),
+                        reverse=True
+                    )
                 if not save_files:
                     return ["No save files found"]
-                return save_files
+                return [os.path.splitext(f)[0] if not f.startswith("autosave") else f for f in save_files]
             else:
                 return ["Save directory not found"]
         except Exception as e:
             return [f"Error reading save directory: {e}"]
 
+    def __get_save_path(self, option: str) -> str:
+        """
+        Get the file holding the header of a save: the save file, or the latest base save of an autosave.
+
+        :param option: The save, as listed in the menu.
+        :type option: str
+        :return: The path of the file, None if the save has no header, as the games pickled by the previous versions.
+        :rtype: str
+        """
+        path = os.path.join("save", option)
+        if os.path.isdir(path):
+            bases = sorted(name for name in os.listdir(path) if name.endswith(SaveFile.EXTENSION))
+            return os.path.join(path, bases[-1]) if bases else None
+        path += SaveFile.EXTENSION
+        return path if os.path.exists(path) else None
+
+    def __get_details(self, option: str) -> list[str]:
+        """
+        Get the lines describing a save, read from its header and its thumbnail only, and kept as long as the file is not changed.
+
+        :param option: The save, as listed in the menu.
+        :type option: str
+        :return: The lines, empty if the save has no header.
+        :rtype: list[str]
+        """
+        try:
+            path = self.__get_save_path(option)
+            if path is None:
+                return []
+            key = (path, os.path.getmtime(path))
+        except OSError:
+            # The base save of an autosave was pruned since it was listed: the next one is found on the next frame
+            return []
+        if key not in self.__details:
+            try:
+                self.__details[key] = self.__describe(SaveFile.read_header(path), SaveFile.read_thumbnail(path))
+            except (OSError, ValueError) as e:
+                self.__details[key] = [f"Unreadable save: {e}"]
+        return self.__details[key]
+
+    def __describe(self, header: dict, thumbnail: tuple[int, bytes, bytes]) -> list[str]:
+        """
+        Describe a save: its game, its players and the thumbnail of its map, coloured as in the terminal view.
+
+        :param header: The header of the save.
+        :type header: dict
+        :param thumbnail: The thumbnail of the save, None if it has none.
+        :type thumbnail: tuple[int, bytes, bytes]
+        :return: The lines.
+        :rtype: list[str]
+        """
+        seconds = header["tick"] // FPS[header["fps"]].value
+        size = header["map_size"]
+        lines = [f"Tick {header['tick']} ({seconds // 60}:{seconds % 60:02d}), {header['map_type'].title()} {size}x{size}, "
+                 f"{header['starting_condition'].title()} start, seed {header['seed']}, saved {header['time'].replace('T', ' ')}"]
+        colors = header.get("colors", [])
+        for index, name in enumerate(header["players"]):
+            line = f"  {name}"
+            if "units" in header:
+                line += f": {header['units'][index]} units, {header['buildings'][index]} buildings"
+            if "resources" in header:
+                line += ", " + ", ".join(f"{resource} {amount}" for resource, amount in header["resources"][index].items())
+            lines.append(line)
+        if thumbnail is not None:
+            width, letters, owners = thumbnail
+            for row in range(width):
+                cells = []
+                for square in range(row * width, (row + 1) * width):
+                    char = chr(letters[square])
+                    color = TerminalView.RESOURCE_COLORS.get(char, "")
+                    if owners[square] and owners[square] <= len(colors):
+                        color = TerminalView.PLAYER_COLORS.get(colors[owners[square] - 1], "\033[33m")
+                    cells.append(f"{color}{char}\033[0m" if color else char)
+                lines.append("  " + "".join(cells))
+        return lines
+
     # def show(self) -> str:
     #     """
     #     Show the menu in the terminal window.
@@ -98,6 +186,11 @@ class LoadMenu:
                         print(self.term.on_black(self.term.white(f"→ {option}")))
                     else:
                         print(f"  {option}")
+
+                if self.current_option < len(options) - 1:
+                    print()
+                    for line in self.__get_details(options[self.current_option]):
+                        print(line)
                 
                 key = self.term.inkey()
 
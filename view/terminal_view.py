@@ -1,4 +1,5 @@
 from util.map import Map
+from model.entity import Entity
 from view.base_view import BaseView
 from blessed import Terminal
 from util.coordinate import Coordinate
@@ -22,7 +23,16 @@ class TerminalView(BaseView):
     Terminal view for the game. It's used to display the game map and allow the player to navigate it using ZQSD and the arrow keys.
     Print the map in the Terminal depending on the player's position and the size of the viewport.
     Automatically update each tick.
+
+    The whole frame is only printed when the viewport moves or the terminal is resized. Otherwise, the tiles written on the map
+    since the last frame are read from its change feed, and only the cells whose character or colour changed are rewritten,
+    with the cursor moved to each of them: an idle game prints nothing.
     """
+    RESOURCE_COLORS = {'G': "\033[33m", 'W': "\033[38;5;94m", 'F': "\033[32m"}  # Yellow, brown, green
+    PLAYER_COLORS = {
+        "white": "", "blue": "\033[34m", "red": "\033[31m", "green": "\033[32m", "yellow": "\033[33m",
+        "purple": "\033[35m", "cyan": "\033[36m", "pink": "\033[95m", "orange": "\033[93m",
+    }
 
     def __init__(self, controller: 'ViewController') -> None:
         """Initialize the menu view."""
@@ -35,6 +45,10 @@ class TerminalView(BaseView):
         self.__size()
         self.__map: Map = self._BaseView__controller.get_map()
 
+        self.__layout: tuple = None
+        self.__cells: list[list[str]] = []
+        self.__revision: int = 0
+
         self.__display_thread = threading.Thread(target=self.__display_loop)
         # self.__input_thread = threading.Thread(target=self.__input_loop)
         self.__isFaster = False
@@ -42,6 +56,7 @@ class TerminalView(BaseView):
     def show(self) -> None:
         """Start the display and input threads."""
         self.__stop_event.clear()
+        self.__layout = None
         if not self.__display_thread.is_alive():
             self.__display_thread = threading.Thread(target=self.__display_loop)
             self.__display_thread.start()
@@ -70,65 +85,65 @@ class TerminalView(BaseView):
         frame.append("└" + "─" * (frame_width - 2) + "┘")
         return frame
 
-    def __str_map(self) -> list[str]:
+    def __cell(self, x: int, y: int) -> str:
+        """
+        Get the colored character of a tile: resources in their colour, entities in the colour of their player, and empty tiles hidden.
+
+        :param x: The x coordinate of the tile.
+        :type x: int
+        :param y: The y coordinate of the tile.
+        :type y: int
+        :return: The character of the tile with its escape sequences.
+        :rtype: str
         """
-        Print the map in the terminal using the string representation of the Map object.
-        Using the __from_coord coordinate and the self.__terminal_width and self.__terminal_height, calculate the from and to coordinates to print the map.
-        Use the method Map.get_from_to(from_coord, to_coord) to get the map part to print.
+        object = self.__map.view_xy(x, y)
+        if object is None:
+            return ' '
+        char = object.get_letter()
+        color = TerminalView.RESOURCE_COLORS.get(char)
+        if color is None:
+            color = TerminalView.PLAYER_COLORS.get(object.get_player().get_color(), "\033[33m") if isinstance(object, Entity) and object.get_player() is not None else ""
+        return f"{color}{char}\033[0m" if color else char
+
+    def __render(self) -> str:
+        """
+        Build what has to be printed to update the terminal: the whole frame if the viewport or the terminal changed,
+        else only the cells of the tiles written since the last frame whose content changed.
         Consider the fact that the map is displayed inside the frame, so the map is shifted by 1 to the left, 1 to the top, 1 to the right and 1 to the bottom.
+
+        :return: The text to print, empty if nothing changed.
+        :rtype: str
         """
         map_width = min(self.__terminal_width - 2, self.__map.get_size())
         map_height = min(self.__terminal_height - 2, self.__map.get_size())
+        from_x, from_y = self.__from_coord.get_x(), self.__from_coord.get_y()
         self.__to_coord = self.__from_coord + Coordinate(map_width, map_height)
-        self.__view = self.__map.get_from_to(self.__from_coord, self.__to_coord)
-        map_lines = str(self.__view).split("\n")
-        cropped_lines = [line[:map_width] for line in map_lines[:map_height]]
-        return cropped_lines
-    
-    
-    def __colored_line(self, line: str, frame_line: str, y: int) -> str:
-        """
-        Color the map elements: uppercase letters in red and bold, lowercase letters in blue, and hide empty spaces.
-        Include the frame in the colored line.
-        """
-        x = 0
-        colored_line = ""
-        abs_y = self.__from_coord.get_y() + y
-        for char in line:
-            abs_x = self.__from_coord.get_x() + x
-            if char == '·':
-                colored_line += ' '
-            elif char == 'G':  # Gold 
-                colored_line += f"\033[33mG\033[0m"  # Yellow
-            elif char == 'W':  # Wood
-                colored_line += f"\033[38;5;94mW\033[0m"  # Brown
-            elif char == 'F':  # Food
-                colored_line += f"\033[32mF\033[0m"  # Green
-            else:
-                color = self.__map.indicate_color(Coordinate(abs_x, abs_y))
-                if color == "white":
-                    colored_line += char
-                elif color == "blue":
-                    colored_line += f'\033[34m{char}\033[0m'
-                elif color == "red":
-                    colored_line += f'\033[31m{char}\033[0m'
-                elif color == "green":
-                    colored_line += f'\033[32m{char}\033[0m'
-                elif color == "yellow":
-                    colored_line += f'\033[33m{char}\033[0m'
-                elif color == "purple":
-                    colored_line += f'\033[35m{char}\033[0m'
-                elif color == "cyan":
-                    colored_line += f'\033[36m{char}\033[0m'
-                elif color == "pink":
-                    colored_line += f'\033[95m{char}\033[0m'
-                elif color == "orange":
-                    colored_line += f'\033[93m{char}\033[0m'
-                else:
-                    # Default color handling
-                    colored_line += f'\033[33m{char}\033[0m'
-            x += 1
-        return frame_line[:1] + colored_line + self.__terminal.normal + frame_line[1 + len(line):]
+        layout = (self.__terminal_width, self.__terminal_height, from_x, from_y, self.__isFaster)
+        # The revision is read first: a tile written while the cells are read is read again on the next frame
+        revision = self.__map.get_revision()
+        changes = self.__map.get_changes(self.__revision) if layout == self.__layout else None
+        self.__revision = revision
+
+        if changes is None:
+            self.__layout = layout
+            self.__cells = [[self.__cell(from_x + x, from_y + y) for x in range(map_width)] for y in range(map_height)]
+            frame = self.__str_frame()
+            for y, cells in enumerate(self.__cells):
+                frame[y + 1] = frame[y + 1][:1] + "".join(cells) + self.__terminal.normal + frame[y + 1][1 + map_width:]
+            frame = self.__add_coord(frame)
+            # Join the frame into a single string to minimize I/O calls
+            return self.__terminal.move(0, 0) + "\n".join(frame)
+
+        output = []
+        size = self.__map.get_size()
+        for index in set(changes):
+            x, y = index % size - from_x, index // size - from_y
+            if 0 <= x < map_width and 0 <= y < map_height:
+                cell = self.__cell(from_x + x, from_y + y)
+                if cell != self.__cells[y][x]:
+                    self.__cells[y][x] = cell
+                    output.append(self.__terminal.move(y + 1, x + 1) + cell)
+        return "".join(output)
 
     def __add_coord(self, line: list[str]) -> list[str]:
         """
@@ -164,22 +179,14 @@ class TerminalView(BaseView):
                     print(self.__terminal.clear(), end="")
                     print(self.__terminal.bold_red("Error: Terminal size is too small. Please resize the terminal."))
                     self.__terminal.flush()
+                    self.__layout = None
                     time.sleep(1)
                     continue
 
-                frame = self.__str_frame()
-                map_part = self.__str_map()
-                output = []
-                y = 0
-                for i, line in enumerate(map_part[:min(len(map_part), self.__terminal_height - 2)]):
-                    frame[i + 1] = self.__colored_line(line, frame[i + 1], y)
-                    y += 1
-                frame = self.__add_coord(frame)
-
-                # Join the frame into a single string to minimize I/O calls
-                output.append("\n".join(frame))
-                print(self.__terminal.move(0, 0) + "".join(output), end="")  # Use cursor positioning
-                self.__terminal.flush()
+                output = self.__render()
+                if output:
+                    print(output, end="")  # Use cursor positioning
+                    self.__terminal.flush()
                 time.sleep(1 / self._BaseView__controller.get_settings().fps.value)
 
     def __input_loop(self) -> None:
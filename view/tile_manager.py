@@ -1,40 +1,151 @@
+import threading
 import pygame
 
 class TileManager:
     """
     Classe pour gérer les textures des tuiles.
+
+    The images are decoded and scaled once per process, in a background thread started by preload,
+    so that opening the 2.5D view does not wait for them. They are then packed in an atlas:
+    a single surface per zoom level holding every sprite, drawn from with Surface.blits.
     """
+    ATLAS_WIDTH = 1024
+    SPRITES = {
+        # "grass": ("src/grass.png", (64, 64)),
+        # "water": ("src/water.png", (64, 64)),
+        "ground": ("src/block_aoe.png", (128, 128)),
+        "town_center": ("src/town_center.png", (64, 64)),
+        "villager": ("src/villager.png", (48, 48)),
+        # "grass_tiles": ("assets/terrain/grass11.png", (800, 600)),
+        "wood": ("src/tree.png", (64, 64)),
+        "food": ("src/farm_2.png", None),
+        "gold": ("src/gold.png", (64, 64)),
+        "swordsman": ("src/pikeman.png", (48, 48)),
+        "horseman": ("src/cavalier.png", (64, 64)),
+        "archer": ("src/archer.png", (64, 64)),
+        "house": ("src/house.png", (64, 64)),
+        "camp": ("src/camp.png", (64, 64)),
+        "barracks": ("src/secondage_barracks.png", (64, 64)),
+        "stable": ("src/stable.png", (64, 64)),
+        "archery_range": ("src/secondage_archery.png", (64, 64)),
+        "keep": ("src/keep.png", (64, 64)),
+        "construction": ("src/construction.png", (32, 32)),
+    }
+    __images: dict[str, pygame.Surface] = None
+    __error: Exception = None
+    __loader: threading.Thread = None
+    __loaded: threading.Event = threading.Event()
+    __lock: threading.Lock = threading.Lock()
 
     def __init__(self):
         """
         Initialise le gestionnaire de tuiles.
         """
-        self.textures = {
-            # "grass": pygame.transform.scale(pygame.image.load("src/grass.png"), (64, 64)),
-            # "water": pygame.transform.scale(pygame.image.load("src/water.png"), (64, 64)),
-            "town_center": pygame.transform.scale(pygame.image.load("src/town_center.png"), (64, 64)),
-            "villager": pygame.transform.scale(pygame.image.load("src/villager.png"), (48, 48)),
-            # "grass_tiles": pygame.transform.scale(pygame.image.load("assets/terrain/grass11.png"), (800, 600)),
-            "wood": pygame.transform.scale(pygame.image.load("src/tree.png"), (64, 64)),
-            "food": pygame.image.load("src/farm_2.png"),
-            "gold": pygame.transform.scale(pygame.image.load("src/gold.png"), (64, 64)),
-            "swordsman": pygame.transform.scale(pygame.image.load("src/pikeman.png"), (48, 48)),
-            "horseman": pygame.transform.scale(pygame.image.load("src/cavalier.png"), (64, 64)),
-            "archer": pygame.transform.scale(pygame.image.load("src/archer.png"), (64, 64)),
-            "house": pygame.transform.scale(pygame.image.load("src/house.png"), (64, 64)),
-            "camp": pygame.transform.scale(pygame.image.load("src/camp.png"), (64, 64)),
-            "barracks": pygame.transform.scale(pygame.image.load("src/secondage_barracks.png"), (64, 64)),
-            "stable": pygame.transform.scale(pygame.image.load("src/stable.png"), (64, 64)),
-            "archery_range": pygame.transform.scale(pygame.image.load("src/secondage_archery.png"), (64, 64)),
-            "keep": pygame.transform.scale(pygame.image.load("src/keep.png"), (64, 64)),
-            "construction": pygame.transform.scale(pygame.image.load("src/construction.png"), (32, 32)),
-        }
+        TileManager.preload()
+        self.__atlases: dict[float, tuple[pygame.Surface, dict[str, pygame.Rect]]] = {}
+
+    @staticmethod
+    def preload() -> None:
+        """
+        Start loading the images in the background, if it is not already done.
+        """
+        with TileManager.__lock:
+            if TileManager.__loader is None:
+                TileManager.__loader = threading.Thread(target=TileManager.__load, name="TileManager", daemon=True)
+                TileManager.__loader.start()
+
+    @staticmethod
+    def __load() -> None:
+        """
+        Decode and scale every image. It runs in the loading thread.
+        """
+        try:
+            images = {}
+            for name, (path, size) in TileManager.SPRITES.items():
+                image = pygame.image.load(path)
+                images[name] = pygame.transform.scale(image, size) if size is not None else image
+            TileManager.__images = images
+        except Exception as error:
+            TileManager.__error = error
+        finally:
+            TileManager.__loaded.set()
+
+    @staticmethod
+    def is_loaded() -> bool:
+        """
+        Check if the images are loaded.
+
+        :return: True if the atlas can be built without waiting, False otherwise.
+        :rtype: bool
+        """
+        TileManager.preload()
+        return TileManager.__loaded.is_set()
+
+    def get_atlas(self, zoom: float = 1, wait: bool = False) -> tuple[pygame.Surface, dict[str, pygame.Rect]]:
+        """
+        Get the atlas of a zoom level, building it the first time.
+        If the display is set, the atlas is converted to its pixel format, so the display must be set before the first call.
+
+        :param zoom: The scale of the sprites, 1 for their size in SPRITES.
+        :type zoom: float
+        :param wait: True to wait for the images if they are still loading, False to return None then.
+        :type wait: bool
+        :return: The atlas and the area of each sprite in it, None if the images are still loading.
+        :rtype: tuple[pygame.Surface, dict[str, pygame.Rect]]
+        :raises RuntimeError: If the images could not be loaded.
+        """
+        atlas = self.__atlases.get(zoom)
+        if atlas is not None:
+            return atlas
+        if not (TileManager.is_loaded() or wait and TileManager.__loaded.wait()):
+            return None
+        if TileManager.__images is None:
+            raise RuntimeError("The textures could not be loaded") from TileManager.__error
+        atlas = TileManager.__pack({
+            name: image if zoom == 1 else pygame.transform.scale(image, (max(1, round(image.get_width() * zoom)), max(1, round(image.get_height() * zoom))))
+            for name, image in TileManager.__images.items()
+        })
+        self.__atlases[zoom] = atlas
+        return atlas
+
+    @staticmethod
+    def __pack(images: dict[str, pygame.Surface]) -> tuple[pygame.Surface, dict[str, pygame.Rect]]:
+        """
+        Pack images in an atlas, by rows of images sorted by height.
+
+        :param images: The images by name.
+        :type images: dict[str, pygame.Surface]
+        :return: The atlas and the area of each image in it.
+        :rtype: tuple[pygame.Surface, dict[str, pygame.Rect]]
+        """
+        width = max([TileManager.ATLAS_WIDTH] + [image.get_width() for image in images.values()])
+        rects = {}
+        x, y, row_height = 0, 0, 0
+        for name, image in sorted(images.items(), key=lambda item: -item[1].get_height()):
+            if x + image.get_width() > width:
+                x, y, row_height = 0, y + row_height, 0
+            rects[name] = image.get_rect(topleft=(x, y))
+            x += image.get_width()
+            row_height = max(row_height, image.get_height())
+        atlas = pygame.Surface((width, y + row_height), pygame.SRCALPHA)
+        atlas.blits([(images[name], rect) for name, rect in rects.items()], False)
+        if pygame.display.get_init() and pygame.display.get_surface() is not None:
+            atlas = atlas.convert_alpha()
+        return atlas, rects
+
+    def clear(self) -> None:
+        """
+        Drop the atlases, to build them again in the pixel format of a new display. The images are kept.
+        """
+        self.__atlases.clear()
 
     def get_texture(self, texture_name):
         """
         Retourne la texture demandée.
 
         :param texture_name: Nom de la texture.
-        :return: L'image de la texture.
+        :return: L'image de la texture, une partie de l'atlas.
         """
-        return self.textures.get(texture_name, None)
\ No newline at end of file
+        atlas, rects = self.get_atlas(wait=True)
+        rect = rects.get(texture_name)
+        return atlas.subsurface(rect) if rect is not None else None
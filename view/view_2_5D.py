@@ -4,13 +4,37 @@ from view.base_view import BaseView
 from view.tile_manager import TileManager
 from model.player.player import Player
 import typing
+from typing import Iterator
 if typing.TYPE_CHECKING:
     from controller.view_controller import ViewController
 
 class View2_5D(BaseView):
     """
     Main class for 2.5D view.
+
+    Only the tiles seen by the camera are drawn. The ground, the same on every tile, is pre-rendered by chunks of tiles
+    and drawn once per camera position, and the sprite of each object is found from its letter in a table.
+    The sprites are drawn from the atlas of the TileManager with one blits call per frame. Until its images are loaded
+    in the background, the frames only show the minimap.
+    The minimap is kept between the frames and follows the change feed of the map.
     """
+    GROUND_SIZE = TileManager.SPRITES["ground"][1][0]
+    CHUNK_SIZE = 8
+    LETTER_TEXTURES = {
+        "T": "town_center", "v": "villager", "s": "swordsman", "h": "horseman", "a": "archer",
+        "H": "house", "C": "camp", "B": "barracks", "S": "stable", "A": "archery_range", "K": "keep",
+        "W": "wood", "F": "food", "G": "gold",
+        "x": "construction",  # Something is under construction here
+    }
+    MINIMAP_SIZE = (200, 200)
+    MINIMAP_GROUND = (34, 139, 34)  # Vert
+    MINIMAP_COLORS = {
+        "T": (255, 215, 0),  # Town Center en or
+        "W": (139, 69, 19),  # Bois en marron
+        "G": (255, 223, 0),  # Or en jaune
+        "F": (255, 0, 0),  # Nourriture en rouge
+    }
+
     def __init__(self, controller: 'ViewController') -> None:
         """Initialize the menu view."""
         super().__init__(controller)
@@ -30,131 +54,250 @@ class View2_5D(BaseView):
         self.tile_size = 40  # Taille d'une tuile
         self.minimap_size = 150  # Taille de la mini-map
         self.minimap_pos = (self.width - self.minimap_size - 10, self.height - self.minimap_size - 10)
+
+        # The atlas, the area of the ground and of the sprite of each letter in it, set once the textures are loaded
+        self.__atlas: pygame.Surface = None
+        self.__ground: pygame.Rect = None
+        self.__letter_sprites: dict[str, pygame.Rect] = None
+        self.__texture_margin: int = 0
+        self.__ground_chunk: pygame.Surface = None
+        self.__ground_layer: pygame.Surface = None
+        self.__ground_camera: tuple = None
+        self.__minimap: pygame.Surface = None
+        self.__minimap_revision: int = 0
         
     def render_map(self):
         """
         Render only the visible part of the map using the camera.
+        The ground of the visible area is drawn once per camera position from pre-rendered chunks,
+        then the objects of the visible tiles are drawn from the back to the front.
         """
         if not self.__running: return
+        if self.__atlas is None and not self.__load_atlas(): return
 
-        # Chargement de la texture du sol
-        grass_block = pygame.transform.scale(pygame.image.load("src/block_aoe.png"), (128, 128))
-
-        # Dessiner toute la carte avec un décalage caméra
-        for x in range(self.map_size):
-            for y in range(self.map_size):
-                iso_x = (x - self.camera_x) * self.tile_size - (y - self.camera_y) * self.tile_size + self.width // 2
-                iso_y = (x - self.camera_x) * (self.tile_size // 2) + (y - self.camera_y) * (self.tile_size // 2) + self.height // 4
-
-                self.screen.blit(grass_block, (iso_x, iso_y))
+        camera = (self.camera_x, self.camera_y, self.width, self.height)
+        if self.__ground_layer is None or self.__ground_camera != camera:
+            self.__ground_layer = self.__render_ground()
+            self.__ground_camera = camera
+        self.screen.blit(self.__ground_layer, (0, 0))
 
         # Dessiner les objets à leurs positions
-        for coordinate, obj in self.__map.get_map().items():
-            if not coordinate or not obj: continue
-
-            x, y = coordinate.get_x(), coordinate.get_y()
-
-            iso_x = (x - self.camera_x) * self.tile_size - (y - self.camera_y) * self.tile_size + self.width // 2
-            iso_y = (x - self.camera_x) * (self.tile_size // 2) + (y - self.camera_y) * (self.tile_size // 2) + self.height // 4
-
-            if obj.get_letter() == "T":
-                self.screen.blit(self.tile_manager.get_texture('town_center'), (iso_x, iso_y))
-
-            elif obj.get_letter() == "v":
-                self.screen.blit(self.tile_manager.get_texture('villager'), (iso_x, iso_y))
-
-            elif obj.get_letter() == "s":
-                self.screen.blit(self.tile_manager.get_texture('swordsman'), (iso_x, iso_y))
-
-            elif obj.get_letter() == "h":
-                self.screen.blit(self.tile_manager.get_texture('horseman'), (iso_x, iso_y))
-
-            elif obj.get_letter() == "a":
-                self.screen.blit(self.tile_manager.get_texture('archer'), (iso_x, iso_y))
+        atlas, sprites, blits = self.__atlas, self.__letter_sprites, []
+        for x, y in self.__visible_tiles(self.__texture_margin):
+            obj = self.__map.view_xy(x, y)
+            if obj is None:
+                continue
+            sprite = sprites.get(obj.get_letter())
+            if sprite is not None:
+                blits.append((atlas, self.__iso(x, y), sprite))
 
-            elif obj.get_letter() == "H":
-                self.screen.blit(self.tile_manager.get_texture("house"), (iso_x, iso_y))
-
-            elif obj.get_letter() == "C":
-                self.screen.blit(self.tile_manager.get_texture("camp"), (iso_x, iso_y))
-
-            elif obj.get_letter() == "B":
-                self.screen.blit(self.tile_manager.get_texture("barracks"), (iso_x, iso_y))
+            # self.renderer.render_tile(x, y, texture, self.camera)
+        self.screen.blits(blits, False)
 
-            elif obj.get_letter() == "S":
-                self.screen.blit(self.tile_manager.get_texture("stable"), (iso_x, iso_y))
+    def __load_atlas(self) -> bool:
+        """
+        Take the atlas of the tile manager if its images are loaded.
 
-            elif obj.get_letter() == "A":
-                self.screen.blit(self.tile_manager.get_texture("archery_range"), (iso_x, iso_y))
+        :return: True if the atlas is set, False if the images are still loading.
+        :rtype: bool
+        """
+        atlas = self.tile_manager.get_atlas()
+        if atlas is None:
+            return False
+        self.__atlas, rects = atlas
+        self.__ground = rects["ground"]
+        self.__letter_sprites = {letter: rects[name] for letter, name in View2_5D.LETTER_TEXTURES.items()}
+        self.__texture_margin = max(max(sprite.size) for sprite in self.__letter_sprites.values())
+        return True
+
+    def __iso(self, x: int, y: int) -> tuple[int, int]:
+        """
+        Get the position on the screen of the top left corner of a tile.
+
+        :param x: The x coordinate of the tile.
+        :type x: int
+        :param y: The y coordinate of the tile.
+        :type y: int
+        :return: The position on the screen.
+        :rtype: tuple[int, int]
+        """
+        iso_x = (x - self.camera_x) * self.tile_size - (y - self.camera_y) * self.tile_size + self.width // 2
+        iso_y = (x - self.camera_x) * (self.tile_size // 2) + (y - self.camera_y) * (self.tile_size // 2) + self.height // 4
+        return iso_x, iso_y
 
-            elif obj.get_letter() == "K":
-                self.screen.blit(self.tile_manager.get_texture("keep"), (iso_x, iso_y))
+    def __visible_tiles(self, margin: int) -> Iterator[tuple[int, int]]:
+        """
+        Iterate over the tiles of the map drawn on the screen, from the back to the front.
+        On the screen, a tile moves by tile_size along x with x - y and by tile_size // 2 along y with x + y,
+        so the visible tiles are the ones whose x - y and x + y are in the ranges covering the screen.
+
+        :param margin: The size of the largest image drawn on a tile, which can be seen while the tile itself is off the screen.
+        :type margin: int
+        :return: The coordinates of the visible tiles.
+        :rtype: Iterator[tuple[int, int]]
+        """
+        half = self.tile_size // 2
+        min_diff = (-margin - self.width // 2) // self.tile_size
+        max_diff = (self.width - self.width // 2) // self.tile_size + 1
+        min_sum = (-margin - self.height // 4) // half
+        max_sum = (self.height - self.height // 4) // half + 1
+        for total in range(min_sum, max_sum + 1):
+            # x - y and x + y always have the same parity
+            for diff in range(min_diff + (min_diff - total) % 2, max_diff + 1, 2):
+                x = self.camera_x + (total + diff) // 2
+                y = self.camera_y + (total - diff) // 2
+                if 0 <= x < self.map_size and 0 <= y < self.map_size:
+                    yield x, y
+
+    def __render_chunk(self) -> pygame.Surface:
+        """
+        Pre-render the ground of a chunk of CHUNK_SIZE x CHUNK_SIZE tiles. The ground being the same everywhere, all the chunks share it.
 
-            elif obj.get_letter() == "W":
-                self.screen.blit(self.tile_manager.get_texture("wood"), (iso_x, iso_y))
+        :return: The ground of a chunk, its top tile at (tile_size * (CHUNK_SIZE - 1), 0).
+        :rtype: pygame.Surface
+        """
+        size = View2_5D.CHUNK_SIZE
+        chunk = pygame.Surface((2 * self.tile_size * (size - 1) + View2_5D.GROUND_SIZE, self.tile_size * (size - 1) + View2_5D.GROUND_SIZE), pygame.SRCALPHA)
+        chunk.blits([
+            (self.__atlas, ((x - y) * self.tile_size + self.tile_size * (size - 1), (x + y) * (self.tile_size // 2)), self.__ground)
+            for x in range(size) for y in range(size)
+        ], False)
+        return chunk.convert_alpha()
+
+    def __render_ground(self) -> pygame.Surface:
+        """
+        Render the ground of the visible area for the current camera, chunk by chunk.
+        The tiles of the incomplete chunks on the border of a map whose size is not a multiple of CHUNK_SIZE are drawn one by one.
 
-            elif obj.get_letter() == "F":
-                self.screen.blit(self.tile_manager.get_texture("food"), (iso_x, iso_y))
+        :return: The ground layer, of the size of the screen.
+        :rtype: pygame.Surface
+        """
+        if self.__ground_chunk is None:
+            self.__ground_chunk = self.__render_chunk()
+        layer = pygame.Surface((self.width, self.height)).convert()
+        layer.fill((0, 0, 0))
+        size = View2_5D.CHUNK_SIZE
+        full = self.map_size - self.map_size % size
+        screen = layer.get_rect()
+        chunks, blits = set(), []
+        for x, y in self.__visible_tiles(View2_5D.GROUND_SIZE):
+            if x < full and y < full:
+                chunks.add((x - x % size, y - y % size))
+            else:
+                blits.append((self.__atlas, self.__iso(x, y), self.__ground))
+        # Dessiner toute la carte avec un décalage caméra
+        for x, y in sorted(chunks):
+            iso_x, iso_y = self.__iso(x, y)
+            position = (iso_x - self.tile_size * (size - 1), iso_y)
+            if screen.colliderect(self.__ground_chunk.get_rect(topleft=position)):
+                blits.append((self.__ground_chunk, position))
+        layer.blits(blits, False)
+        return layer
 
-            elif obj.get_letter() == "G":
-                self.screen.blit(self.tile_manager.get_texture("gold"), (iso_x, iso_y))
-            
-            elif obj.get_letter() == "x":
-                # Add a "🚧" (emoji) to show that something is under construction here
-                self.screen.blit(self.tile_manager.get_texture("construction"), (iso_x, iso_y))
-                
-            # self.renderer.render_tile(x, y, texture, self.camera)
-    
     def render_minimap(self):
         """
         Render a minimap in the bottom-right corner of the screen.
         It shows the entire map with a rectangle indicating the visible area.
+        The minimap is kept in a surface, where only the squares of the tiles written since the last frame are drawn again.
         """
         if not self.__running: return
 
         # Définition de la taille et de la position de la mini-map
-        minimap_width = 200
-        minimap_height = 200
+        minimap_width, minimap_height = View2_5D.MINIMAP_SIZE
         minimap_x = self.width - minimap_width - 20  # Décalage de 20px du bord droit
         minimap_y = self.height - minimap_height - 20  # Décalage de 20px du bas
 
-        # Dessiner le fond de la mini-map (bordure noire + fond vert)
+        # The revision is read first: a tile written while the minimap is drawn is drawn again on the next frame
+        revision = self.__map.get_revision()
+        changes = self.__map.get_changes(self.__minimap_revision) if self.__minimap is not None else None
+        if changes is None:
+            self.__minimap = self.__render_minimap_surface()
+        elif changes:
+            self.__update_minimap_surface(changes)
+        self.__minimap_revision = revision
+
+        # Dessiner la mini-map avec sa bordure noire
         pygame.draw.rect(self.screen, (0, 0, 0), (minimap_x - 2, minimap_y - 2, minimap_width + 4, minimap_height + 4))  # Bordure noire
-        pygame.draw.rect(self.screen, (34, 139, 34), (minimap_x, minimap_y, minimap_width, minimap_height))  # Fond vert
-        
-        # Échelle de réduction pour que la carte entière tienne dans la mini-map
-        scale_x = minimap_width / self.map_size
-        scale_y = minimap_height / self.map_size
-        # Dessiner les objets sur la mini-map
-        for coordinate, obj in self.__map.get_map().items():
-            x, y = coordinate.get_x(), coordinate.get_y()
-            pixel_x = int(minimap_x + x * scale_x)
-            pixel_y = int(minimap_y + y * scale_y)
-
-            # Couleurs différentes selon les objets
-            if coordinate is None or obj is None:  # Case vide
-                color = (34, 139, 34)  # Par défaut blanc (terrain)
-            elif obj.get_letter() == "T":  # Town Center
-                color = (255, 215, 0)  # Or
-            elif obj.get_letter() == "W":  # Bois
-                color = (139, 69, 19)  # Marron
-            elif obj.get_letter() == "G":  # Or
-                color = (255, 223, 0)  # Jaune
-            elif obj.get_letter() == "F":  # Nourriture
-                color = (255, 0, 0)  # Rouge
-            else:  # Unité
-                color = (0, 0, 255)  # Bleu
-
-            pygame.draw.rect(self.screen, color, (pixel_x, pixel_y, 3, 3))  # Carré de 3x3 pixels
+        self.screen.blit(self.__minimap, (minimap_x, minimap_y))
 
         # Dessiner un rectangle indiquant la zone actuellement visible sur la grande carte
+        scale_x = minimap_width / self.map_size
+        scale_y = minimap_height / self.map_size
         viewport_x = int(minimap_x + self.camera_x * scale_x)
         viewport_y = int(minimap_y + self.camera_y * scale_y)
         viewport_width = int(self.viewport_width * scale_x)
         viewport_height = int(self.viewport_height * scale_y)
 
         pygame.draw.rect(self.screen, (255, 0, 0), (viewport_x, viewport_y, viewport_width, viewport_height), 2)  # Rouge pour la position caméra
-    
+
+    def __minimap_square(self, x: int, y: int) -> pygame.Rect:
+        """
+        Get the square of a tile on the minimap.
+
+        :param x: The x coordinate of the tile.
+        :type x: int
+        :param y: The y coordinate of the tile.
+        :type y: int
+        :return: The square of 3x3 pixels of the tile, relative to the minimap.
+        :rtype: pygame.Rect
+        """
+        minimap_width, minimap_height = View2_5D.MINIMAP_SIZE
+        return pygame.Rect(int(x * minimap_width / self.map_size), int(y * minimap_height / self.map_size), 3, 3)
+
+    def __draw_minimap_tile(self, surface: pygame.Surface, x: int, y: int) -> None:
+        """
+        Draw the square of a tile on the minimap if it is occupied, in a colour depending on its object.
+
+        :param surface: The minimap.
+        :type surface: pygame.Surface
+        :param x: The x coordinate of the tile.
+        :type x: int
+        :param y: The y coordinate of the tile.
+        :type y: int
+        """
+        obj = self.__map.view_xy(x, y)
+        if obj is not None:
+            # Couleurs différentes selon les objets, bleu pour les unités
+            color = View2_5D.MINIMAP_COLORS.get(obj.get_letter(), (0, 0, 255))
+            surface.fill(color, self.__minimap_square(x, y))  # Carré de 3x3 pixels
+
+    def __render_minimap_surface(self) -> pygame.Surface:
+        """
+        Draw the whole minimap: the ground, then the occupied tiles in the order of the grid.
+
+        :return: The minimap.
+        :rtype: pygame.Surface
+        """
+        surface = pygame.Surface(View2_5D.MINIMAP_SIZE)
+        surface.fill(View2_5D.MINIMAP_GROUND)  # Fond vert
+        for coordinate in self.__map.get_map():
+            self.__draw_minimap_tile(surface, coordinate.get_x(), coordinate.get_y())
+        return surface
+
+    def __update_minimap_surface(self, changes: list[int]) -> None:
+        """
+        Draw again the squares of the written tiles. As the squares of close tiles overlap on a large map,
+        the area of each square is cleared and every tile whose square crosses it is drawn again, clipped to the area,
+        in the order of the grid, so that the minimap is the same as if it was drawn from scratch.
+
+        :param changes: The indices of the written tiles.
+        :type changes: list[int]
+        """
+        minimap_width, minimap_height = View2_5D.MINIMAP_SIZE
+        # The tiles whose squares can cross the square of a tile
+        reach_x = int(3 * self.map_size / minimap_width) + 1
+        reach_y = int(3 * self.map_size / minimap_height) + 1
+        for index in set(changes):
+            x, y = index % self.map_size, index // self.map_size
+            area = self.__minimap_square(x, y)
+            self.__minimap.set_clip(area)
+            self.__minimap.fill(View2_5D.MINIMAP_GROUND)
+            for other_y in range(max(0, y - reach_y), min(self.map_size, y + reach_y + 1)):
+                for other_x in range(max(0, x - reach_x), min(self.map_size, x + reach_x + 1)):
+                    if area.colliderect(self.__minimap_square(other_x, other_y)):
+                        self.__draw_minimap_tile(self.__minimap, other_x, other_y)
+        self.__minimap.set_clip(None)
+
     def show(self) -> None:
         """
         Main loop for the 2.5D view.
@@ -165,6 +308,12 @@ class View2_5D(BaseView):
         self.screen = pygame.display.set_mode((self.width, self.height), pygame.RESIZABLE | pygame.FULLSCREEN)
         pygame.display.set_caption("2.5D View")
         self.clock = pygame.time.Clock()
+        # The pre-rendered surfaces belong to the previous display
+        self.tile_manager.clear()
+        self.__atlas = None
+        self.__ground_chunk = None
+        self.__ground_layer = None
+        self.__minimap = None
         self.__running = True
         
         self.__input_loop()